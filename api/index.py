@@ -1,9 +1,21 @@
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import json
-import httpx
-import feedparser
-import asyncio
+import os
+import sys
+import orjson
+
+# Reuse the FastAPI backend's service layer. Services are imported inside
+# the route that needs them, so a cold start only pays for that route
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app.core.serverless import run, send_json
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': '*',
+}
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -12,31 +24,25 @@ class handler(BaseHTTPRequestHandler):
         path = parsed_path.path
         query_params = parse_qs(parsed_path.query)
 
-        # Set CORS headers
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', '*')
-        self.end_headers()
-
+        # (body, ETag, seconds the CDN may cache it)
         try:
             # Route handling - Vercel strips /api prefix
             if path == '/' or path == '':
-                response = {"message": "Tech News Hub API", "status": "online"}
+                response = orjson.dumps({"message": "Tech News Hub API", "status": "online"}), None, 0
             elif path == '/health':
-                response = {"status": "healthy"}
+                response = orjson.dumps({"status": "healthy"}), None, 0
             elif path.startswith('/v1/hacker-news'):
-                response = asyncio.run(self.get_hacker_news(query_params))
+                response = run(self.get_hacker_news(query_params))
             elif path.startswith('/v1/rss'):
-                response = asyncio.run(self.get_rss_feed(query_params))
+                response = run(self.get_rss_feed(query_params))
             else:
-                response = {"error": "Not found", "path": path}
-
-            self.wfile.write(json.dumps(response).encode())
+                response = orjson.dumps({"error": "Not found", "path": path}), None, 0
         except Exception as e:
             error_response = {"error": str(e)}
-            self.wfile.write(json.dumps(error_response).encode())
+            response = orjson.dumps(error_response), None, 0
+
+        body, etag, max_age = response
+        send_json(self, body, etag, max_age, CORS_HEADERS)
 
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS preflight"""
@@ -48,75 +54,36 @@ class handler(BaseHTTPRequestHandler):
 
     async def get_hacker_news(self, params):
         """Fetch Hacker News articles"""
+        from app.core.config import settings
+        from app.core.serialization import render
+        from app.schemas.hacker_news import HackerNewsResponse
+        from app.services.hacker_news import HackerNewsService
+
         try:
-            limit = int(params.get('limit', ['10'])[0])
+            limit = min(max(int(params.get('limit', ['10'])[0]), 1), 100)
             story_type = params.get('story_type', ['topstories'])[0]
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Fetch story IDs
-                url = f"https://hacker-news.firebaseio.com/v0/{story_type}.json"
-                response = await client.get(url)
-                story_ids = response.json()[:limit * 2]
-
-                # Fetch articles
-                articles = []
-                for story_id in story_ids:
-                    try:
-                        item_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                        item_response = await client.get(item_url)
-                        data = item_response.json()
-
-                        if data and data.get("type") == "story":
-                            articles.append({
-                                "id": data.get("id"),
-                                "title": data.get("title"),
-                                "url": data.get("url"),
-                                "score": data.get("score", 0),
-                                "by": data.get("by"),
-                                "time": data.get("time"),
-                                "descendants": data.get("descendants", 0),
-                                "type": data.get("type")
-                            })
-
-                            if len(articles) >= limit:
-                                break
-                    except:
-                        continue
-
-                return {"total": len(articles), "articles": articles}
+            # Items are fetched concurrently through the shared client and item cache
+            articles = await HackerNewsService.fetch_articles(limit=limit, story_type=story_type)
+            rendered = render(HackerNewsResponse(total=len(articles), articles=articles))
+            # Item scores are refreshed every HN_SCORE_TTL seconds
+            return rendered.body, rendered.etag, settings.HN_SCORE_TTL
         except Exception as e:
-            return {"total": 0, "articles": [], "error": str(e)}
+            return orjson.dumps({"total": 0, "articles": [], "error": str(e)}), None, 0
 
     async def get_rss_feed(self, params):
         """Fetch RSS feed"""
+        from app.services.rss_feed import RSSFeedService
+
         try:
             url = params.get('url', [None])[0]
             if not url:
-                return {"total": 0, "articles": [], "error": "URL parameter required"}
-
-            limit = int(params.get('limit', ['20'])[0])
-
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                content = response.text
-
-            feed = feedparser.parse(content)
-            articles = []
+                return orjson.dumps({"total": 0, "articles": [], "error": "URL parameter required"}), None, 0
 
-            for entry in feed.entries[:limit]:
-                try:
-                    articles.append({
-                        "title": entry.get('title', 'No Title'),
-                        "link": entry.get('link'),
-                        "description": entry.get('summary') or entry.get('description'),
-                        "summary": entry.get('summary'),
-                        "published": entry.get('published') or entry.get('updated'),
-                        "author": entry.get('author'),
-                        "guid": entry.get('id') or entry.get('link')
-                    })
-                except:
-                    continue
+            limit = min(max(int(params.get('limit', ['20'])[0]), 1), 100)
 
-            return {"total": len(articles), "articles": articles}
+            # Rendered bytes are reused across warm invocations until the feed refreshes
+            rendered = await RSSFeedService.render_feed(url, limit)
+            return rendered.body, rendered.etag, RSSFeedService.max_age(url)
         except Exception as e:
-            return {"total": 0, "articles": [], "error": str(e)}
+            return orjson.dumps({"total": 0, "articles": [], "error": str(e)}), None, 0
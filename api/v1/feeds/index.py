@@ -0,0 +1,55 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import os
+import sys
+import orjson
+
+# Reuse the FastAPI backend's aggregation service
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'backend'))
+
+from app.core.categories import ALL_CATEGORIES, CATEGORIES
+from app.core.serialization import render
+from app.core.serverless import run, send_json
+from app.services.feed_aggregator import FeedAggregatorService
+
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed_path = urlparse(self.path)
+        query_params = parse_qs(parsed_path.query)
+
+        try:
+            rendered, max_age = run(self.get_category_feed(query_params))
+            send_json(self, rendered.body, rendered.etag, max_age, CORS_HEADERS)
+        except Exception as e:
+            error = {"total": 0, "articles": [], "error": str(e)}
+            send_json(self, orjson.dumps(error), headers=CORS_HEADERS)
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', '*')
+        self.end_headers()
+
+    async def get_category_feed(self, params):
+        # /api/v1/feeds/{category} is rewritten to ?category={category} in vercel.json
+        category = params.get('category', [ALL_CATEGORIES])[0]
+        if category != ALL_CATEGORIES and category not in CATEGORIES:
+            return render({"total": 0, "articles": [], "error": f"Category {category} not found"}), 0
+
+        page = max(int(params.get('page', ['1'])[0]), 1)
+        page_size = min(max(int(params.get('page_size', ['50'])[0]), 1), 200)
+        limit_per_feed = min(max(int(params.get('limit_per_feed', ['20'])[0]), 1), 100)
+
+        # The shared clients, feed/item caches and rendered pages stay warm
+        # across invocations
+        rendered = await FeedAggregatorService.render_feed(
+            category,
+            page=page,
+            page_size=page_size,
+            limit_per_feed=limit_per_feed
+        )
+        return rendered, FeedAggregatorService.max_age(category)
@@ -0,0 +1,54 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import os
+import sys
+import orjson
+
+# Reuse the FastAPI backend's comment service
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'backend'))
+
+from app.core.config import settings
+from app.core.serverless import run, send_json
+from app.services.hacker_news_comments import HackerNewsCommentService
+
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed_path = urlparse(self.path)
+        query_params = parse_qs(parsed_path.query)
+
+        try:
+            body, etag, max_age = run(self.get_comments(query_params))
+            send_json(self, body, etag=etag, max_age=max_age, headers=CORS_HEADERS)
+        except Exception as e:
+            error = {"total": 0, "comments": [], "error": str(e)}
+            send_json(self, orjson.dumps(error), headers=CORS_HEADERS)
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', '*')
+        self.end_headers()
+
+    async def get_comments(self, params):
+        # /api/v1/hacker-news/{id}/comments is rewritten to ?id={id} in vercel.json
+        article_id = int(params['id'][0])
+        max_depth = min(max(int(params.get('max_depth', [settings.HN_COMMENT_MAX_DEPTH])[0]), 1), 20)
+        max_nodes = min(max(int(params.get('max_nodes', [settings.HN_COMMENT_MAX_NODES])[0]), 1), 2000)
+        time_budget = min(max(float(params.get('time_budget', [settings.HN_COMMENT_TIME_BUDGET])[0]), 0.1), 30.0)
+
+        result = await HackerNewsCommentService.fetch_rendered_tree(
+            article_id,
+            max_depth=max_depth,
+            max_nodes=max_nodes,
+            time_budget=time_budget
+        )
+        if result is None:
+            return orjson.dumps({"total": 0, "comments": [], "error": f"Item with ID {article_id} not found"}), None, 0
+        # Comment nodes are refetched every HN_COMMENT_TTL seconds; partial
+        # trees are not cached, so the next request can fill them in
+        rendered, complete = result
+        return rendered.body, rendered.etag, settings.HN_COMMENT_TTL if complete else 0
@@ -1,25 +1,33 @@
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import json
-import httpx
-import asyncio
+import os
+import sys
+import orjson
+
+# Reuse the FastAPI backend's service layer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'backend'))
+
+from app.core.config import settings
+from app.core.serialization import render
+from app.core.serverless import run, send_json
+from app.schemas.hacker_news import HackerNewsResponse
+from app.services.hacker_news import HackerNewsService
+
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         parsed_path = urlparse(self.path)
         query_params = parse_qs(parsed_path.query)
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-
         try:
-            response = asyncio.run(self.get_hacker_news(query_params))
-            self.wfile.write(json.dumps(response).encode())
+            rendered = run(self.get_hacker_news(query_params))
+            # Item scores are refreshed every HN_SCORE_TTL seconds
+            send_json(self, rendered.body, rendered.etag, settings.HN_SCORE_TTL, CORS_HEADERS)
         except Exception as e:
             error = {"total": 0, "articles": [], "error": str(e)}
-            self.wfile.write(json.dumps(error).encode())
+            send_json(self, orjson.dumps(error), headers=CORS_HEADERS)
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -29,39 +37,14 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     async def get_hacker_news(self, params):
-        try:
-            limit = int(params.get('limit', ['10'])[0])
-            story_type = params.get('story_type', ['topstories'])[0]
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                url = f"https://hacker-news.firebaseio.com/v0/{story_type}.json"
-                response = await client.get(url)
-                story_ids = response.json()[:limit * 2]
-
-                articles = []
-                for story_id in story_ids:
-                    try:
-                        item_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                        item_response = await client.get(item_url)
-                        data = item_response.json()
-
-                        if data and data.get("type") == "story":
-                            articles.append({
-                                "id": data.get("id"),
-                                "title": data.get("title"),
-                                "url": data.get("url"),
-                                "score": data.get("score", 0),
-                                "by": data.get("by"),
-                                "time": data.get("time"),
-                                "descendants": data.get("descendants", 0),
-                                "type": data.get("type")
-                            })
-
-                            if len(articles) >= limit:
-                                break
-                    except:
-                        continue
-
-                return {"total": len(articles), "articles": articles}
-        except Exception as e:
-            return {"total": 0, "articles": [], "error": str(e)}
+        limit = min(max(int(params.get('limit', ['10'])[0]), 1), 100)
+        story_type = params.get('story_type', ['topstories'])[0]
+        min_score = params.get('min_score', [None])[0]
+
+        # Items are fetched concurrently through the shared client and item cache
+        articles = await HackerNewsService.fetch_articles(
+            limit=limit,
+            story_type=story_type,
+            min_score=int(min_score) if min_score is not None else None
+        )
+        return render(HackerNewsResponse(total=len(articles), articles=articles))
@@ -1,26 +1,30 @@
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import json
-import httpx
-import feedparser
-import asyncio
+import os
+import sys
+import orjson
+
+# Reuse the FastAPI backend's service layer
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'backend'))
+
+from app.core.serialization import render
+from app.core.serverless import run, send_json
+from app.services.rss_feed import RSSFeedService
+
+CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         parsed_path = urlparse(self.path)
         query_params = parse_qs(parsed_path.query)
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-
         try:
-            response = asyncio.run(self.get_rss_feed(query_params))
-            self.wfile.write(json.dumps(response).encode())
+            rendered, max_age = run(self.get_rss_feed(query_params))
+            send_json(self, rendered.body, rendered.etag, max_age, CORS_HEADERS)
         except Exception as e:
             error = {"total": 0, "articles": [], "error": str(e)}
-            self.wfile.write(json.dumps(error).encode())
+            send_json(self, orjson.dumps(error), headers=CORS_HEADERS)
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -30,34 +34,17 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     async def get_rss_feed(self, params):
-        try:
-            url = params.get('url', [None])[0]
-            if not url:
-                return {"total": 0, "articles": [], "error": "URL parameter required"}
-
-            limit = int(params.get('limit', ['20'])[0])
-
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                content = response.text
-
-            feed = feedparser.parse(content)
-            articles = []
-
-            for entry in feed.entries[:limit]:
-                try:
-                    articles.append({
-                        "title": entry.get('title', 'No Title'),
-                        "link": entry.get('link'),
-                        "description": entry.get('summary') or entry.get('description'),
-                        "summary": entry.get('summary'),
-                        "published": entry.get('published') or entry.get('updated'),
-                        "author": entry.get('author'),
-                        "guid": entry.get('id') or entry.get('link')
-                    })
-                except:
-                    continue
-
-            return {"total": len(articles), "articles": articles}
-        except Exception as e:
-            return {"total": 0, "articles": [], "error": str(e)}
+        urls = params.get('url', [])
+        if not urls:
+            return render({"total": 0, "articles": [], "error": "URL parameter required"}), 0
+
+        limit = min(max(int(params.get('limit', ['20'])[0]), 1), 100)
+
+        # Several url parameters are fetched concurrently, like POST /api/v1/rss/multiple
+        if len(urls) > 1:
+            response = await RSSFeedService.fetch_multiple_feeds(urls, limit)
+            return render(response), min(RSSFeedService.max_age(url) for url in urls)
+        # Rendered bytes are reused across warm invocations until the feed refreshes;
+        # the CDN may cache them until the feed is due for a refresh
+        rendered = await RSSFeedService.render_feed(urls[0], limit)
+        return rendered, RSSFeedService.max_age(urls[0])
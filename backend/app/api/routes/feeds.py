@@ -0,0 +1,72 @@
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List
+from app.core.categories import ALL_CATEGORIES, CATEGORIES
+from app.core.http_client import get_hacker_news_client, get_rss_client
+from app.core.responses import cached_json_response
+from app.schemas.feeds import CategoryFeedResponse, FeedCategoryInfo
+from app.services.feed_aggregator import FeedAggregatorService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[FeedCategoryInfo])
+async def list_feed_categories():
+    """List the registered feed categories and their upstream sources"""
+    return [
+        FeedCategoryInfo(
+            id=category.id,
+            label=category.label,
+            source=category.source,
+            feeds=list(category.feeds),
+            hacker_news=category.hacker_news
+        )
+        for category in CATEGORIES.values()
+    ]
+
+
+@router.get("/{category}", response_model=CategoryFeedResponse)
+async def get_category_feed(
+    request: Request,
+    category: str,
+    page: int = Query(1, ge=1, description="Page number (1-based)"),
+    page_size: int = Query(50, ge=1, le=200, description="Articles per page"),
+    limit_per_feed: int = Query(20, ge=1, le=100, description="Maximum articles per upstream source"),
+    hn_client: httpx.AsyncClient = Depends(get_hacker_news_client),
+    rss_client: httpx.AsyncClient = Depends(get_rss_client)
+):
+    """
+    Fetch one merged feed for a category
+
+    - **category**: llm, automation, architecture, experienced_devs, hacker_news or all
+    - **page** / **page_size**: Pagination over the merged list
+    - **limit_per_feed**: Maximum articles taken from each upstream source
+
+    Upstream sources are fetched concurrently, then merged, deduplicated and
+    sorted newest first. Per-source status is returned alongside the page.
+    Rendered pages are reused for a few seconds while the article store is
+    unchanged. The response carries an ETag (send `If-None-Match` for a 304)
+    and a Cache-Control max-age that ends when the first source is due for
+    a refresh.
+    """
+    if category != ALL_CATEGORIES and category not in CATEGORIES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Category {category} not found"
+        )
+
+    try:
+        rendered = await FeedAggregatorService.render_feed(
+            category,
+            page=page,
+            page_size=page_size,
+            limit_per_feed=limit_per_feed,
+            hn_client=hn_client,
+            rss_client=rss_client
+        )
+        return cached_json_response(request, rendered, FeedAggregatorService.max_age(category))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching {category} feed: {str(e)}"
+        )
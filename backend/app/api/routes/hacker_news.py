@@ -1,38 +1,132 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import Optional
-from app.schemas.hacker_news import HackerNewsResponse, HackerNewsArticle
+import time
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List, Optional
+from app.core.config import settings
+from app.core.http_client import get_hacker_news_client
+from app.core.responses import cached_json_response
+from app.core.serialization import render
+from app.core.streaming import StreamEvents, stream_events, stream_media_type
+from app.schemas.hacker_news import (
+    HackerNewsArticle,
+    HackerNewsCommentSummary,
+    HackerNewsCommentTree,
+    HackerNewsMirrorStatus,
+    HackerNewsResponse,
+)
+from app.schemas.rss_feed import RSSFeedStatus
+from app.schemas.streaming import StreamTrailer
 from app.services.hacker_news import HackerNewsService
+from app.services.hacker_news_comments import CommentCrawl, HackerNewsCommentService
+from app.services.hacker_news_mirror import hacker_news_mirror
 
 router = APIRouter()
 
 
+async def _article_events(
+    limit: int,
+    story_type: str,
+    min_score: Optional[int],
+    client: httpx.AsyncClient
+) -> StreamEvents:
+    """One "article" event per story as it is fetched, then a "trailer" event"""
+    started = time.perf_counter()
+    errors: List[str] = []
+    total, fetch_status, error = 0, "ok", None
+    try:
+        async for article in hacker_news_mirror.iter_articles(limit, story_type, min_score, client, errors):
+            total += 1
+            yield "article", article
+    except Exception as e:
+        print(f"Error streaming Hacker News articles: {str(e)}")
+        fetch_status, error = "error", str(e)
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    yield "trailer", StreamTrailer(
+        total=total,
+        elapsed_ms=elapsed_ms,
+        sources=[RSSFeedStatus(
+            url=HackerNewsService.story_list_url(story_type),
+            status=fetch_status,
+            articles=total,
+            elapsed_ms=elapsed_ms,
+            error=error
+        )],
+        errors=errors
+    )
+
+
+async def _comment_events(
+    article_id: int,
+    max_depth: int,
+    max_nodes: int,
+    time_budget: float,
+    story: Optional[HackerNewsArticle],
+    client: httpx.AsyncClient
+) -> StreamEvents:
+    """A "story" event (for stories), one "comment" event per comment as it is fetched, then a "trailer" event"""
+    if story is not None:
+        yield "story", story
+    crawl = CommentCrawl(article_id)
+    try:
+        async for comment in HackerNewsCommentService.iter_comments(
+            article_id, max_depth, max_nodes, time_budget, client, crawl
+        ):
+            yield "comment", comment
+    except Exception as e:
+        print(f"Error streaming comments of {article_id}: {str(e)}")
+        crawl.errors.append(str(e))
+
+    yield "trailer", HackerNewsCommentSummary(**HackerNewsCommentService.summary_fields(crawl))
+
+
 @router.get("/", response_model=HackerNewsResponse)
 async def get_hacker_news_articles(
+    request: Request,
     limit: int = Query(10, ge=1, le=100, description="Number of articles to fetch"),
     story_type: str = Query(
         "topstories",
         description="Type of stories (topstories, newstories, beststories, askstories, showstories, jobstories)"
     ),
-    min_score: Optional[int] = Query(None, ge=0, description="Minimum score filter")
+    min_score: Optional[int] = Query(None, ge=0, description="Minimum score filter"),
+    client: httpx.AsyncClient = Depends(get_hacker_news_client)
 ):
     """
-    Fetch articles from Hacker News API
+    Fetch articles from Hacker News API (served from the local mirror once synced)
 
     - **limit**: Number of articles to fetch (1-100)
     - **story_type**: Type of stories to fetch
     - **min_score**: Optional minimum score filter
+
+    Send `Accept: application/x-ndjson` or `Accept: text/event-stream` to
+    receive each article as soon as it is fetched, followed by a trailer
+    with totals and errors.
+
+    The JSON response carries an ETag (send `If-None-Match` for a 304) and
+    a Cache-Control max-age that ends at the mirror's next poll.
     """
+    media_type = stream_media_type(request.headers.get("accept"))
+    if media_type:
+        return stream_events(_article_events(limit, story_type, min_score, client), media_type)
+
+    # Pre-rendered JSON, reused until the mirror changes
+    rendered = hacker_news_mirror.render_articles(limit, story_type, min_score)
+    if rendered is not None:
+        return cached_json_response(request, rendered, hacker_news_mirror.max_age())
+
     try:
-        articles = await HackerNewsService.fetch_articles(
+        articles = await hacker_news_mirror.fetch_articles(
             limit=limit,
             story_type=story_type,
-            min_score=min_score
+            min_score=min_score,
+            client=client
         )
 
-        return HackerNewsResponse(
+        rendered = render(HackerNewsResponse(
             total=len(articles),
             articles=articles
-        )
+        ))
+        return cached_json_response(request, rendered, hacker_news_mirror.max_age())
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -40,15 +134,40 @@ async def get_hacker_news_articles(
         )
 
 
+@router.get("/cache/stats", response_model=dict)
+async def get_hacker_news_cache_stats():
+    """
+    Item cache counters
+
+    Returns entry count, hits, misses, evictions and score refetches for the
+    per-item cache
+    """
+    return HackerNewsService.cache_stats()
+
+
+@router.get("/mirror/status", response_model=HackerNewsMirrorStatus)
+async def get_hacker_news_mirror_status():
+    """
+    Hacker News mirror status
+
+    Returns whether routes are served from the mirror, the size of each
+    mirrored story list and the mirror's upstream request counters
+    """
+    return hacker_news_mirror.status()
+
+
 @router.get("/{article_id}", response_model=HackerNewsArticle)
-async def get_hacker_news_article(article_id: int):
+async def get_hacker_news_article(
+    article_id: int,
+    client: httpx.AsyncClient = Depends(get_hacker_news_client)
+):
     """
     Fetch a specific article from Hacker News by ID
 
     - **article_id**: Hacker News item ID
     """
     try:
-        article = await HackerNewsService.fetch_article(article_id)
+        article = await hacker_news_mirror.fetch_article(article_id, client=client)
 
         if not article:
             raise HTTPException(
@@ -66,17 +185,96 @@ async def get_hacker_news_article(article_id: int):
         )
 
 
+@router.get("/{article_id}/comments", response_model=HackerNewsCommentTree)
+async def get_hacker_news_comments(
+    request: Request,
+    article_id: int,
+    max_depth: int = Query(settings.HN_COMMENT_MAX_DEPTH, ge=1, le=20, description="Deepest reply level to fetch"),
+    max_nodes: int = Query(settings.HN_COMMENT_MAX_NODES, ge=1, le=2000, description="Maximum comments to fetch"),
+    time_budget: float = Query(
+        settings.HN_COMMENT_TIME_BUDGET, gt=0, le=30, description="Seconds after which fetching stops"
+    ),
+    client: httpx.AsyncClient = Depends(get_hacker_news_client)
+):
+    """
+    Fetch the comment tree of a story
+
+    - **article_id**: Hacker News item ID (a story, or a comment for its replies)
+    - **max_depth**: Deepest reply level to fetch (1 = top-level comments only)
+    - **max_nodes**: Maximum number of comments to fetch
+    - **time_budget**: Seconds after which fetching stops
+
+    Replies are fetched breadth first and concurrently. When a limit is
+    reached the partial tree is returned with `complete: false` and the
+    limit listed in `truncated`.
+
+    Send `Accept: application/x-ndjson` or `Accept: text/event-stream` to
+    receive each comment (with its `parent` and `depth`) as soon as it is
+    fetched, followed by a trailer with totals.
+
+    The JSON response carries an ETag (send `If-None-Match` for a 304). A
+    complete tree is cached for HN_COMMENT_TTL seconds; a partial one is
+    sent with no-cache.
+    """
+    try:
+        root = await HackerNewsCommentService.get_item(article_id, client)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching item: {str(e)}"
+        )
+    if root is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Item with ID {article_id} not found"
+        )
+
+    media_type = stream_media_type(request.headers.get("accept"))
+    if media_type:
+        story = HackerNewsCommentService.story(root)
+        events = _comment_events(article_id, max_depth, max_nodes, time_budget, story, client)
+        return stream_events(events, media_type)
+
+    try:
+        result = await HackerNewsCommentService.fetch_rendered_tree(
+            article_id,
+            max_depth=max_depth,
+            max_nodes=max_nodes,
+            time_budget=time_budget,
+            client=client
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching comments: {str(e)}"
+        )
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Item with ID {article_id} not found"
+        )
+
+    # Partial trees are not cached downstream: the next request can fill them in
+    rendered, complete = result
+    return cached_json_response(request, rendered, settings.HN_COMMENT_TTL if complete else 0)
+
+
 @router.get("/top/{limit}", response_model=HackerNewsResponse)
-async def get_top_stories(limit: int = 10):
+async def get_top_stories(
+    limit: int = 10,
+    client: httpx.AsyncClient = Depends(get_hacker_news_client)
+):
     """
     Quick endpoint to fetch top stories
 
     - **limit**: Number of top stories to fetch
     """
     try:
-        articles = await HackerNewsService.fetch_articles(
+        articles = await hacker_news_mirror.fetch_articles(
             limit=min(limit, 100),
-            story_type="topstories"
+            story_type="topstories",
+            client=client
         )
 
         return HackerNewsResponse(
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from app.schemas.ingestion import IngestionStatusResponse
+from app.services.ingestion import ingestion_scheduler
+
+router = APIRouter()
+
+
+@router.get("/status", response_model=IngestionStatusResponse)
+async def get_ingestion_status():
+    """
+    Background ingestion status
+
+    Returns last refresh time, duration, article count and last error for
+    every source the scheduler refreshes
+    """
+    return ingestion_scheduler.status()
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.core.categories import CATEGORIES
+from app.core.streaming import EVENT_STREAM, STREAM_HEADERS
+from app.schemas.live import LiveStatsResponse
+from app.services.live import live_hub
+
+router = APIRouter()
+
+
+@router.get("/")
+async def subscribe_live_articles(
+    categories: Optional[List[str]] = Query(None, description="Only push articles from these categories"),
+    sources: Optional[List[str]] = Query(None, description="Only push articles from these feed or story list URLs")
+):
+    """
+    Server-Sent Events stream of newly ingested or changed articles
+
+    - **categories**: Optional category filter (repeatable)
+    - **sources**: Optional source URL filter (repeatable)
+
+    Each article arrives as an `article` event. Idle connections get a
+    heartbeat comment every LIVE_HEARTBEAT_INTERVAL seconds. A client that
+    falls LIVE_QUEUE_SIZE publish batches behind receives a `dropped` event
+    and is disconnected.
+    """
+    for category in categories or []:
+        if category not in CATEGORIES:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Category {category} not found"
+            )
+
+    if live_hub.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live subscribers"
+        )
+
+    return StreamingResponse(
+        live_hub.events(categories, sources),
+        media_type=EVENT_STREAM,
+        headers=STREAM_HEADERS
+    )
+
+
+@router.get("/stats", response_model=LiveStatsResponse)
+async def get_live_stats():
+    """Connected subscribers and publish/delivery/drop counters"""
+    return live_hub.stats()
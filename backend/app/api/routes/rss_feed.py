@@ -1,15 +1,46 @@
-from fastapi import APIRouter, HTTPException, Query, status
+import time
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from typing import Optional, List
-from app.schemas.rss_feed import RSSFeedResponse, RSSArticle
+from app.core.http_client import get_rss_client
+from app.core.parse_pool import parse_pool
+from app.core.responses import cached_json_response
+from app.core.streaming import StreamEvents, stream_events, stream_media_type
+from app.schemas.rss_feed import RSSFeedResponse, RSSMultipleFeedsResponse
+from app.schemas.streaming import StreamTrailer
 from app.services.rss_feed import RSSFeedService
 
 router = APIRouter()
 
 
+async def _feed_events(
+    urls: List[str],
+    limit_per_feed: Optional[int],
+    client: httpx.AsyncClient,
+    deadline: Optional[float] = None
+) -> StreamEvents:
+    """One "article" event per entry as soon as its feed is parsed, then a "trailer" event"""
+    started = time.perf_counter()
+    total, sources = 0, []
+    async for articles, feed_status in RSSFeedService.iter_feeds(urls, limit_per_feed, client, deadline=deadline):
+        for article in articles:
+            yield "article", article
+        total += len(articles)
+        sources.append(feed_status)
+
+    yield "trailer", StreamTrailer(
+        total=total,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        sources=sources
+    )
+
+
 @router.get("/", response_model=RSSFeedResponse)
 async def fetch_rss_feed(
+    request: Request,
     url: str = Query(..., description="RSS feed URL to fetch"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Maximum number of articles to fetch")
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Maximum number of articles to fetch"),
+    client: httpx.AsyncClient = Depends(get_rss_client)
 ):
     """
     Fetch articles from any RSS feed URL
@@ -21,10 +52,21 @@ async def fetch_rss_feed(
     - TechRadar: https://www.techradar.com/rss
     - BBC News: http://feeds.bbci.co.uk/news/rss.xml
     - Hacker News: https://news.ycombinator.com/rss
+
+    Send `Accept: application/x-ndjson` or `Accept: text/event-stream` to
+    stream the articles, followed by a trailer with totals and the feed status.
+
+    The JSON response carries an ETag (send `If-None-Match` for a 304) and
+    a Cache-Control max-age that ends when the cached feed is due for a refresh.
     """
+    media_type = stream_media_type(request.headers.get("accept"))
+    if media_type:
+        return stream_events(_feed_events([url], limit, client), media_type)
+
     try:
-        response = await RSSFeedService.fetch_feed(url, limit)
-        return response
+        # Pre-rendered JSON, reused until the feed is refreshed
+        rendered = await RSSFeedService.render_feed(url, limit, client=client)
+        return cached_json_response(request, rendered, RSSFeedService.max_age(url))
     except Exception as e:
         import traceback
         print(f"Error fetching RSS feed from {url}: {str(e)}")
@@ -35,26 +77,38 @@ async def fetch_rss_feed(
         )
 
 
-@router.post("/multiple", response_model=dict)
+@router.post("/multiple", response_model=RSSMultipleFeedsResponse)
 async def fetch_multiple_rss_feeds(
+    request: Request,
     urls: List[str] = Query(..., description="List of RSS feed URLs"),
-    limit_per_feed: Optional[int] = Query(5, ge=1, le=50, description="Maximum articles per feed")
+    limit_per_feed: Optional[int] = Query(5, ge=1, le=50, description="Maximum articles per feed"),
+    deadline: Optional[float] = Query(None, gt=0, le=60, description="Per-feed time limit in seconds"),
+    client: httpx.AsyncClient = Depends(get_rss_client)
 ):
     """
     Fetch articles from multiple RSS feeds at once
 
     - **urls**: List of RSS feed URLs
     - **limit_per_feed**: Maximum number of articles to fetch per feed
+    - **deadline**: Optional per-feed time limit (default: RSS_FEED_DEADLINE)
+
+    Feeds are fetched concurrently. Returns combined articles from all feeds
+    plus a per-feed status block; slow or failing feeds do not fail the request.
 
-    Returns combined articles from all feeds
+    With a streaming Accept header, each feed's articles are sent as soon as
+    that feed finishes, and the per-feed status block arrives in the trailer.
     """
+    media_type = stream_media_type(request.headers.get("accept"))
+    if media_type:
+        return stream_events(_feed_events(urls, limit_per_feed, client, deadline), media_type)
+
     try:
-        articles = await RSSFeedService.fetch_multiple_feeds(urls, limit_per_feed)
-        return {
-            "total_feeds": len(urls),
-            "total_articles": len(articles),
-            "articles": articles
-        }
+        return await RSSFeedService.fetch_multiple_feeds(
+            urls,
+            limit_per_feed,
+            client=client,
+            deadline=deadline
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,7 +118,9 @@ async def fetch_multiple_rss_feeds(
 
 @router.get("/techradar", response_model=RSSFeedResponse)
 async def fetch_techradar_rss(
-    limit: Optional[int] = Query(10, ge=1, le=100, description="Maximum number of articles to fetch")
+    request: Request,
+    limit: Optional[int] = Query(10, ge=1, le=100, description="Maximum number of articles to fetch"),
+    client: httpx.AsyncClient = Depends(get_rss_client)
 ):
     """
     Quick endpoint to fetch TechRadar RSS feed
@@ -73,10 +129,33 @@ async def fetch_techradar_rss(
     """
     try:
         techradar_url = "https://www.techradar.com/rss"
-        response = await RSSFeedService.fetch_feed(techradar_url, limit)
-        return response
+        rendered = await RSSFeedService.render_feed(techradar_url, limit, client=client)
+        return cached_json_response(request, rendered, RSSFeedService.max_age(techradar_url))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching TechRadar RSS feed: {str(e)}"
         )
+
+
+@router.get("/cache/stats", response_model=dict)
+async def get_rss_cache_stats():
+    """
+    Feed cache counters
+
+    Returns entry count, byte size, hits, stale hits, misses, evictions and
+    the number of background refreshes in flight
+    """
+    return RSSFeedService.cache_stats()
+
+
+@router.get("/parse/stats", response_model=dict)
+async def get_rss_parse_stats():
+    """
+    Feed parsing pool counters
+
+    Returns the pool kind and size, parses in flight, completed and failed
+    parses, callers that waited for a free slot, and total/average/max
+    parse time in milliseconds
+    """
+    return parse_pool.stats()
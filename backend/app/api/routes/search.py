@@ -0,0 +1,44 @@
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+from app.schemas.search import SearchResponse
+from app.services.search import search_index
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    category: Optional[str] = Query(None, description="Category filter (llm, automation, ...)"),
+    since: Optional[datetime] = Query(None, description="Only articles published at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only articles published at or before this time"),
+    sort: str = Query("relevance", pattern="^(relevance|date)$", description="Sort by relevance or date"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip")
+):
+    """
+    Full-text search over ingested articles
+
+    - **q**: Words to search for; the last word also matches as a prefix
+    - **category**: Optional category filter
+    - **since** / **until**: Optional publication date range
+    - **sort**: relevance (default) or date
+
+    Declared sync so FastAPI runs the SQLite query in its threadpool
+    """
+    try:
+        return search_index.search(
+            q,
+            category=category,
+            since=since,
+            until=until,
+            sort=sort,
+            limit=limit,
+            offset=offset
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching articles: {str(e)}"
+        )
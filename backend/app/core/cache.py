@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its freshness deadlines and approximate size"""
+    value: Any
+    size: int
+    stored_at: float
+    fresh_until: float
+    stale_until: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.fresh_until
+
+    @property
+    def is_usable(self) -> bool:
+        """Fresh, or stale but still inside the stale-while-revalidate window"""
+        return time.monotonic() < self.stale_until
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    Entries are evicted least-recently-used first whenever either the entry
+    count or the summed entry size goes over its limit. An entry stays
+    usable for `stale_ttl` seconds after it stops being fresh, so callers can
+    serve it immediately while refreshing it in the background.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Look up an entry and record a hit, stale hit or miss
+
+        Returns:
+            The entry if it is still usable (fresh or stale), otherwise None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if not entry.is_usable:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.is_fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value if usable, otherwise None"""
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return an entry, expired or not, without touching stats or LRU order"""
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any, size: int = 0, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least-recently-used entries if over budget"""
+        if key in self._entries:
+            self._remove(key)
+
+        now = time.monotonic()
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(
+            value=value,
+            size=size,
+            stored_at=now,
+            fresh_until=fresh_until,
+            stale_until=fresh_until + self.stale_ttl,
+        )
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and current occupancy"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class FeedCategory:
+    """A news category and the upstream sources it is built from"""
+    id: str
+    label: str
+    source: str
+    feeds: Tuple[str, ...] = ()
+    hacker_news: Optional[str] = None  # HN story list, e.g. "topstories"
+
+
+# Category registry shared by the aggregation endpoint and the frontend
+CATEGORIES: Dict[str, FeedCategory] = {
+    "llm": FeedCategory(
+        id="llm",
+        label="LLM Models",
+        source="AI Communities",
+        feeds=(
+            "https://www.reddit.com/r/ArtificialInteligence.rss",
+            "https://www.reddit.com/r/LLMDevs.rss",
+            "https://www.reddit.com/r/LocalLLaMA.rss",
+        ),
+    ),
+    "automation": FeedCategory(
+        id="automation",
+        label="Automation Tools",
+        source="Automation",
+        feeds=("https://www.reddit.com/r/automation.rss",),
+    ),
+    "architecture": FeedCategory(
+        id="architecture",
+        label="Architecture",
+        source="Architecture Communities",
+        feeds=(
+            "https://www.reddit.com/r/softwarearchitecture.rss",
+            "https://www.reddit.com/r/aws.rss",
+            "https://www.reddit.com/r/devops.rss",
+        ),
+    ),
+    "experienced_devs": FeedCategory(
+        id="experienced_devs",
+        label="Experienced Devs",
+        source="Experienced Devs",
+        feeds=("https://www.reddit.com/r/ExperiencedDevs.rss",),
+    ),
+    "hacker_news": FeedCategory(
+        id="hacker_news",
+        label="Hacker News",
+        source="Hacker News",
+        hacker_news="topstories",
+    ),
+}
+
+# Pseudo-category that merges every registered category
+ALL_CATEGORIES = "all"
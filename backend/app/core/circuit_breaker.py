@@ -0,0 +1,268 @@
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, Optional
+import httpx
+from app.core.config import settings
+from app.core.metrics import Family, registry, upstream_host
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class HostHealth:
+    """
+    Circuit state and recent latencies of one upstream host.
+
+    closed: requests flow; `failure_threshold` consecutive failures open
+    the circuit. open: requests fail immediately for `reset_timeout`
+    seconds. half_open: one probe request is let through; its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.opened_at = 0.0
+        self.probing = False
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self._timeout: Optional[float] = None
+        self._samples_since_timeout = 0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self, now: float, reset_timeout: float) -> bool:
+        """Whether a request may be sent now (claims the probe slot when half-open)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now - self.opened_at < reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        if self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def retry_in(self, now: float, reset_timeout: float) -> float:
+        return max(self.opened_at + reset_timeout - now, 0.0)
+
+    def success(self, latency: float) -> None:
+        self.probing = False
+        self.failures = 0
+        self.state = CLOSED
+        self._sample(latency)
+
+    def failure(self, now: float, threshold: int, latency: Optional[float] = None) -> None:
+        """
+        Record a failed request
+
+        Args:
+            latency: Seconds until a timeout fired. Timeouts are kept as
+                latency samples so a host that got slower raises its own
+                timeout instead of failing forever.
+        """
+        self.probing = False
+        self.failures += 1
+        if latency is not None:
+            self._sample(latency)
+        if self.state == HALF_OPEN or self.failures >= threshold:
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self.opened_at = now
+
+    def release(self) -> None:
+        """The request was cancelled: free the probe slot without a verdict"""
+        self.probing = False
+
+    def _sample(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self._samples_since_timeout += 1
+
+    def timeout(self, multiplier: float, minimum: float, min_samples: int) -> Optional[float]:
+        """
+        `multiplier` x the p99 of recent latencies (at least `minimum`),
+        or None until `min_samples` requests have been seen
+
+        Recomputed every 10 samples, so the sort stays off most requests.
+        """
+        if len(self.latencies) < min_samples:
+            return None
+        if self._timeout is None or self._samples_since_timeout >= 10:
+            ordered = sorted(self.latencies)
+            p99 = ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+            self._timeout = max(p99 * multiplier, minimum)
+            self._samples_since_timeout = 0
+        return self._timeout
+
+
+class UpstreamHealth:
+    """
+    Per-host circuit breakers and adaptive timeouts, shared by all client pools.
+
+    Hosts are tracked in LRU order, at most `max_hosts` at a time, since
+    feed URLs (and so hosts) come from clients.
+    """
+
+    def __init__(
+        self,
+        breaker_enabled: bool = True,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        adaptive_timeouts: bool = True,
+        timeout_multiplier: float = 3.0,
+        min_timeout: float = 2.0,
+        window: int = 200,
+        min_samples: int = 20,
+        max_hosts: int = 256
+    ):
+        self.breaker_enabled = breaker_enabled
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.adaptive_timeouts = adaptive_timeouts
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.window = window
+        self.min_samples = min_samples
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, HostHealth]" = OrderedDict()
+
+    def host(self, name: str) -> HostHealth:
+        health = self._hosts.get(name)
+        if health is None:
+            health = self._hosts[name] = HostHealth(self.window)
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(name)
+        return health
+
+    def timeout(self, health: HostHealth) -> Optional[float]:
+        if not self.adaptive_timeouts:
+            return None
+        return health.timeout(self.timeout_multiplier, self.min_timeout, self.min_samples)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """State, failure count and current adaptive timeout per host"""
+        return {
+            name: {
+                "state": health.state,
+                "consecutive_failures": health.failures,
+                "opened": health.opened,
+                "rejected": health.rejected,
+                "timeout": self.timeout(health),
+            }
+            for name, health in self._hosts.items()
+        }
+
+    def reset(self) -> None:
+        self._hosts.clear()
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """
+    Wrap an httpx transport with the per-host circuit breaker and adaptive
+    timeouts of `health`.
+
+    A request to a host whose circuit is open raises CircuitOpenError (an
+    httpx.TransportError) without touching the network, so callers' usual
+    error handling and stale-cache fallbacks apply. Otherwise the request's
+    connect/read/write timeouts are lowered to the host's adaptive timeout
+    once enough latencies are known; they never exceed the client's
+    configured timeout.
+
+    Transport errors, 5xx and 429 responses count as failures.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, health: UpstreamHealth):
+        self._transport = transport
+        self._health = health
+
+    def _apply_timeout(self, request: httpx.Request, timeout: float) -> None:
+        configured = request.extensions.get("timeout") or {}
+        adjusted = dict(configured)
+        for phase in ("connect", "read", "write"):
+            current = configured.get(phase)
+            adjusted[phase] = timeout if current is None else min(current, timeout)
+        request.extensions["timeout"] = adjusted
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        config = self._health
+        health = config.host(request.url.host)
+        now = time.monotonic()
+        if config.breaker_enabled and not health.allow(now, config.reset_timeout):
+            health.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit open for {request.url.host}, "
+                f"retrying in {health.retry_in(now, config.reset_timeout):.0f}s",
+                request=request,
+            )
+
+        timeout = config.timeout(health)
+        if timeout is not None:
+            self._apply_timeout(request, timeout)
+
+        started = time.monotonic()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TimeoutException:
+            finished = time.monotonic()
+            health.failure(finished, config.failure_threshold, latency=finished - started)
+            raise
+        except Exception:
+            health.failure(time.monotonic(), config.failure_threshold)
+            raise
+        except BaseException:
+            health.release()
+            raise
+
+        finished = time.monotonic()
+        if response.status_code >= 500 or response.status_code == 429:
+            health.failure(finished, config.failure_threshold)
+        else:
+            health.success(finished - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+upstream_health = UpstreamHealth(
+    breaker_enabled=settings.CIRCUIT_BREAKER_ENABLED,
+    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+    adaptive_timeouts=settings.ADAPTIVE_TIMEOUT_ENABLED,
+    timeout_multiplier=settings.ADAPTIVE_TIMEOUT_MULTIPLIER,
+    min_timeout=settings.ADAPTIVE_TIMEOUT_MIN,
+    window=settings.ADAPTIVE_TIMEOUT_WINDOW,
+    min_samples=settings.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+)
+
+
+def _health_metrics() -> Iterable[Family]:
+    """Circuit state and adaptive timeouts of the configured sources for /metrics"""
+    states, timeouts, rejected = [], [], {}
+    for name, health in list(upstream_health._hosts.items()):
+        label = upstream_host(name)
+        rejected[label] = rejected.get(label, 0) + health.rejected
+        if label == "other":
+            continue
+        states.append(({"host": label}, _STATE_VALUES[health.state]))
+        timeout = upstream_health.timeout(health)
+        if timeout is not None:
+            timeouts.append(({"host": label}, timeout))
+    yield "upstream_circuit_state", "gauge", "Circuit state per host (0 closed, 1 half-open, 2 open)", states
+    yield "upstream_adaptive_timeout_seconds", "gauge", "Current adaptive request timeout per host", timeouts
+    yield (
+        "upstream_circuit_rejections_total",
+        "counter",
+        "Requests failed fast because the host's circuit was open",
+        [({"host": label}, count) for label, count in rejected.items()],
+    )
+
+
+registry.register_collector(_health_metrics)
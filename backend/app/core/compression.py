@@ -0,0 +1,144 @@
+import gzip
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import TTLCache
+from app.core.http_cache import encoded_etag
+from app.core.metrics import registry
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are gzip-only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "text/")
+# Streams must reach the client event by event, so they are never buffered
+STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Codings the client accepts (q > 0) from an Accept-Encoding header"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses with brotli (when installed) or gzip.
+
+    Only bodies of at least `minimum_size` bytes with a text-like content
+    type are compressed, and only when the client's Accept-Encoding allows
+    it; compressible responses always carry `Vary: Accept-Encoding`.
+    Streaming responses (SSE, NDJSON, anything sent in several chunks) pass
+    through untouched.
+
+    Responses with a strong ETag are compressed once per encoding: the ETag
+    identifies the exact bytes, so the compressed copy is kept in a small
+    LRU cache and reused by every later request for the same body. The
+    compressed response carries its own strong ETag ("abc-br", "abc-gzip"),
+    and a 304 echoes the variant the client revalidated.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache_entries: int = 256
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._compressed = TTLCache(ttl=3600.0, max_entries=cache_entries)
+        registry.register_cache("compressed_bodies", self._compressed)
+
+    def _choose(self, scope: Scope) -> Optional[str]:
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted or "*" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, body: bytes, encoding: str, etag: Optional[str]) -> bytes:
+        key = (etag, encoding) if etag and not etag.startswith("W/") else None
+        if key is not None:
+            compressed = self._compressed.get(key)
+            if compressed is not None:
+                return compressed
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        if key is not None:
+            self._compressed.set(key, compressed, size=len(compressed))
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose(scope)
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            # First body chunk: decide whether to compress the response
+            response_start, start = start, None
+            headers = MutableHeaders(scope=response_start)
+            etag = headers.get("etag")
+            if response_start["status"] == 304 and etag and encoding is not None:
+                variant = encoded_etag(etag, encoding)
+                if variant in Headers(scope=scope).get("if-none-match", ""):
+                    headers["ETag"] = variant
+            content_type = headers.get("content-type", "")
+            compressible = (
+                content_type.startswith(COMPRESSIBLE_TYPES)
+                and not content_type.startswith(STREAMING_TYPES)
+                and "content-encoding" not in headers
+            )
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+
+            body = message.get("body", b"")
+            if (
+                not compressible
+                or encoding is None
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            ):
+                await send(response_start)
+                await send(message)
+                return
+
+            body = self._compress(body, encoding, etag)
+            if etag:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(response_start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Tuple
 import os
 
 
@@ -31,6 +31,144 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in env_origins.split(",")]
         return self.ALLOWED_ORIGINS
 
+    # Outbound HTTP client pools (shared per upstream, see app/core/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+    HN_TIMEOUT: float = 10.0
+    RSS_TIMEOUT: float = 30.0
+
+    # Per-host circuit breaker: open after CIRCUIT_FAILURE_THRESHOLD consecutive
+    # failures (errors, timeouts, 5xx, 429), probe again after CIRCUIT_RESET_TIMEOUT seconds
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: float = 30.0
+    # Adaptive timeouts: ADAPTIVE_TIMEOUT_MULTIPLIER x the host's p99 latency over
+    # its last ADAPTIVE_TIMEOUT_WINDOW requests, at least ADAPTIVE_TIMEOUT_MIN
+    # seconds and at most HN_TIMEOUT / RSS_TIMEOUT
+    ADAPTIVE_TIMEOUT_ENABLED: bool = True
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = 3.0
+    ADAPTIVE_TIMEOUT_MIN: float = 2.0
+    ADAPTIVE_TIMEOUT_WINDOW: int = 200
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES: int = 20
+
+    # Outbound traffic governor: per-host token bucket (requests/second, burst) and
+    # concurrent requests. GOVERNOR_HOST_LIMITS overrides the defaults for listed
+    # hosts as comma-separated "host=rate/burst/concurrency". A 429 (or 503 with
+    # Retry-After) pauses the host; GET requests are retried once if the pause is
+    # at most GOVERNOR_MAX_RETRY_WAIT seconds
+    GOVERNOR_ENABLED: bool = True
+    GOVERNOR_DEFAULT_RATE: float = 10.0
+    GOVERNOR_DEFAULT_BURST: int = 20
+    GOVERNOR_DEFAULT_CONCURRENCY: int = 8
+    GOVERNOR_HOST_LIMITS: str = "hacker-news.firebaseio.com=100/100/32,www.reddit.com=0.5/10/4"
+    GOVERNOR_MAX_RETRY_WAIT: float = 5.0
+
+    @property
+    def governor_host_limits(self) -> Dict[str, Tuple[float, int, int]]:
+        """Parse GOVERNOR_HOST_LIMITS into {host: (rate, burst, concurrency)}"""
+        limits = {}
+        for item in self.GOVERNOR_HOST_LIMITS.split(","):
+            if not item.strip():
+                continue
+            host, _, spec = item.partition("=")
+            rate, burst, concurrency = spec.split("/")
+            limits[host.strip()] = (float(rate), int(burst), int(concurrency))
+        return limits
+
+    # RSS feed cache (seconds / entries / bytes)
+    RSS_CACHE_TTL: float = 300.0
+    RSS_CACHE_STALE_TTL: float = 3600.0
+    RSS_CACHE_MAX_ENTRIES: int = 256
+    RSS_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Multi-feed fan-out: feeds fetched at once and per-feed time limit (seconds)
+    RSS_FANOUT_CONCURRENCY: int = 10
+    RSS_FEED_DEADLINE: float = 10.0
+
+    # Stop downloading RSS 2.0 / Atom feeds once the requested number of
+    # entries has been read, and build those without feedparser where their
+    # markup allows (other feeds are read in full and parsed by feedparser)
+    RSS_FAST_PARSE: bool = True
+
+    # Feed parsing pool: "thread", "process" (parallel across cores) or "inline";
+    # 0 workers means min(4, CPU count); queue size is jobs waiting beyond the workers
+    PARSE_POOL_KIND: str = "thread"
+    PARSE_POOL_WORKERS: int = 0
+    PARSE_POOL_QUEUE_SIZE: int = 32
+
+    # Hacker News item cache: immutable fields live for HN_ITEM_TTL seconds,
+    # score/descendants are refreshed after HN_SCORE_TTL seconds
+    HN_ITEM_TTL: float = 86400.0
+    HN_SCORE_TTL: float = 60.0
+    HN_ITEM_CACHE_MAX_ENTRIES: int = 5000
+    # Largest wave of item requests fetch_articles starts at once
+    HN_MAX_WAVE: int = 50
+
+    # Hacker News mirror: story lists and items kept in memory and updated
+    # from /v0/updates.json (seconds unless noted)
+    HN_MIRROR_ENABLED: bool = True
+    HN_MIRROR_POLL_INTERVAL: float = 30.0
+    HN_MIRROR_LIST_INTERVAL: float = 60.0
+    HN_MIRROR_RETRY_DELAY: float = 10.0
+    HN_MIRROR_STALE_AFTER: float = 600.0  # fall back to live fetches after this long without a successful poll
+    HN_MIRROR_CONCURRENCY: int = 20  # item requests in flight
+
+    # Hacker News comment trees: node cache (seconds / entries), item requests in
+    # flight per tree, and the default depth, comment count and time budget (seconds)
+    HN_COMMENT_TTL: float = 120.0
+    HN_COMMENT_CACHE_MAX_ENTRIES: int = 20000
+    HN_COMMENT_CONCURRENCY: int = 32
+    HN_COMMENT_MAX_DEPTH: int = 10
+    HN_COMMENT_MAX_NODES: int = 500
+    HN_COMMENT_TIME_BUDGET: float = 8.0
+
+    # Background ingestion scheduler (seconds unless noted)
+    INGEST_ENABLED: bool = True
+    INGEST_INTERVAL: float = 300.0
+    INGEST_JITTER: float = 0.1  # fraction of the delay
+    INGEST_RETRY_DELAY: float = 30.0
+    INGEST_MAX_BACKOFF: float = 1800.0
+    INGEST_STARTUP_SPREAD: float = 5.0
+    INGEST_STALE_AFTER: float = 900.0
+    INGEST_LIMIT_PER_FEED: int = 30
+
+    # Live push channel: publish batches queued per subscriber before it is dropped,
+    # seconds between heartbeats, and connections per worker
+    LIVE_QUEUE_SIZE: int = 256
+    LIVE_HEARTBEAT_INTERVAL: float = 15.0
+    LIVE_MAX_SUBSCRIBERS: int = 10000
+
+    # Full-text search index (":memory:" or a SQLite file path to keep history)
+    SEARCH_DB_PATH: str = ":memory:"
+
+    # Cross-source deduplication: max differing SimHash bits for near-duplicate titles
+    DEDUP_MAX_DISTANCE: int = 3
+
+    # Pre-serialized JSON bodies for hot responses (RSS feeds, category pages,
+    # mirrored Hacker News lists); category pages are re-rendered after the TTL
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: float = 10.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+
+    # Response compression: brotli (if installed) or gzip for complete
+    # responses of at least COMPRESSION_MINIMUM_SIZE bytes
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_MAX_ENTRIES: int = 256  # compressed copies of ETagged bodies
+
+    # Seconds browsers and the CDN may keep serving a cached response while
+    # revalidating it (max-age itself follows each source's refresh interval)
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 60
+
+    # Prometheus metrics at /metrics (request, upstream, parse and validation
+    # histograms); event-loop lag is sampled every METRICS_LOOP_LAG_INTERVAL seconds
+    METRICS_ENABLED: bool = True
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5
+
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
@@ -0,0 +1,74 @@
+import importlib
+from typing import List, Tuple
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match
+from starlette.types import Receive, Scope, Send
+
+
+class DeferredRouter(BaseRoute):
+    """
+    Placeholder for a router that is imported when first needed.
+
+    It matches every path under `prefix`. The first request there (or the
+    first OpenAPI schema build, see include_deferred) imports `module`,
+    includes its `router` in place of the placeholder and dispatches the
+    request again, so the module and the schemas it imports cost nothing
+    at startup.
+    """
+
+    def __init__(self, app: FastAPI, module: str, prefix: str, tags: List[str]):
+        self.app = app
+        self.module = module
+        self.prefix = prefix
+        self.tags = tags
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = scope["path"][len(scope.get("root_path", "")):]
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def load(self) -> None:
+        """Swap the placeholder for the real routes (once)"""
+        routes = self.app.router.routes
+        if self not in routes:
+            return
+        position = routes.index(self)
+        routes.remove(self)
+        before = len(routes)
+        router = importlib.import_module(self.module).router
+        self.app.include_router(router, prefix=self.prefix, tags=self.tags)
+        # Keep the routes where the router was declared, ahead of later ones
+        added = routes[before:]
+        del routes[before:]
+        routes[position:position] = added
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+
+def include_deferred(app: FastAPI, module: str, prefix: str, tags: List[str]) -> None:
+    """
+    Like app.include_router, but import the router module on first use
+
+    Args:
+        app: The application
+        module: Module path of a router module with a `router` attribute
+        prefix: Path prefix of the router
+        tags: OpenAPI tags for its routes
+    """
+    if not any(isinstance(route, DeferredRouter) for route in app.router.routes):
+        build_schema = app.openapi
+
+        def openapi():
+            # The schema lists every route, so load the deferred ones first
+            for route in list(app.router.routes):
+                if isinstance(route, DeferredRouter):
+                    route.load()
+            return build_schema()
+
+        app.openapi = openapi
+    app.router.routes.append(DeferredRouter(app, module, prefix, tags))
@@ -0,0 +1,66 @@
+import hashlib
+from typing import Optional
+
+# Standard library only: the Vercel handlers import this on their slim paths
+
+# Content codings CompressionMiddleware marks on the ETags of compressed bodies
+ENCODINGS = ("br", "gzip")
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact response bytes"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    ETag of the `encoding`-compressed copy of a body
+
+    A strong ETag names exact bytes, so each content coding gets its own
+    ("abc" becomes "abc-br"). Weak ETags are left as they are.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(tag: str) -> str:
+    """An If-None-Match entry with the weak prefix and any coding suffix removed"""
+    tag = tag.strip().removeprefix("W/")
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    client or CDN that weakened the tag (W/"...") still gets a 304. The
+    tags of compressed copies (see encoded_etag) match their body's ETag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _identity_etag(etag) in (_identity_etag(tag) for tag in if_none_match.split(","))
+
+
+def cache_control(max_age: float, stale_while_revalidate: int = 0) -> str:
+    """
+    Cache-Control for a response whose data is fresh for `max_age` more seconds
+
+    s-maxage lets shared caches (the Vercel CDN) answer repeat requests
+    without invoking the origin. A response that is already due for a
+    refresh is marked no-cache, so clients revalidate it with its ETag.
+    """
+    seconds = int(max_age)
+    if seconds <= 0:
+        return "no-cache"
+    value = f"public, max-age={seconds}, s-maxage={seconds}"
+    if stale_while_revalidate > 0:
+        value += f", stale-while-revalidate={stale_while_revalidate}"
+    return value
@@ -0,0 +1,103 @@
+import importlib.util
+from typing import Dict, Optional
+import httpx
+from app.core.circuit_breaker import CircuitBreakerTransport, upstream_health
+from app.core.config import settings
+from app.core.instrumentation import InstrumentedTransport
+from app.core.traffic_governor import GovernedTransport, traffic_governor
+
+
+# Upstream names used as keys for the shared client pools
+HACKER_NEWS = "hacker_news"
+RSS = "rss"
+
+
+class HTTPClientRegistry:
+    """
+    Holds one long-lived httpx.AsyncClient per upstream so connections are
+    reused (keep-alive / HTTP/2) instead of re-handshaking on every request.
+
+    Clients are created in the FastAPI lifespan hook via `startup()` and
+    closed in `shutdown()`. If a client is requested before startup (scripts,
+    serverless handlers) it is created lazily.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """HTTP/2 needs the optional `h2` package (installed via httpx[http2])"""
+        return settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+    def _build_client(self, name: str) -> httpx.AsyncClient:
+        """Create a pooled client configured for the given upstream"""
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = settings.HN_TIMEOUT if name == HACKER_NEWS else settings.RSS_TIMEOUT
+
+        transport = self._transport
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(http2=self._http2_available(), limits=limits)
+        if settings.METRICS_ENABLED:
+            transport = InstrumentedTransport(transport)
+        # Outermost, so requests failed fast by an open circuit never count as upstream traffic
+        if settings.CIRCUIT_BREAKER_ENABLED or settings.ADAPTIVE_TIMEOUT_ENABLED:
+            transport = CircuitBreakerTransport(transport, upstream_health)
+        # Outside the breaker: a request retried after a 429 reaches it as a new request
+        if settings.GOVERNOR_ENABLED:
+            transport = GovernedTransport(transport, traffic_governor)
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for an upstream, creating it if needed"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client(name)
+            self._clients[name] = client
+        return client
+
+    def set(self, name: str, client: httpx.AsyncClient) -> None:
+        """Replace the client for an upstream (tests, benchmarks)"""
+        self._clients[name] = client
+
+    def use_transport(self, transport: Optional[httpx.AsyncBaseTransport]) -> None:
+        """
+        Build all subsequently created clients on top of a custom transport,
+        e.g. httpx.MockTransport or an ASGI stub upstream.
+        """
+        self._transport = transport
+
+    async def startup(self) -> None:
+        """Open the client pools for all known upstreams"""
+        for name in (HACKER_NEWS, RSS):
+            self.get(name)
+
+    async def shutdown(self) -> None:
+        """Close all client pools"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
+
+
+def get_hacker_news_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared Hacker News client"""
+    return http_clients.get(HACKER_NEWS)
+
+
+def get_rss_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared RSS client"""
+    return http_clients.get(RSS)
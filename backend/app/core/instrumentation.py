@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+import httpx
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import (
+    EVENT_LOOP_LAG,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    UPSTREAM_REQUEST_DURATION,
+    UPSTREAM_REQUESTS_IN_FLIGHT,
+    UPSTREAM_RESPONSE_BYTES,
+    upstream_host,
+)
+
+
+class MetricsMiddleware:
+    """
+    Record the duration, status and route of every API request.
+
+    Requests are labeled with the route template (/api/v1/feeds/{category}),
+    not the raw path, so the number of series stays bounded; requests that
+    match no route share the "unmatched" label. Streaming responses are
+    timed until the stream ends.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(elapsed)
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Count the body bytes of an upstream response; record them when the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, host: str, in_flight):
+        self._stream = stream
+        self._host = host
+        self._in_flight = in_flight
+        self._bytes = 0
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._in_flight.dec()
+            UPSTREAM_RESPONSE_BYTES.labels(self._host).observe(self._bytes)
+        await self._stream.aclose()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Wrap an httpx transport to record upstream latency, status, body size
+    and in-flight requests per host.
+
+    Latency is measured to the response headers (redirects count as
+    separate requests); a request that fails without a response is
+    recorded with status "error".
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = upstream_host(request.url.host)
+        in_flight = UPSTREAM_REQUESTS_IN_FLIGHT.labels(host)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            in_flight.dec()
+            UPSTREAM_REQUEST_DURATION.labels(host, "error").observe(time.perf_counter() - started)
+            raise
+        UPSTREAM_REQUEST_DURATION.labels(host, str(response.status_code)).observe(time.perf_counter() - started)
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body already in memory (mock transports): httpx never closes its stream
+            in_flight.dec()
+            UPSTREAM_RESPONSE_BYTES.labels(host).observe(len(response.content))
+        else:
+            response.stream = _CountingStream(response.stream, host, in_flight)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LoopLagMonitor:
+    """
+    Sample event-loop lag: sleep for `interval` seconds and record how much
+    later than requested the loop resumed. Sustained lag means something is
+    blocking the loop (CPU-bound work that should go through the parse pool).
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - expected, 0.0))
+
+    async def start(self) -> None:
+        """Start sampling"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the sampling task and wait for it to finish"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
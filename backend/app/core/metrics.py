@@ -0,0 +1,309 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from app.core.categories import CATEGORIES
+
+# Standard library only: services import this, and so do the Vercel handlers
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# (name, type, help, [(labels, value), ...]) produced by a collector at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    A named metric with optional labels.
+
+    `labels(*values)` returns the child for one label combination, created
+    on first use; hot paths look the child up once and keep it. Unlabeled
+    metrics are used directly (`inc`, `set`, `observe`).
+
+    Children are plain counters without locks: observations come from the
+    event loop thread, and a lost update from a worker thread only costs
+    one sample.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in list(self._children.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        lines.append(f"# TYPE {self.name} histogram")
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+
+# TTLCache.stats() keys exported per registered cache
+_CACHE_FAMILIES = (
+    ("hits", "cache_hits_total", "counter", "Cache lookups answered from a fresh entry"),
+    ("stale_hits", "cache_stale_hits_total", "counter", "Cache lookups answered from an expired entry"),
+    ("misses", "cache_misses_total", "counter", "Cache lookups that found nothing usable"),
+    ("evictions", "cache_evictions_total", "counter", "Entries evicted to stay within the size limits"),
+    ("entries", "cache_entries", "gauge", "Entries currently cached"),
+    ("bytes", "cache_bytes", "gauge", "Approximate bytes currently cached"),
+)
+
+
+class MetricsRegistry:
+    """
+    The metrics exposed at /metrics, rendered in the Prometheus text format.
+
+    Besides metrics updated as things happen, the registry reads counters
+    that components already keep (cache stats, parse pool stats) at scrape
+    time, so those cost nothing on the request path.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._caches: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def _add(self, metric: Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def register_cache(self, name: str, cache: Any) -> None:
+        """Export an object's stats() (TTLCache or RenderedCache) as cache_* metrics labeled cache=name"""
+        self._caches[name] = cache
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Call `collector` on every scrape; it yields (name, type, help, samples) families"""
+        self._collectors.append(collector)
+
+    def _cache_families(self) -> Iterable[Family]:
+        stats = {name: cache.stats() for name, cache in self._caches.items()}
+        for key, name, kind, documentation in _CACHE_FAMILIES:
+            samples = [({"cache": cache}, values[key]) for cache, values in stats.items() if key in values]
+            if samples:
+                yield name, kind, documentation, samples
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            metric.render(lines)
+        families = list(self._cache_families())
+        for collector in self._collectors:
+            families.extend(collector())
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an API request, by route template and status",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "API requests being handled")
+
+UPSTREAM_REQUEST_DURATION = registry.histogram(
+    "upstream_request_duration_seconds",
+    "Time from sending an upstream request to its response headers, by host and status",
+    ("host", "status"),
+)
+UPSTREAM_RESPONSE_BYTES = registry.histogram(
+    "upstream_response_bytes",
+    "Upstream response body bytes read (as sent, before decompression), by host",
+    ("host",),
+    buckets=SIZE_BUCKETS,
+)
+UPSTREAM_REQUESTS_IN_FLIGHT = registry.gauge(
+    "upstream_requests_in_flight", "Upstream requests sent and not yet fully read, by host", ("host",)
+)
+
+FEED_PARSE_DURATION = registry.histogram(
+    "feed_parse_duration_seconds",
+    "Time spent parsing one feed document: streaming (fast path, including built entries) or feedparser",
+    ("parser",),
+)
+VALIDATION_DURATION = registry.histogram(
+    "pydantic_validation_duration_seconds",
+    "Time spent building pydantic models from upstream data, by model",
+    ("model",),
+)
+
+EVENT_LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a sleeping task, sampled periodically",
+    buckets=LAG_BUCKETS,
+)
+
+
+def _known_hosts() -> frozenset:
+    hosts = {"hacker-news.firebaseio.com", "www.techradar.com"}
+    for category in CATEGORIES.values():
+        hosts.update(urlsplit(url).hostname for url in category.feeds)
+    return frozenset(hosts)
+
+
+_KNOWN_HOSTS = _known_hosts()
+
+
+def upstream_host(host: Optional[str]) -> str:
+    """
+    Host label for upstream metrics
+
+    Feed URLs come from clients, so hosts outside the configured sources
+    share one "other" label to keep the number of series bounded.
+    """
+    return host if host in _KNOWN_HOSTS else "other"
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import Family, registry
+
+
+def _timed_call(fn: Callable, *args) -> Tuple[Any, float]:
+    """Run fn in the worker and measure the time spent there"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class ParsePool:
+    """
+    Runs CPU-bound parsing off the event loop.
+
+    `kind` selects the executor:
+    - "thread": a thread pool (default). The loop keeps serving while a
+      feed parses, but parses share the GIL.
+    - "process": a process pool, so feeds parse in parallel across cores.
+      The function and its arguments must be picklable.
+    - "inline": parse on the loop itself (debugging, or platforms without
+      worker support).
+
+    At most `workers + queue_size` jobs are handed to the executor; further
+    callers wait on the loop until a slot frees up. Like the HTTP client
+    registry, the executor is created in `startup()` or lazily on first use.
+    """
+
+    KINDS = ("thread", "process", "inline")
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None, queue_size: int = 32):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown parse pool kind {kind!r}, expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.queue_size = queue_size
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.waited = 0
+        self.parse_seconds = 0.0
+        self.max_parse_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                # Imported on demand; it pulls in multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Per-loop semaphore, so serverless handlers running a fresh loop per request still work"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers + self.queue_size)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable, *args, observe: Optional[Callable[[float], None]] = None) -> Any:
+        """
+        Run fn(*args) in the pool and record how long it took
+
+        Args:
+            fn: Function to run (picklable for the process pool)
+            observe: Optional callback given the seconds fn took in the worker
+                (e.g. a metrics histogram's observe)
+
+        Raises:
+            Whatever fn raises
+        """
+        slots = self._get_slots()
+        if slots.locked():
+            self.waited += 1
+        async with slots:
+            self.in_flight += 1
+            try:
+                if self.kind == "inline":
+                    result, elapsed = _timed_call(fn, *args)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result, elapsed = await loop.run_in_executor(self._get_executor(), _timed_call, fn, *args)
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+        self.completed += 1
+        self.parse_seconds += elapsed
+        self.max_parse_seconds = max(self.max_parse_seconds, elapsed)
+        if observe is not None:
+            observe(elapsed)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration, queue usage and parse-time counters"""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "waited": self.waited,
+            "parse_ms_total": round(self.parse_seconds * 1000, 3),
+            "parse_ms_avg": round(self.parse_seconds * 1000 / self.completed, 3) if self.completed else 0.0,
+            "parse_ms_max": round(self.max_parse_seconds * 1000, 3),
+        }
+
+    async def startup(self) -> None:
+        """Create the executor up front so the first parse does not pay for it"""
+        if self.kind != "inline":
+            self._get_executor()
+
+    async def shutdown(self) -> None:
+        """Stop the executor, waiting for running parses to finish"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+
+parse_pool = ParsePool(
+    kind=settings.PARSE_POOL_KIND,
+    workers=settings.PARSE_POOL_WORKERS,
+    queue_size=settings.PARSE_POOL_QUEUE_SIZE,
+)
+
+
+def _pool_metrics() -> Iterable[Family]:
+    """Parse pool counters for /metrics"""
+    yield "parse_pool_in_flight", "gauge", "Parses running in the pool", [({}, parse_pool.in_flight)]
+    yield "parse_pool_waited_total", "counter", "Parses that waited for a free pool slot", [({}, parse_pool.waited)]
+    yield "parse_pool_failed_total", "counter", "Parses that raised", [({}, parse_pool.failed)]
+
+
+registry.register_collector(_pool_metrics)
@@ -0,0 +1,24 @@
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.http_cache import cache_control, etag_matches
+from app.core.serialization import Rendered
+
+
+def cached_json_response(request: Request, rendered: Rendered, max_age: float) -> Response:
+    """
+    Send a pre-rendered JSON body with its ETag and Cache-Control
+
+    A request whose If-None-Match matches the ETag gets an empty 304.
+
+    Args:
+        request: The incoming request
+        rendered: Body and ETag from a rendered-response cache
+        max_age: Seconds until the underlying data is due for a refresh
+    """
+    headers = {
+        "ETag": rendered.etag,
+        "Cache-Control": cache_control(max_age, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE),
+    }
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
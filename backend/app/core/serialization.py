@@ -0,0 +1,71 @@
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+import orjson
+import pydantic_core
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_cache import strong_etag
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a response body to UTF-8 JSON bytes
+
+    Pydantic models are serialized by pydantic-core in one pass (no
+    intermediate dicts); anything else goes through orjson. The output is
+    the same as FastAPI's response_model serialization followed by
+    ORJSONResponse.
+    """
+    if isinstance(content, BaseModel):
+        return pydantic_core.to_json(content)
+    return orjson.dumps(content)
+
+
+class Rendered(NamedTuple):
+    """A JSON body ready to send, with the strong ETag of its bytes"""
+    body: bytes
+    etag: str
+
+
+def render(content: Any) -> Rendered:
+    """Serialize a response body and compute its ETag"""
+    body = dumps(content)
+    return Rendered(body, strong_etag(body))
+
+
+class RenderedCache:
+    """
+    Ready-to-send JSON bodies (with their ETags) keyed by request parameters.
+
+    Each body is stored with the version of the data it was rendered from;
+    a lookup with a different version (or after `ttl` seconds) misses, so
+    callers bump a counter when their data changes instead of tracking
+    which keys to invalidate.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self._cache = TTLCache(ttl=ttl, max_entries=max_entries)
+        self.stale_versions = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Rendered]:
+        """The rendered body for `key` if it was rendered from `version`"""
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        cached_version, rendered = cached
+        if cached_version != version:
+            self.stale_versions += 1
+            return None
+        return rendered
+
+    def put(self, key: Hashable, version: int, content: Any) -> Rendered:
+        """Serialize `content`, store it for `key` and return it"""
+        rendered = render(content)
+        if settings.RESPONSE_CACHE_ENABLED:
+            self._cache.set(key, (version, rendered), size=len(rendered.body))
+        return rendered
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._cache.stats(), "stale_versions": self.stale_versions}
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Coroutine, Dict, Optional
+from app.core.http_cache import cache_control, etag_matches
+
+# One event loop per function instance. asyncio.run would create and close a
+# loop for every invocation, taking the pooled upstream connections with it;
+# keeping the loop lets the shared http_clients and the service caches
+# survive across warm invocations of the same instance.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def run(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on the instance's persistent event loop
+
+    Used by the Vercel BaseHTTPRequestHandler functions under api/. Calls
+    are serialized, since one loop cannot run in two threads at once.
+    Background work (e.g. stale-while-revalidate refreshes) resumes while
+    the next invocation runs.
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(_loop)
+        return _loop.run_until_complete(coro)
+
+
+def send_json(
+    handler: BaseHTTPRequestHandler,
+    body: bytes,
+    etag: Optional[str] = None,
+    max_age: float = 0,
+    headers: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    Write a JSON response from a Vercel BaseHTTPRequestHandler
+
+    With an ETag, a matching If-None-Match is answered with an empty 304.
+    A positive max_age adds Cache-Control with s-maxage, so the Vercel CDN
+    answers repeat requests without invoking the function.
+    """
+    not_modified = etag is not None and etag_matches(handler.headers.get("If-None-Match"), etag)
+    handler.send_response(304 if not_modified else 200)
+    handler.send_header("Content-type", "application/json")
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    if etag is not None:
+        handler.send_header("ETag", etag)
+    if max_age > 0:
+        # Settings load pydantic; only cacheable (service-backed) responses need them
+        from app.core.config import settings
+        handler.send_header("Cache-Control", cache_control(max_age, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE))
+    if not not_modified:
+        handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    if not not_modified:
+        handler.wfile.write(body)
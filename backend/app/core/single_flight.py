@@ -0,0 +1,116 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List
+from app.core.metrics import Family, registry
+from app.core.traffic_governor import Lane, current_priority, shared_lane, traffic_governor
+
+
+class _Call:
+    """One execution in flight, its outbound lane and the number of callers waiting for it"""
+    __slots__ = ("task", "lane", "waiters")
+
+    def __init__(self, task: asyncio.Task, lane: Lane):
+        self.task = task
+        self.lane = lane
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key starts `fn(*args)` as a task; callers that
+    arrive while it runs wait for the same task instead of starting their
+    own, so a burst of identical requests costs one upstream fetch. The
+    key is forgotten as soon as the task finishes: results are not cached
+    here (the services' caches do that), and a failure is raised to every
+    waiting caller but not to later ones.
+
+    Cancelling a caller (client disconnect, deadline) only stops it from
+    waiting. The shared task is cancelled once every caller has given up,
+    since nobody needs its result any more.
+
+    The task's upstream requests go in the most urgent lane of its callers:
+    a user-facing caller joining a background fetch (see
+    background_priority) promotes it to the foreground.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0  # tasks started
+        self.coalesced = 0  # callers that joined a task already in flight
+        _flights.append(self)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def run(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args) -> Any:
+        """
+        Await fn(*args), sharing the execution with concurrent callers for `key`
+
+        Raises:
+            Whatever fn raises
+        """
+        loop = asyncio.get_running_loop()
+        priority = current_priority()
+        call = self._calls.get(key)
+        # A task from a loop that has since closed (serverless.run replaces
+        # a closed instance loop) can never finish, so it is replaced
+        if call is None or call.task.get_loop() is not loop:
+            lane = Lane(priority)
+            with shared_lane(lane):
+                task = loop.create_task(fn(*args))
+            call = _Call(task, lane)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._done(key, call, task))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            traffic_governor.promote(call.lane, priority)
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller gave up
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _done(self, key: Hashable, call: _Call, task: asyncio.Task) -> None:
+        self._forget(key, call)
+        # Mark the outcome as retrieved even if every waiter was cancelled
+        # at the moment the task failed
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+_flights: List[SingleFlight] = []
+
+
+def _flight_metrics() -> Iterable[Family]:
+    """Single-flight counters for /metrics"""
+    yield (
+        "single_flight_executions_total",
+        "counter",
+        "Upstream operations started by the single-flight layer",
+        [({"operation": flight.name}, flight.executions) for flight in _flights],
+    )
+    yield (
+        "single_flight_coalesced_total",
+        "counter",
+        "Callers that joined an identical operation already in flight",
+        [({"operation": flight.name}, flight.coalesced) for flight in _flights],
+    )
+
+
+registry.register_collector(_flight_metrics)
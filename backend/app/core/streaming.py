@@ -0,0 +1,54 @@
+from typing import AsyncIterator, Optional, Tuple
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON = "application/x-ndjson"
+EVENT_STREAM = "text/event-stream"
+
+# Keep reverse proxies from buffering or caching streams
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# (event name, payload) pairs produced by the streaming article endpoints
+StreamEvents = AsyncIterator[Tuple[str, BaseModel]]
+
+
+def stream_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Return the streaming media type requested by an Accept header
+
+    Returns:
+        NDJSON, EVENT_STREAM, or None for a regular JSON response
+    """
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in (NDJSON, EVENT_STREAM):
+            return media_type
+    return None
+
+
+def encode_event(event: str, data: BaseModel, media_type: str) -> bytes:
+    """
+    Encode one event
+
+    NDJSON lines look like {"event": ..., "data": ...}; Server-Sent Events
+    use the event name as the SSE event type.
+    """
+    payload = data.model_dump_json()
+    if media_type == EVENT_STREAM:
+        return f"event: {event}\ndata: {payload}\n\n".encode()
+    return f'{{"event":"{event}","data":{payload}}}\n'.encode()
+
+
+def stream_events(events: StreamEvents, media_type: str) -> StreamingResponse:
+    """Send events as they are produced, one NDJSON line or SSE message each"""
+    async def body():
+        async for event, data in events:
+            yield encode_event(event, data, media_type)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers=STREAM_HEADERS
+    )
@@ -0,0 +1,409 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+import httpx
+from app.core.config import settings
+from app.core.metrics import Family, registry, upstream_host
+
+# Priority lanes: lower goes first
+FOREGROUND, BACKGROUND = 0, 1
+
+_priority: ContextVar[int] = ContextVar("outbound_priority", default=FOREGROUND)
+
+
+class Lane:
+    """
+    Priority shared by an operation that several callers wait for (see
+    SingleFlight) and by every task it starts. It is raised when a more
+    urgent caller joins, see TrafficGovernor.promote.
+    """
+
+    __slots__ = ("priority",)
+
+    def __init__(self, priority: int):
+        self.priority = priority
+
+
+_lane: ContextVar[Optional[Lane]] = ContextVar("outbound_lane", default=None)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """
+    Send the upstream requests made inside this block (and in tasks it
+    starts) in the background lane, behind any user-facing request waiting
+    for the same host
+    """
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def shared_lane(lane: Lane) -> Iterator[None]:
+    """Send the upstream requests of tasks started inside this block at `lane`'s priority (or higher)"""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_priority() -> int:
+    """Lane the upstream requests of the current task are sent in"""
+    lane = _lane.get()
+    if lane is None:
+        return _priority.get()
+    return min(_priority.get(), lane.priority)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), None if absent or invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment is None:
+        return None
+    return max(moment.timestamp() - time.time(), 0.0)
+
+
+class HostLimiter:
+    """
+    Token bucket and concurrency limit for one upstream host.
+
+    A request takes a token (refilled at `rate` per second, at most `burst`
+    saved up) and one of `concurrency` slots, held until its response body
+    is closed. Requests that cannot start at once wait in priority order,
+    FIFO within a lane.
+
+    A 429 halves the current rate (never below 5% of the configured one)
+    and pauses the host until its Retry-After; each success after that
+    adds back 2% of the configured rate. The host is thus held just below
+    the limit it actually enforces instead of repeatedly running into it.
+    """
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.limit = rate
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.concurrency = max(concurrency, 1)
+        self.tokens = float(self.burst)
+        self.active = 0
+        self.blocked_until = 0.0
+        self.queued = 0  # requests that had to wait
+        self.throttled = 0  # 429s and Retry-After 503s received
+        self.wait_time = 0.0
+        self._refilled = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future, Optional[Lane]]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future, _ in self._waiters if not future.done())
+
+    def _delay(self, now: float) -> float:
+        """Seconds until the next token is available (0 if one is)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def _take(self) -> None:
+        self.tokens -= 1
+        self.active += 1
+
+    async def acquire(self, priority: int, timeout: Optional[float] = None, lane: Optional[Lane] = None) -> None:
+        """
+        Wait for a token and a slot
+
+        Args:
+            priority: Lane to wait in (FOREGROUND or BACKGROUND)
+            timeout: Seconds to wait at most
+            lane: Shared lane of the caller, so promote() can move it up while it waits
+
+        Raises:
+            asyncio.TimeoutError: No slot within `timeout` seconds
+        """
+        if not self._waiters and self.active < self.concurrency and self._delay(time.monotonic()) == 0:
+            self._take()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, lane))
+        self.queued += 1
+        started = time.monotonic()
+        self._dispatch()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            # Granted just as the caller gave up: hand the slot on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            self.wait_time += time.monotonic() - started
+
+    def release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    def promote(self, lane: Lane) -> None:
+        """Move requests queued for `lane` up to its current priority"""
+        moved = False
+        for index, (priority, sequence, future, owner) in enumerate(self._waiters):
+            if owner is lane and lane.priority < priority:
+                self._waiters[index] = (lane.priority, sequence, future, owner)
+                moved = True
+        if moved:
+            heapq.heapify(self._waiters)
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start as many queued requests as tokens and slots allow, highest priority first"""
+        while self._waiters:
+            future = self._waiters[0][2]
+            # Abandoned waiters, including ones left by a closed serverless loop
+            if future.done() or future.get_loop().is_closed():
+                heapq.heappop(self._waiters)
+                continue
+            if self.active >= self.concurrency:
+                return  # release() dispatches again
+            delay = self._delay(time.monotonic())
+            if delay > 0:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self._take()
+            future.set_result(None)
+
+    def throttle(self, retry_after: Optional[float], max_pause: float) -> float:
+        """
+        Back off after a 429 (or a 503 with Retry-After)
+
+        Returns:
+            Seconds until the host accepts requests again
+        """
+        self.throttled += 1
+        self.rate = max(self.rate / 2, self.limit * 0.05)
+        self.tokens = 0.0
+        pause = min(retry_after if retry_after is not None else 1 / self.rate, max_pause)
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + pause)
+        self._refilled = self.blocked_until
+        return self.blocked_until - now
+
+    def succeeded(self) -> None:
+        if self.rate < self.limit:
+            self.rate = min(self.limit, self.rate + self.limit * 0.02)
+
+
+class TrafficGovernor:
+    """
+    Outbound rate and concurrency limits per upstream host, shared by
+    every client pool (Hacker News, RSS) and so by all services.
+
+    Hosts listed in `host_limits` get their own rate/burst/concurrency;
+    any other host gets the defaults. Hosts are tracked in LRU order, at
+    most `max_hosts` at a time, since feed URLs come from clients.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 10.0,
+        default_burst: int = 20,
+        default_concurrency: int = 8,
+        host_limits: Optional[Dict[str, Tuple[float, int, int]]] = None,
+        max_retry_wait: float = 5.0,
+        max_pause: float = 600.0,
+        max_hosts: int = 256
+    ):
+        self.default_limits = (default_rate, default_burst, default_concurrency)
+        self.host_limits = host_limits or {}
+        self.max_retry_wait = max_retry_wait
+        self.max_pause = max_pause
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, HostLimiter]" = OrderedDict()
+
+    def host(self, name: str) -> HostLimiter:
+        limiter = self._hosts.get(name)
+        if limiter is None:
+            limiter = self._hosts[name] = HostLimiter(*self.host_limits.get(name, self.default_limits))
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(name)
+        return limiter
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Current rate, slots in use and queue counters per host"""
+        return {
+            name: {
+                "rate": round(limiter.rate, 3),
+                "configured_rate": limiter.limit,
+                "concurrency": limiter.concurrency,
+                "active": limiter.active,
+                "waiting": limiter.waiting,
+                "queued": limiter.queued,
+                "throttled": limiter.throttled,
+                "wait_seconds": round(limiter.wait_time, 3),
+            }
+            for name, limiter in self._hosts.items()
+        }
+
+    def promote(self, lane: Lane, priority: int) -> None:
+        """
+        Raise a shared lane to `priority`: later requests of its tasks and
+        the ones already queued move ahead of the lower lane
+        """
+        if priority >= lane.priority:
+            return
+        lane.priority = priority
+        for limiter in self._hosts.values():
+            limiter.promote(lane)
+
+    def reset(self) -> None:
+        self._hosts.clear()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Release the host slot once the response body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, limiter: HostLimiter):
+        self._stream = stream
+        self._limiter = limiter
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter.release()
+        await self._stream.aclose()
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """
+    Wrap an httpx transport with the per-host limits of `governor`.
+
+    Requests wait for their host's token bucket and concurrency slot, in
+    the lane of the caller (see `background_priority` and `shared_lane`). Waiting longer
+    than the request's pool timeout raises httpx.PoolTimeout. A 429, or a
+    503 with Retry-After, pauses the host; an idempotent request is retried
+    once when the pause is at most `max_retry_wait` seconds, otherwise the
+    response is returned as is.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, governor: TrafficGovernor):
+        self._transport = transport
+        self._governor = governor
+
+    async def _acquire(self, request: httpx.Request, limiter: HostLimiter) -> None:
+        timeout = (request.extensions.get("timeout") or {}).get("pool")
+        try:
+            await limiter.acquire(current_priority(), timeout, _lane.get())
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout(
+                f"Waited over {timeout}s for a request slot to {request.url.host}", request=request
+            ) from None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        governor = self._governor
+        limiter = governor.host(request.url.host)
+        retries = 1 if request.method in ("GET", "HEAD") else 0
+        while True:
+            await self._acquire(request, limiter)
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BaseException:
+                limiter.release()
+                raise
+
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if response.status_code == 429 or (response.status_code == 503 and retry_after is not None):
+                pause = limiter.throttle(retry_after, governor.max_pause)
+                if retries and pause <= governor.max_retry_wait:
+                    retries -= 1
+                    await response.aclose()
+                    limiter.release()
+                    continue
+            elif response.status_code < 500:
+                limiter.succeeded()
+
+            if isinstance(response.stream, httpx.ByteStream):
+                # Body already in memory (mock transports): httpx never closes its stream
+                limiter.release()
+            else:
+                response.stream = _ReleasingStream(response.stream, limiter)
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+traffic_governor = TrafficGovernor(
+    default_rate=settings.GOVERNOR_DEFAULT_RATE,
+    default_burst=settings.GOVERNOR_DEFAULT_BURST,
+    default_concurrency=settings.GOVERNOR_DEFAULT_CONCURRENCY,
+    host_limits=settings.governor_host_limits,
+    max_retry_wait=settings.GOVERNOR_MAX_RETRY_WAIT,
+)
+
+
+def _governor_metrics() -> Iterable[Family]:
+    """Queue and throttling counters of the configured sources for /metrics"""
+    waiting, active, rates, queued, throttled, waited = [], [], [], {}, {}, {}
+    for name, limiter in list(traffic_governor._hosts.items()):
+        label = upstream_host(name)
+        queued[label] = queued.get(label, 0) + limiter.queued
+        throttled[label] = throttled.get(label, 0) + limiter.throttled
+        waited[label] = waited.get(label, 0.0) + limiter.wait_time
+        if label == "other":
+            continue
+        waiting.append(({"host": label}, limiter.waiting))
+        active.append(({"host": label}, limiter.active))
+        rates.append(({"host": label}, limiter.rate))
+    yield "upstream_governor_waiting", "gauge", "Upstream requests waiting for a token or slot, by host", waiting
+    yield "upstream_governor_active", "gauge", "Upstream request slots in use, by host", active
+    yield "upstream_governor_rate", "gauge", "Current request rate limit per host (requests/second)", rates
+    yield (
+        "upstream_governor_queued_total",
+        "counter",
+        "Upstream requests that had to wait for a token or slot",
+        [({"host": label}, count) for label, count in queued.items()],
+    )
+    yield (
+        "upstream_governor_wait_seconds_total",
+        "counter",
+        "Time upstream requests spent waiting for a token or slot",
+        [({"host": label}, seconds) for label, seconds in waited.items()],
+    )
+    yield (
+        "upstream_throttled_total",
+        "counter",
+        "429 (and Retry-After 503) responses received, by host",
+        [({"host": label}, count) for label, count in throttled.items()],
+    )
+
+
+registry.register_collector(_governor_metrics)
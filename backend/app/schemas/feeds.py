@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from app.schemas.rss_feed import RSSFeedStatus
+
+
+class ArticleSource(BaseModel):
+    """One copy of a story that was collapsed into a deduplicated article"""
+    id: str = Field(..., description="Article identifier at this source")
+    source: str = Field(..., description="Human readable source name")
+    category: str = Field(..., description="Category id of this copy")
+    url: Optional[str] = Field(None, description="Article URL at this source")
+
+
+class FeedArticle(BaseModel):
+    """Schema for an article normalized across RSS and Hacker News sources"""
+    id: str = Field(..., description="Stable article identifier")
+    title: str = Field(..., description="Article title")
+    category: str = Field(..., description="Category id (llm, automation, architecture, ...)")
+    source: str = Field(..., description="Human readable source name")
+    url: Optional[str] = Field(None, description="Article URL")
+    published: Optional[str] = Field(None, description="Publication date (ISO 8601 when parseable)")
+    timestamp: Optional[int] = Field(None, description="Publication time as a Unix timestamp")
+    excerpt: str = Field("", description="Plain-text excerpt")
+    content: Optional[str] = Field(None, description="Plain-text full content")
+    author: Optional[str] = Field(None, description="Article author")
+    score: Optional[int] = Field(None, description="Score/points (Hacker News only)")
+    comments: Optional[int] = Field(None, description="Number of comments (Hacker News only)")
+    sources: Optional[List[ArticleSource]] = Field(
+        None, description="All copies of this story when duplicates were collapsed"
+    )
+    categories: Optional[List[str]] = Field(
+        None, description="Every category with a copy of this story when duplicates were collapsed"
+    )
+
+
+class FeedCategoryInfo(BaseModel):
+    """Schema for a registered feed category"""
+    id: str = Field(..., description="Category id")
+    label: str = Field(..., description="Category label")
+    source: str = Field(..., description="Human readable source name")
+    feeds: List[str] = Field(..., description="Upstream RSS feed URLs")
+    hacker_news: Optional[str] = Field(None, description="Hacker News story list, if any")
+
+
+class CategoryFeedResponse(BaseModel):
+    """Response schema for a merged, paginated category feed"""
+    category: str = Field(..., description="Requested category id")
+    total: int = Field(..., description="Total number of merged articles")
+    page: int = Field(..., description="Current page (1-based)")
+    page_size: int = Field(..., description="Articles per page")
+    articles: List[FeedArticle] = Field(..., description="Articles on this page, newest first")
+    sources: List[RSSFeedStatus] = Field(..., description="Per-source fetch status")
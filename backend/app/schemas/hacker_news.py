@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
@@ -26,8 +26,56 @@ class HackerNewsResponse(BaseModel):
     articles: List[HackerNewsArticle] = Field(..., description="List of articles")
 
 
+class HackerNewsComment(BaseModel):
+    """Schema for one comment of a Hacker News comment tree"""
+    id: int = Field(..., description="Hacker News item ID")
+    parent: int = Field(..., description="ID of the story or comment this replies to")
+    depth: int = Field(..., description="1 for top-level comments, 2 for their replies, ...")
+    by: Optional[str] = Field(None, description="Author username")
+    text: Optional[str] = Field(None, description="Comment body (HTML, as sent by Hacker News)")
+    time: Optional[int] = Field(None, description="Unix timestamp")
+    deleted: bool = Field(False, description="Whether the comment was deleted")
+    dead: bool = Field(False, description="Whether the comment was flagged dead")
+    replies: int = Field(0, description="Direct replies upstream; more than len(children) when the tree was cut short")
+    children: List["HackerNewsComment"] = Field(default_factory=list, description="Replies, in Hacker News order")
+
+
+class HackerNewsCommentSummary(BaseModel):
+    """Totals of a comment tree fetch (also the trailer event of a streamed tree)"""
+    root_id: int = Field(..., description="ID of the story (or comment) whose replies were fetched")
+    total: int = Field(..., description="Number of comments included")
+    descendants: Optional[int] = Field(None, description="Comment count reported by Hacker News for the story")
+    complete: bool = Field(..., description="Whether every reply was fetched")
+    truncated: List[str] = Field(
+        default_factory=list,
+        description="Limits that cut the tree short: max_depth, max_nodes, time_budget"
+    )
+    elapsed_ms: float = Field(..., description="Time taken to build the tree in milliseconds")
+    errors: List[str] = Field(default_factory=list, description="Comments that could not be loaded")
+
+
+class HackerNewsCommentTree(HackerNewsCommentSummary):
+    """Response schema for a Hacker News comment tree"""
+    story: Optional[HackerNewsArticle] = Field(None, description="The story, when the root is a story")
+    comments: List[HackerNewsComment] = Field(..., description="Top-level comments with nested replies")
+
+
 class HackerNewsFilter(BaseModel):
     """Query parameters for filtering Hacker News articles"""
     min_score: Optional[int] = Field(None, ge=0, description="Minimum score filter")
     limit: int = Field(10, ge=1, le=100, description="Number of articles to fetch")
     story_type: str = Field("topstories", description="Type of stories (topstories, newstories, beststories)")
+
+
+class HackerNewsMirrorStatus(BaseModel):
+    """Response schema for the Hacker News mirror status"""
+    running: bool = Field(..., description="Whether the mirror poll loop is running")
+    ready: bool = Field(..., description="Whether the initial sync finished and routes serve from the mirror")
+    lists: Dict[str, int] = Field(..., description="Number of IDs held per story list")
+    items: int = Field(..., description="Items held in the mirror")
+    polls: int = Field(0, description="Successful polls of /v0/updates.json")
+    items_refetched: int = Field(0, description="Items refetched because they appeared in updates or a list")
+    upstream_requests: int = Field(0, description="Requests the mirror sent upstream")
+    last_sync: Optional[datetime] = Field(None, description="Time of the last story list sync")
+    last_poll: Optional[datetime] = Field(None, description="Time of the last updates poll")
+    last_error: Optional[str] = Field(None, description="Error from the last failed sync or poll")
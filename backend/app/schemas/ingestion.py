@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class IngestionSourceStatus(BaseModel):
+    """Refresh status of one ingested upstream source"""
+    source: str = Field(..., description="Feed URL or Hacker News story list URL")
+    kind: str = Field(..., description="Source kind (rss, hacker_news)")
+    category: str = Field(..., description="Category the source belongs to")
+    articles: int = Field(0, description="Articles stored from the last successful refresh")
+    refreshes: int = Field(0, description="Number of successful refreshes")
+    consecutive_failures: int = Field(0, description="Failed refreshes since the last success")
+    last_refresh: Optional[datetime] = Field(None, description="Time of the last successful refresh")
+    last_duration_ms: Optional[float] = Field(None, description="Duration of the last refresh attempt in milliseconds")
+    last_error: Optional[str] = Field(None, description="Error from the last failed refresh")
+    next_refresh: Optional[datetime] = Field(None, description="Scheduled time of the next refresh")
+
+
+class IngestionStatusResponse(BaseModel):
+    """Response schema for the ingestion scheduler status"""
+    running: bool = Field(..., description="Whether the scheduler is running")
+    interval: float = Field(..., description="Base refresh interval in seconds")
+    sources: List[IngestionSourceStatus] = Field(..., description="Per-source refresh status")
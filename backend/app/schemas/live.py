@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class LiveStatsResponse(BaseModel):
+    """Response schema for live push channel counters"""
+    subscribers: int = Field(..., description="Connected subscribers")
+    published: int = Field(..., description="Changed articles published by ingestion")
+    delivered: int = Field(..., description="Article events queued for subscribers")
+    dropped_subscribers: int = Field(..., description="Subscribers disconnected for falling behind")
+    queue_size: int = Field(..., description="Maximum unread publish batches queued per subscriber")
+    heartbeat_interval: float = Field(..., description="Seconds between heartbeats on an idle connection")
@@ -26,3 +26,20 @@ class RSSFeedResponse(BaseModel):
     feed_info: RSSFeedInfo = Field(..., description="RSS feed metadata")
     total: int = Field(..., description="Total number of articles fetched")
     articles: List[RSSArticle] = Field(..., description="List of articles")
+
+
+class RSSFeedStatus(BaseModel):
+    """Per-feed outcome of a multi-feed fetch"""
+    url: str = Field(..., description="RSS feed URL")
+    status: str = Field(..., description="Fetch outcome (ok, error, timeout)")
+    articles: int = Field(0, description="Number of articles returned from this feed")
+    elapsed_ms: float = Field(..., description="Time spent fetching this feed in milliseconds")
+    error: Optional[str] = Field(None, description="Error message if the fetch failed")
+
+
+class RSSMultipleFeedsResponse(BaseModel):
+    """Response schema for articles fetched from several RSS feeds"""
+    total_feeds: int = Field(..., description="Number of feeds requested")
+    total_articles: int = Field(..., description="Total number of articles fetched")
+    articles: List[RSSArticle] = Field(..., description="Combined list of articles")
+    feeds: List[RSSFeedStatus] = Field(..., description="Per-feed fetch status")
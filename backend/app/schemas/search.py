@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List
+from app.schemas.feeds import FeedArticle
+
+
+class SearchResponse(BaseModel):
+    """Response schema for full-text article search"""
+    query: str = Field(..., description="Search query as received")
+    total: int = Field(..., description="Total number of matching articles")
+    limit: int = Field(..., description="Maximum results per page")
+    offset: int = Field(..., description="Number of results skipped")
+    took_ms: float = Field(..., description="Query time in milliseconds")
+    results: List[FeedArticle] = Field(..., description="Matching articles")
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import List
+from app.schemas.rss_feed import RSSFeedStatus
+
+
+class StreamTrailer(BaseModel):
+    """Final event of a streamed article response"""
+    total: int = Field(..., description="Number of articles sent")
+    elapsed_ms: float = Field(..., description="Time from request to trailer in milliseconds")
+    sources: List[RSSFeedStatus] = Field(..., description="Per-source fetch status")
+    errors: List[str] = Field(default_factory=list, description="Errors for individual items that could not be loaded")
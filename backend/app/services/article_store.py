@@ -0,0 +1,80 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from app.schemas.feeds import FeedArticle
+
+
+@dataclass
+class StoredSource:
+    """The latest articles ingested from one upstream source"""
+    source: str
+    category: str
+    articles: List[FeedArticle] = field(default_factory=list)
+    updated_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the source was last refreshed"""
+        return time.monotonic() - self.updated_at
+
+
+class ArticleStore:
+    """
+    In-process store of ingested articles, keyed by upstream source
+    (a feed URL, or the Hacker News story list URL).
+
+    The ingestion scheduler writes into it; read endpoints serve from it so
+    request latency no longer depends on upstream latency. `version` is
+    bumped whenever a refresh changes what a source holds.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, StoredSource] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def put(self, source: str, category: str, articles: List[FeedArticle]) -> List[FeedArticle]:
+        """
+        Replace the articles stored for a source
+
+        Returns:
+            Articles that are new or changed compared to the previous refresh
+        """
+        previous = self._sources.get(source)
+        known = {a.id: a for a in previous.articles} if previous else {}
+        changed = [a for a in articles if known.get(a.id) != a]
+        if changed or previous is None or [a.id for a in previous.articles] != [a.id for a in articles]:
+            self.version += 1
+
+        self._sources[source] = StoredSource(
+            source=source,
+            category=category,
+            articles=list(articles),
+            updated_at=time.monotonic(),
+        )
+        return changed
+
+    def get(self, source: str, max_age: Optional[float] = None) -> Optional[StoredSource]:
+        """Return a stored source, or None if missing or older than max_age seconds"""
+        stored = self._sources.get(source)
+        if stored is None or (max_age is not None and stored.age > max_age):
+            return None
+        return stored
+
+    def articles(self, category: Optional[str] = None) -> List[FeedArticle]:
+        """All stored articles, optionally restricted to one category"""
+        return [
+            article
+            for stored in self._sources.values()
+            if category is None or stored.category == category
+            for article in stored.articles
+        ]
+
+    def clear(self) -> None:
+        self._sources.clear()
+        self.version += 1
+
+
+article_store = ArticleStore()
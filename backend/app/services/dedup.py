@@ -0,0 +1,207 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from app.core.config import settings
+from app.schemas.feeds import ArticleSource, FeedArticle
+
+# Query parameters that only track where a click came from. Generic names
+# like "ref" or "si" select content on some sites, so they are only
+# stripped on the sites known to use them for tracking (SITE_TRACKING_PARAMS)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref_src", "ref_url", "spm", "cmpid",
+    "_ga", "_hsenc", "_hsmi", "yclid", "twclid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_")
+SITE_TRACKING_PARAMS = {
+    "youtube.com": {"si"},
+    "youtu.be": {"si"},
+    "open.spotify.com": {"si"},
+}
+
+# Host prefixes that serve the same content as the bare domain
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+# Prefixes that are aliases of the bare domain on specific sites only
+SITE_HOST_PREFIXES = {
+    "reddit.com": ("old.", "new.", "np."),
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "i", "in", "is", "it", "of", "on", "or", "the", "this", "to", "what",
+    "why", "with", "you", "your",
+}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+# Cap comparisons per LSH bucket so pathological buckets stay linear
+MAX_BUCKET_COMPARISONS = 32
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Canonicalize a link so the same story shared from different places compares equal
+
+    Forces https, lowercases the host and strips www/m/amp-style prefixes
+    (plus site-specific aliases such as old.reddit.com), drops default
+    ports, fragments, tracking parameters and trailing slashes, and sorts
+    the remaining query parameters.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url.strip()
+
+    host = parts.hostname.lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    for site, prefixes in SITE_HOST_PREFIXES.items():
+        if host.endswith("." + site) and host[:-len(site)] in prefixes:
+            host = site
+            break
+    site_params = SITE_TRACKING_PARAMS.get(host, ())
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and key.lower() not in site_params
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def title_tokens(title: str) -> List[str]:
+    """Lowercased word tokens of a title without stopwords"""
+    return [t for t in _WORD_RE.findall(title.lower()) if t not in STOPWORDS]
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(tokens: List[str]) -> int:
+    """64-bit SimHash over word unigrams and bigrams"""
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    # Count set bits per position column-wise; zip() keeps the loop in C
+    bits = [format(_token_hash(feature), "064b") for feature in features]
+    threshold = len(bits) / 2
+
+    value = 0
+    for column in zip(*bits):
+        value = (value << 1) | (column.count("1") > threshold)
+    return value
+
+
+@lru_cache(maxsize=16384)
+def title_simhash(title: str) -> Tuple[int, int]:
+    """Token count and SimHash of a title, memoized across merges"""
+    tokens = title_tokens(title)
+    return len(tokens), simhash(tokens)
+
+
+class DedupEngine:
+    """
+    Collapses duplicate articles across sources.
+
+    Two articles are duplicates if their canonical URLs match, or if the
+    SimHashes of their titles differ in at most `max_distance` bits.
+    Near-duplicate candidates come from LSH banding: the hash is split
+    into BANDS bands, and two hashes within `max_distance` < BANDS bits must
+    agree exactly on at least one band. Each article is only compared with
+    the articles sharing one of its band values, which keeps the pass near
+    linear.
+    """
+
+    def __init__(self, max_distance: int = 3, min_tokens: int = 3):
+        if max_distance >= BANDS:
+            raise ValueError(f"max_distance must be lower than {BANDS} for banded lookup")
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+
+    def _groups(self, articles: List[FeedArticle]) -> List[List[int]]:
+        """Union-find over URL and title matches; groups keep input order"""
+        parent = list(range(len(articles)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                # The earlier article stays the group's root
+                parent[max(ri, rj)] = min(ri, rj)
+
+        by_url: Dict[str, int] = {}
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        hashes: Dict[int, int] = {}
+
+        for i, article in enumerate(articles):
+            url = canonicalize_url(article.url)
+            if url is not None:
+                if url in by_url:
+                    union(i, by_url[url])
+                else:
+                    by_url[url] = i
+
+            token_count, h = title_simhash(article.title)
+            if token_count < self.min_tokens:
+                continue
+            hashes[i] = h
+            for band in range(BANDS):
+                bucket = buckets.setdefault((band, (h >> (band * BAND_BITS)) & BAND_MASK), [])
+                for j in bucket[-MAX_BUCKET_COMPARISONS:]:
+                    if bin(h ^ hashes[j]).count("1") <= self.max_distance:
+                        union(i, j)
+                bucket.append(i)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(articles)):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+    def collapse(self, articles: List[FeedArticle]) -> List[FeedArticle]:
+        """
+        Collapse duplicates into the first article of each group
+
+        The surviving article lists every copy in `sources` and every
+        category those copies came from in `categories`, so it still shows
+        up under each category; articles without duplicates are returned
+        unchanged.
+        """
+        collapsed = []
+        for group in self._groups(articles):
+            primary = articles[group[0]]
+            if len(group) == 1:
+                collapsed.append(primary)
+                continue
+            sources = [
+                ArticleSource(
+                    id=articles[i].id,
+                    source=articles[i].source,
+                    category=articles[i].category,
+                    url=articles[i].url
+                )
+                for i in group
+            ]
+            categories = list(dict.fromkeys(source.category for source in sources))
+            collapsed.append(primary.model_copy(update={"sources": sources, "categories": categories}))
+        return collapsed
+
+
+dedup_engine = DedupEngine(max_distance=settings.DEDUP_MAX_DISTANCE)
@@ -0,0 +1,325 @@
+import asyncio
+import html
+import re
+import time
+import httpx
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Tuple
+from app.core.categories import ALL_CATEGORIES, CATEGORIES, FeedCategory
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.serialization import Rendered, RenderedCache
+from app.schemas.feeds import CategoryFeedResponse, FeedArticle
+from app.schemas.hacker_news import HackerNewsArticle
+from app.schemas.rss_feed import RSSArticle, RSSFeedStatus
+from app.services.article_store import StoredSource, article_store
+from app.services.dedup import dedup_engine
+from app.services.hacker_news import HackerNewsService
+from app.services.hacker_news_mirror import hacker_news_mirror
+from app.services.rss_feed import RSSFeedService
+from app.services.search import search_index
+
+_COMMENT_RE = re.compile(r"<!--[\s\S]*?-->")
+_TAG_RE = re.compile(r"<[^>]+>")
+EXCERPT_LENGTH = 200
+
+
+def strip_html(value: Optional[str]) -> str:
+    """Remove HTML comments and tags and unescape entities"""
+    if not value:
+        return ""
+    text = _TAG_RE.sub("", _COMMENT_RE.sub("", value))
+    return html.unescape(text).replace("\xa0", " ").strip()
+
+
+def parse_published(value: Optional[str]) -> Optional[datetime]:
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into an aware datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class FeedAggregatorService:
+    """Service that merges RSS feeds and Hacker News into category feeds"""
+
+    # Rendered category pages, valid while the article store is unchanged
+    # and for at most RESPONSE_CACHE_TTL seconds (live sources may change)
+    _rendered = RenderedCache(
+        ttl=settings.RESPONSE_CACHE_TTL,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+    )
+
+    @staticmethod
+    def from_rss(article: RSSArticle, category: FeedCategory) -> FeedArticle:
+        """Normalize an RSS article for a category feed"""
+        content = strip_html(article.description)
+        excerpt = content[:EXCERPT_LENGTH] + ("..." if len(content) > EXCERPT_LENGTH else "")
+        published = parse_published(article.published)
+
+        return FeedArticle(
+            id=article.guid or article.link or article.title,
+            title=article.title,
+            category=category.id,
+            source=category.source,
+            url=article.link,
+            published=published.isoformat() if published else article.published,
+            timestamp=int(published.timestamp()) if published else None,
+            excerpt=excerpt,
+            content=content or None,
+            author=article.author,
+        )
+
+    @staticmethod
+    def from_hacker_news(article: HackerNewsArticle, category: FeedCategory) -> FeedArticle:
+        """Normalize a Hacker News story for a category feed"""
+        published = datetime.fromtimestamp(article.time, tz=timezone.utc)
+
+        return FeedArticle(
+            id=f"hn_{article.id}",
+            title=article.title,
+            category=category.id,
+            source=category.source,
+            url=str(article.url) if article.url else None,
+            published=published.isoformat(),
+            timestamp=article.time,
+            excerpt=f"Score: {article.score} | Comments: {article.descendants or 0}",
+            author=article.by,
+            score=article.score,
+            comments=article.descendants,
+        )
+
+    @staticmethod
+    async def _fetch_hacker_news(
+        category: FeedCategory,
+        limit: int,
+        client: Optional[httpx.AsyncClient]
+    ) -> Tuple[List[FeedArticle], RSSFeedStatus]:
+        """Fetch a category's Hacker News list within the per-feed deadline"""
+        url = HackerNewsService.story_list_url(category.hacker_news)
+        started = time.perf_counter()
+        articles, status, error = [], "ok", None
+        try:
+            stories = await asyncio.wait_for(
+                hacker_news_mirror.fetch_articles(limit=limit, story_type=category.hacker_news, client=client),
+                timeout=settings.RSS_FEED_DEADLINE
+            )
+            articles = [FeedAggregatorService.from_hacker_news(story, category) for story in stories]
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"No response within {settings.RSS_FEED_DEADLINE}s"
+        except Exception as e:
+            print(f"Error fetching Hacker News for {category.id}: {str(e)}")
+            status, error = "error", str(e)
+
+        return articles, RSSFeedStatus(
+            url=url,
+            status=status,
+            articles=len(articles),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+            error=error
+        )
+
+    @staticmethod
+    def _from_store(
+        source: str,
+        limit: int,
+        articles: List[FeedArticle],
+        statuses: List[RSSFeedStatus]
+    ) -> Optional[StoredSource]:
+        """
+        Serve a source from the ingestion store if it was refreshed recently
+
+        Appends the stored articles and an "ok" status to the given lists.
+
+        Ingestion keeps at most INGEST_LIMIT_PER_FEED articles per source, so
+        a larger limit goes live unless the store already holds the whole feed.
+
+        Returns:
+            The stored source, or None if it must be fetched live
+        """
+        stored = article_store.get(source, max_age=settings.INGEST_STALE_AFTER)
+        if stored is None:
+            return None
+        if limit > len(stored.articles) >= settings.INGEST_LIMIT_PER_FEED:
+            return None
+        articles.extend(stored.articles[:limit])
+        statuses.append(RSSFeedStatus(
+            url=source,
+            status="ok",
+            articles=min(len(stored.articles), limit),
+            elapsed_ms=0.0
+        ))
+        return stored
+
+    @staticmethod
+    async def fetch_category(
+        category: FeedCategory,
+        limit_per_feed: int = 20,
+        hn_client: Optional[httpx.AsyncClient] = None,
+        rss_client: Optional[httpx.AsyncClient] = None
+    ) -> Tuple[List[FeedArticle], List[RSSFeedStatus]]:
+        """
+        Fetch every upstream source of a category concurrently
+
+        Sources refreshed recently by the ingestion scheduler are served from
+        the article store; only the rest go upstream.
+
+        Returns:
+            Tuple of normalized (unmerged) articles and per-source status
+        """
+        async def fetch_rss() -> Tuple[List[FeedArticle], List[RSSFeedStatus]]:
+            articles, statuses, live = [], [], []
+            for url in category.feeds:
+                if FeedAggregatorService._from_store(url, limit_per_feed, articles, statuses) is None:
+                    live.append(url)
+            if live:
+                result = await RSSFeedService.fetch_multiple_feeds(live, limit_per_feed, client=rss_client)
+                live_articles = [FeedAggregatorService.from_rss(a, category) for a in result.articles]
+                search_index.add_in_background(live_articles)
+                articles.extend(live_articles)
+                statuses.extend(result.feeds)
+            return articles, statuses
+
+        async def fetch_hacker_news() -> Tuple[List[FeedArticle], List[RSSFeedStatus]]:
+            if not category.hacker_news:
+                return [], []
+            articles, statuses = [], []
+            url = HackerNewsService.story_list_url(category.hacker_news)
+            if FeedAggregatorService._from_store(url, limit_per_feed, articles, statuses) is None:
+                live_articles, status = await FeedAggregatorService._fetch_hacker_news(category, limit_per_feed, hn_client)
+                search_index.add_in_background(live_articles)
+                articles.extend(live_articles)
+                statuses.append(status)
+            return articles, statuses
+
+        results = await asyncio.gather(fetch_rss(), fetch_hacker_news())
+        return (
+            [a for articles, _ in results for a in articles],
+            [s for _, statuses in results for s in statuses],
+        )
+
+    @staticmethod
+    def merge(articles: List[FeedArticle]) -> List[FeedArticle]:
+        """
+        Collapse duplicate stories and sort newest first (undated articles last)
+
+        Duplicates share a canonical URL or have near-identical titles; the
+        surviving article lists every copy in `sources`.
+        """
+        merged = dedup_engine.collapse(articles)
+        merged.sort(key=lambda a: a.timestamp or 0, reverse=True)
+        return merged
+
+    @staticmethod
+    async def get_feed(
+        category_id: str,
+        page: int = 1,
+        page_size: int = 50,
+        limit_per_feed: int = 20,
+        hn_client: Optional[httpx.AsyncClient] = None,
+        rss_client: Optional[httpx.AsyncClient] = None
+    ) -> CategoryFeedResponse:
+        """
+        Build one merged, deduplicated, date-sorted page for a category
+
+        Args:
+            category_id: Registered category id, or "all" for every category
+            page: 1-based page number
+            page_size: Articles per page
+            limit_per_feed: Maximum articles taken from each upstream source
+
+        Raises:
+            KeyError if the category is not registered
+        """
+        if category_id == ALL_CATEGORIES:
+            categories = list(CATEGORIES.values())
+        else:
+            categories = [CATEGORIES[category_id]]
+
+        results = await asyncio.gather(*(
+            FeedAggregatorService.fetch_category(c, limit_per_feed, hn_client, rss_client)
+            for c in categories
+        ))
+
+        articles = FeedAggregatorService.merge([a for result, _ in results for a in result])
+        sources = [s for _, statuses in results for s in statuses]
+        start = (page - 1) * page_size
+
+        return CategoryFeedResponse(
+            category=category_id,
+            total=len(articles),
+            page=page,
+            page_size=page_size,
+            articles=articles[start:start + page_size],
+            sources=sources
+        )
+
+    @staticmethod
+    async def render_feed(
+        category_id: str,
+        page: int = 1,
+        page_size: int = 50,
+        limit_per_feed: int = 20,
+        hn_client: Optional[httpx.AsyncClient] = None,
+        rss_client: Optional[httpx.AsyncClient] = None
+    ) -> Rendered:
+        """
+        get_feed serialized to JSON bytes, with an ETag
+
+        Repeat requests for the same page skip fetching, merging and encoding
+        until the article store changes or RESPONSE_CACHE_TTL passes.
+
+        Raises:
+            KeyError if the category is not registered
+        """
+        key = (category_id, page, page_size, limit_per_feed)
+        version = article_store.version
+        rendered = FeedAggregatorService._rendered.get(key, version)
+        if rendered is not None:
+            return rendered
+        feed = await FeedAggregatorService.get_feed(category_id, page, page_size, limit_per_feed, hn_client, rss_client)
+        return FeedAggregatorService._rendered.put(key, version, feed)
+
+    @staticmethod
+    def max_age(category_id: str) -> float:
+        """
+        Seconds until the first of a category's sources is due for a refresh
+
+        Follows the same choice as fetch_category: sources served from the
+        ingestion store refresh every INGEST_INTERVAL, live RSS feeds when
+        their cache entry expires, and Hacker News on the mirror's schedule.
+
+        Raises:
+            KeyError if the category is not registered
+        """
+        if category_id == ALL_CATEGORIES:
+            categories = list(CATEGORIES.values())
+        else:
+            categories = [CATEGORIES[category_id]]
+
+        remaining = []
+        for category in categories:
+            sources = list(category.feeds)
+            if category.hacker_news:
+                sources.append(HackerNewsService.story_list_url(category.hacker_news))
+            for source in sources:
+                stored = article_store.get(source, max_age=settings.INGEST_STALE_AFTER)
+                if stored is not None:
+                    remaining.append(max(settings.INGEST_INTERVAL - stored.age, 0.0))
+                elif source in category.feeds:
+                    remaining.append(RSSFeedService.max_age(source))
+                else:
+                    remaining.append(hacker_news_mirror.max_age())
+        return min(remaining, default=0.0)
+
+
+registry.register_cache("category_pages", FeedAggregatorService._rendered)
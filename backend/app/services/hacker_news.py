@@ -1,56 +1,194 @@
 import httpx
 import asyncio
-from typing import List, Optional
+import math
+import time
+from typing import AsyncIterator, Dict, List, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_client import http_clients, HACKER_NEWS
+from app.core.metrics import VALIDATION_DURATION, registry
+from app.core.single_flight import SingleFlight
 from app.schemas.hacker_news import HackerNewsArticle
 
+_observe_item_validation = VALIDATION_DURATION.labels("HackerNewsArticle").observe
+
 
 class HackerNewsService:
     """Service for fetching articles from Hacker News API"""
 
     BASE_URL = "https://hacker-news.firebaseio.com/v0"
-    TIMEOUT = 10.0
+    TIMEOUT = settings.HN_TIMEOUT
+
+    # Items keyed by HN id. The entry TTL covers the immutable fields (title,
+    # url, by, time); score/descendants are refetched after HN_SCORE_TTL.
+    # Non-story and deleted items are cached as None.
+    _item_cache = TTLCache(
+        ttl=settings.HN_ITEM_TTL,
+        max_entries=settings.HN_ITEM_CACHE_MAX_ENTRIES,
+    )
+    _score_refreshes = 0
+    _stale_on_error = 0
+    # Last story lists fetched, served when Hacker News cannot be reached
+    _last_story_ids: Dict[str, List[int]] = {}
+    # Concurrent requests for the same story list or item share one upstream fetch
+    _story_list_flights = SingleFlight("hn_story_ids")
+    _item_flights = SingleFlight("hn_item")
+
+    @staticmethod
+    def _client(client: Optional[httpx.AsyncClient]) -> httpx.AsyncClient:
+        """Use the injected client, falling back to the shared Hacker News pool"""
+        return client if client is not None else http_clients.get(HACKER_NEWS)
+
+    @staticmethod
+    def story_list_url(story_type: str) -> str:
+        """Upstream URL of a story list such as topstories"""
+        return f"{HackerNewsService.BASE_URL}/{story_type}.json"
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Hit/miss/eviction counters for the item cache, plus score refetches"""
+        return {
+            **HackerNewsService._item_cache.stats(),
+            "score_refreshes": HackerNewsService._score_refreshes,
+            "coalesced_item_fetches": HackerNewsService._item_flights.coalesced,
+            "coalesced_story_list_fetches": HackerNewsService._story_list_flights.coalesced,
+            "stale_on_error": HackerNewsService._stale_on_error,
+        }
+
+    @staticmethod
+    async def _get_item(article_id: int, client: httpx.AsyncClient) -> Optional[HackerNewsArticle]:
+        """
+        Return a story from the item cache, going upstream only if it is
+        missing or its score/descendants are older than HN_SCORE_TTL
+
+        If the refetch fails, the last cached copy (even an expired one) is
+        returned instead.
+
+        Raises:
+            Exception if the item was never cached and cannot be fetched
+        """
+        cache = HackerNewsService._item_cache
+        previous = cache.peek(article_id)
+        entry = cache.get_entry(article_id)
+        if entry is not None:
+            if time.monotonic() - entry.stored_at < settings.HN_SCORE_TTL:
+                return entry.value
+            HackerNewsService._score_refreshes += 1
+
+        try:
+            return await HackerNewsService.refresh_item(article_id, client)
+        except Exception:
+            if previous is None:
+                raise
+            HackerNewsService._stale_on_error += 1
+            cache.set(article_id, previous.value, ttl=0)
+            return previous.value
 
     @staticmethod
-    async def fetch_story_ids(story_type: str = "topstories") -> List[int]:
+    async def refresh_item(
+        article_id: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[HackerNewsArticle]:
+        """
+        Fetch an item upstream and store it in the item cache
+
+        Only stories are kept; any other item type is cached as None.
+        Concurrent calls for the same item share one upstream request.
+
+        Raises:
+            Exception if the item cannot be fetched
+        """
+        return await HackerNewsService._item_flights.run(
+            article_id, HackerNewsService._fetch_item, article_id, client
+        )
+
+    @staticmethod
+    async def _fetch_item(
+        article_id: int,
+        client: Optional[httpx.AsyncClient]
+    ) -> Optional[HackerNewsArticle]:
+        """Fetch, validate and cache one item (no coalescing)"""
+        url = f"{HackerNewsService.BASE_URL}/item/{article_id}.json"
+        response = await HackerNewsService._client(client).get(url)
+        response.raise_for_status()
+        data = response.json()
+
+        started = time.perf_counter()
+        article = HackerNewsArticle(**data) if data and data.get("type") == "story" else None
+        _observe_item_validation(time.perf_counter() - started)
+        HackerNewsService._item_cache.set(article_id, article)
+        return article
+
+    @staticmethod
+    async def fetch_updates(client: Optional[httpx.AsyncClient] = None) -> List[int]:
+        """
+        Fetch the IDs of recently changed items from /v0/updates.json
+
+        Returns:
+            List of item IDs
+        """
+        response = await HackerNewsService._client(client).get(f"{HackerNewsService.BASE_URL}/updates.json")
+        response.raise_for_status()
+        return (response.json() or {}).get("items", [])
+
+    @staticmethod
+    async def fetch_story_ids(
+        story_type: str = "topstories",
+        client: Optional[httpx.AsyncClient] = None
+    ) -> List[int]:
         """
         Fetch story IDs from Hacker News API
 
+        Concurrent calls for the same list share one upstream request (and
+        the returned list, which callers must not modify). If Hacker News
+        cannot be reached, the last list fetched is returned instead.
+
         Args:
             story_type: Type of stories (topstories, newstories, beststories, askstories, showstories, jobstories)
+            client: Optional HTTP client (defaults to the shared pool)
 
         Returns:
             List of story IDs
         """
-        url = f"{HackerNewsService.BASE_URL}/{story_type}.json"
+        try:
+            story_ids = await HackerNewsService._story_list_flights.run(
+                story_type, HackerNewsService._fetch_story_ids, story_type, client
+            )
+        except Exception:
+            last = HackerNewsService._last_story_ids.get(story_type)
+            if last is None:
+                raise
+            HackerNewsService._stale_on_error += 1
+            return last
+        HackerNewsService._last_story_ids[story_type] = story_ids
+        return story_ids
+
+    @staticmethod
+    async def _fetch_story_ids(story_type: str, client: Optional[httpx.AsyncClient]) -> List[int]:
+        """Fetch one story list upstream (no coalescing)"""
+        url = HackerNewsService.story_list_url(story_type)
 
-        async with httpx.AsyncClient(timeout=HackerNewsService.TIMEOUT) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        response = await HackerNewsService._client(client).get(url)
+        response.raise_for_status()
+        return response.json()
 
     @staticmethod
-    async def fetch_article(article_id: int) -> Optional[HackerNewsArticle]:
+    async def fetch_article(
+        article_id: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[HackerNewsArticle]:
         """
         Fetch a single article by ID
 
         Args:
             article_id: Hacker News item ID
+            client: Optional HTTP client (defaults to the shared pool)
 
         Returns:
             HackerNewsArticle or None if fetch fails
         """
-        url = f"{HackerNewsService.BASE_URL}/item/{article_id}.json"
-
         try:
-            async with httpx.AsyncClient(timeout=HackerNewsService.TIMEOUT) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-
-                # Only return if it's a story type
-                if data and data.get("type") == "story":
-                    return HackerNewsArticle(**data)
-                return None
+            return await HackerNewsService._get_item(article_id, HackerNewsService._client(client))
         except Exception as e:
             print(f"Error fetching article {article_id}: {e}")
             return None
@@ -59,7 +197,8 @@ class HackerNewsService:
     async def fetch_articles(
         limit: int = 10,
         story_type: str = "topstories",
-        min_score: Optional[int] = None
+        min_score: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None
     ) -> List[HackerNewsArticle]:
         """
         Fetch multiple articles from Hacker News
@@ -68,45 +207,106 @@ class HackerNewsService:
             limit: Number of articles to fetch
             story_type: Type of stories to fetch
             min_score: Minimum score filter (optional)
+            client: Optional HTTP client (defaults to the shared pool)
 
         Returns:
-            List of HackerNewsArticle objects
+            List of HackerNewsArticle objects in HN ranking order
+        """
+        return [
+            article
+            async for article in HackerNewsService.iter_articles(limit, story_type, min_score, client)
+        ]
+
+    @staticmethod
+    async def iter_articles(
+        limit: int = 10,
+        story_type: str = "topstories",
+        min_score: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        errors: Optional[List[str]] = None
+    ) -> AsyncIterator[HackerNewsArticle]:
         """
+        Yield qualifying stories in HN ranking order as soon as they are known
+
+        Items are requested in waves sized from the share of stories that
+        qualified so far. Fetching stops as soon as the top `limit`
+        qualifying stories are known, cancelling any requests still in
+        flight (also when the consumer stops iterating early), and keeps
+        pulling further IDs until the quota is met or the list runs out.
+
+        Args:
+            limit: Number of articles to yield
+            story_type: Type of stories to fetch
+            min_score: Minimum score filter (optional)
+            client: Optional HTTP client (defaults to the shared pool)
+            errors: Optional list that receives a message for every item that failed to load
+
+        Raises:
+            Exception if the story list cannot be fetched
+        """
+        client = HackerNewsService._client(client)
+
         # Fetch story IDs
-        story_ids = await HackerNewsService.fetch_story_ids(story_type)
-
-        # Limit the number of IDs to fetch
-        story_ids = story_ids[:limit * 2]  # Fetch extra in case some fail or don't meet criteria
-
-        # Fetch articles concurrently
-        articles = []
-        async with httpx.AsyncClient(timeout=HackerNewsService.TIMEOUT) as client:
-            async def fetch_single_article(story_id: int):
-                """Helper function to fetch a single article"""
-                try:
-                    url = f"{HackerNewsService.BASE_URL}/item/{story_id}.json"
-                    response = await client.get(url)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data and data.get("type") == "story":
-                            return HackerNewsArticle(**data)
-                except Exception:
-                    pass
+        story_ids = await HackerNewsService.fetch_story_ids(story_type, client=client)
+
+        async def fetch_single_article(story_id: int) -> Optional[HackerNewsArticle]:
+            """Helper function to fetch a single article (cache first)"""
+            try:
+                return await HackerNewsService._get_item(story_id, client)
+            except Exception as e:
+                if errors is not None:
+                    errors.append(f"Item {story_id}: {str(e)}")
                 return None
 
-            # Create tasks for concurrent fetching
-            tasks = [fetch_single_article(story_id) for story_id in story_ids]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        def qualifies(article: Optional[HackerNewsArticle]) -> bool:
+            return article is not None and (min_score is None or article.score >= min_score)
+
+        yielded = 0
+        resolved: Dict[int, Optional[HackerNewsArticle]] = {}  # rank -> result
+        pending: Dict[asyncio.Task, int] = {}  # task -> rank
+        next_rank = 0  # next ID to request
+        cursor = 0  # first rank not yet consumed in order
+        qualified = 0  # qualifying results seen, in any order
+
+        try:
+            while yielded < limit:
+                # Expected yield per request, with a floor so one bad wave
+                # cannot stall progress
+                ratio = max((qualified + 1) / (len(resolved) + cursor + 1), 0.05)
+                still_needed = limit - yielded - sum(
+                    1 for r in resolved.values() if qualifies(r)
+                )
+                expected = len(pending) * ratio
+                if still_needed > expected and next_rank < len(story_ids):
+                    wave = math.ceil((still_needed - expected) / ratio)
+                    wave = min(wave, settings.HN_MAX_WAVE, len(story_ids) - next_rank)
+                    for story_id in story_ids[next_rank:next_rank + wave]:
+                        pending[asyncio.create_task(fetch_single_article(story_id))] = next_rank
+                        next_rank += 1
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    resolved[pending.pop(task)] = result
+                    if qualifies(result):
+                        qualified += 1
 
-            # Filter and collect successful results
-            for result in results:
-                if isinstance(result, HackerNewsArticle):
-                    # Apply min_score filter if provided
-                    if min_score is None or result.score >= min_score:
-                        articles.append(result)
+                # Consume results in ranking order as far as they are known
+                while cursor in resolved and yielded < limit:
+                    result = resolved.pop(cursor)
+                    cursor += 1
+                    if qualifies(result):
+                        yielded += 1
+                        yield result
+        finally:
+            # Stragglers are no longer needed
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
-                        # Stop if we have enough articles
-                        if len(articles) >= limit:
-                            break
 
-        return articles[:limit]
+registry.register_cache("hn_items", HackerNewsService._item_cache)
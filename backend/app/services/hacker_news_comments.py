@@ -0,0 +1,344 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
+import httpx
+from pydantic import ValidationError
+from app.core.cache import CacheEntry, TTLCache
+from app.core.config import settings
+from app.core.metrics import VALIDATION_DURATION, registry
+from app.core.serialization import Rendered, RenderedCache, render
+from app.core.single_flight import SingleFlight
+from app.schemas.hacker_news import HackerNewsArticle, HackerNewsComment, HackerNewsCommentTree
+from app.services.hacker_news import HackerNewsService
+
+_observe_comment_validation = VALIDATION_DURATION.labels("HackerNewsComment").observe
+
+
+@dataclass
+class CommentCrawl:
+    """Progress of one comment tree fetch, filled in by iter_comments"""
+    root_id: int
+    root: Optional[Dict[str, Any]] = None
+    comments: Dict[int, HackerNewsComment] = field(default_factory=dict)  # in fetch order
+    kids: Dict[int, List[int]] = field(default_factory=dict)  # reply IDs in HN order, per fetched item
+    truncated: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def truncate(self, reason: str) -> None:
+        if reason not in self.truncated:
+            self.truncated.append(reason)
+
+
+class HackerNewsCommentService:
+    """Service for building Hacker News comment trees from individual items"""
+
+    # Raw items (stories and comments) keyed by HN id. Reply lists grow while
+    # a thread is active, so entries are refetched after HN_COMMENT_TTL.
+    # Missing items are cached as None.
+    _node_cache = TTLCache(
+        ttl=settings.HN_COMMENT_TTL,
+        max_entries=settings.HN_COMMENT_CACHE_MAX_ENTRIES,
+    )
+    _stale_on_error = 0
+    # Trees fetched at the same time share requests for common nodes
+    _node_flights = SingleFlight("hn_comment")
+    # Rendered complete trees per (id, max_depth, max_nodes), reused until
+    # their comments are due for a refetch
+    _rendered = RenderedCache(
+        ttl=settings.HN_COMMENT_TTL,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+    )
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Hit/miss/eviction counters for the comment node cache"""
+        return {
+            **HackerNewsCommentService._node_cache.stats(),
+            "coalesced_fetches": HackerNewsCommentService._node_flights.coalesced,
+            "stale_on_error": HackerNewsCommentService._stale_on_error,
+        }
+
+    @staticmethod
+    async def get_item(item_id: int, client: Optional[httpx.AsyncClient] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the raw item (any type) from the node cache, fetching it if needed
+
+        Returns:
+            The item as sent by Hacker News, or None if it does not exist
+
+        Raises:
+            Exception if the item was never cached and cannot be fetched
+        """
+        cache = HackerNewsCommentService._node_cache
+        previous = cache.peek(item_id)
+        entry = cache.get_entry(item_id)
+        if entry is not None:
+            return entry.value
+        return await HackerNewsCommentService._load_item(item_id, HackerNewsService._client(client), previous)
+
+    @staticmethod
+    async def _load_item(
+        item_id: int,
+        client: httpx.AsyncClient,
+        previous: Optional[CacheEntry]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch an item past the cache, falling back to `previous` on failure
+
+        The caller peeks `previous` before its cache lookup, since a lookup
+        drops an expired entry.
+        """
+        cache = HackerNewsCommentService._node_cache
+        try:
+            return await HackerNewsCommentService._node_flights.run(
+                item_id, HackerNewsCommentService._fetch_item, item_id, client
+            )
+        except Exception:
+            if previous is None:
+                raise
+            HackerNewsCommentService._stale_on_error += 1
+            cache.set(item_id, previous.value, ttl=0)
+            return previous.value
+
+    @staticmethod
+    async def _fetch_item(item_id: int, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+        """Fetch and cache one item (no coalescing)"""
+        response = await client.get(f"{HackerNewsService.BASE_URL}/item/{item_id}.json")
+        response.raise_for_status()
+        item = response.json() or None
+        HackerNewsCommentService._node_cache.set(item_id, item)
+        return item
+
+    @staticmethod
+    def _to_comment(item: Dict[str, Any], parent: int, depth: int) -> HackerNewsComment:
+        started = time.perf_counter()
+        comment = HackerNewsComment(
+            id=item["id"],
+            parent=item.get("parent", parent),
+            depth=depth,
+            by=item.get("by"),
+            text=item.get("text"),
+            time=item.get("time"),
+            deleted=bool(item.get("deleted")),
+            dead=bool(item.get("dead")),
+            replies=len(item.get("kids") or ()),
+        )
+        _observe_comment_validation(time.perf_counter() - started)
+        return comment
+
+    @staticmethod
+    async def iter_comments(
+        article_id: int,
+        max_depth: int = settings.HN_COMMENT_MAX_DEPTH,
+        max_nodes: int = settings.HN_COMMENT_MAX_NODES,
+        time_budget: float = settings.HN_COMMENT_TIME_BUDGET,
+        client: Optional[httpx.AsyncClient] = None,
+        crawl: Optional[CommentCrawl] = None
+    ) -> AsyncIterator[HackerNewsComment]:
+        """
+        Yield the comments under an item as soon as each one is fetched
+
+        Replies are fetched breadth first, up to HN_COMMENT_CONCURRENCY at
+        a time, so a thread costs about one round trip per level instead of
+        one per comment. Cached nodes are used without a request. Whatever
+        is left when a limit is reached is skipped and the limit is
+        recorded in `crawl.truncated`.
+
+        Args:
+            article_id: Story (or comment) whose replies to fetch
+            max_depth: Deepest reply level to fetch (1 = top-level comments only)
+            max_nodes: Maximum number of comments to fetch
+            time_budget: Seconds after which fetching stops
+            client: Optional HTTP client (defaults to the shared pool)
+            crawl: Optional CommentCrawl that receives the root, the comments
+                with their reply order, truncation reasons and errors
+
+        Raises:
+            Exception if the root item cannot be fetched
+        """
+        client = HackerNewsService._client(client)
+        crawl = crawl if crawl is not None else CommentCrawl(article_id)
+        cache = HackerNewsCommentService._node_cache
+        deadline = time.monotonic() + time_budget
+
+        crawl.root = await HackerNewsCommentService.get_item(article_id, client)
+        if crawl.root is None:
+            return
+
+        frontier: Deque[Tuple[int, int, int]] = deque()  # (id, parent, depth)
+        admitted = 0
+
+        def visit(item: Dict[str, Any], depth: int) -> None:
+            """Queue the replies of a fetched item, within the depth and node limits"""
+            nonlocal admitted
+            kids = item.get("kids") or []
+            if not kids:
+                return
+            if depth > max_depth:
+                crawl.truncate("max_depth")
+                return
+            if len(kids) > max_nodes - admitted:
+                crawl.truncate("max_nodes")
+                kids = kids[:max_nodes - admitted]
+            crawl.kids[item["id"]] = kids
+            admitted += len(kids)
+            frontier.extend((kid, item["id"], depth) for kid in kids)
+
+        def resolve(node: Tuple[int, int, int], item: Optional[Dict[str, Any]]) -> Optional[HackerNewsComment]:
+            item_id, parent, depth = node
+            if item is None:
+                return None
+            comment = HackerNewsCommentService._to_comment(item, parent, depth)
+            crawl.comments[item_id] = comment
+            visit(item, depth + 1)
+            return comment
+
+        visit(crawl.root, 1)
+        pending: Dict[asyncio.Task, Tuple[int, int, int]] = {}
+        try:
+            while frontier or pending:
+                ready: List[HackerNewsComment] = []
+                while frontier and len(pending) < settings.HN_COMMENT_CONCURRENCY:
+                    node = frontier.popleft()
+                    previous = cache.peek(node[0])
+                    entry = cache.get_entry(node[0])
+                    if entry is None:
+                        task = asyncio.create_task(HackerNewsCommentService._load_item(node[0], client, previous))
+                        pending[task] = node
+                        continue
+                    comment = resolve(node, entry.value)
+                    if comment is not None:
+                        ready.append(comment)
+                for comment in ready:
+                    yield comment
+                if not pending:
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    crawl.truncate("time_budget")
+                    break
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = pending.pop(task)
+                    try:
+                        comment = resolve(node, task.result())
+                    except Exception as e:
+                        crawl.errors.append(f"Comment {node[0]}: {str(e)}")
+                        continue
+                    if comment is not None:
+                        yield comment
+        finally:
+            # Stragglers are no longer needed
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    def summary_fields(crawl: CommentCrawl) -> Dict[str, Any]:
+        """HackerNewsCommentSummary fields for a finished crawl"""
+        return {
+            "root_id": crawl.root_id,
+            "total": len(crawl.comments),
+            "descendants": (crawl.root or {}).get("descendants"),
+            "complete": not crawl.truncated and not crawl.errors,
+            "truncated": crawl.truncated,
+            "elapsed_ms": round((time.perf_counter() - crawl.started) * 1000, 2),
+            "errors": crawl.errors,
+        }
+
+    @staticmethod
+    def story(root: Optional[Dict[str, Any]]) -> Optional[HackerNewsArticle]:
+        """A root item as a HackerNewsArticle, if it is a (live) story"""
+        if not root or root.get("type") != "story":
+            return None
+        try:
+            return HackerNewsArticle(**root)
+        except ValidationError:
+            return None
+
+    @staticmethod
+    def build_tree(crawl: CommentCrawl) -> HackerNewsCommentTree:
+        """Nest the fetched comments under their parents, in Hacker News order"""
+        def attach(ids: Iterable[int]) -> List[HackerNewsComment]:
+            children = []
+            for item_id in ids:
+                comment = crawl.comments.get(item_id)
+                if comment is not None:
+                    comment.children = attach(crawl.kids.get(item_id, ()))
+                    children.append(comment)
+            return children
+
+        return HackerNewsCommentTree(
+            **HackerNewsCommentService.summary_fields(crawl),
+            story=HackerNewsCommentService.story(crawl.root),
+            comments=attach(crawl.kids.get(crawl.root_id, ())),
+        )
+
+    @staticmethod
+    async def fetch_comment_tree(
+        article_id: int,
+        max_depth: int = settings.HN_COMMENT_MAX_DEPTH,
+        max_nodes: int = settings.HN_COMMENT_MAX_NODES,
+        time_budget: float = settings.HN_COMMENT_TIME_BUDGET,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[HackerNewsCommentTree]:
+        """
+        Fetch the comment tree of a story (see iter_comments for the limits)
+
+        Returns:
+            The tree, partial if a limit was reached, or None if the item does not exist
+
+        Raises:
+            Exception if the root item cannot be fetched
+        """
+        crawl = CommentCrawl(article_id)
+        async for _ in HackerNewsCommentService.iter_comments(
+            article_id, max_depth, max_nodes, time_budget, client, crawl
+        ):
+            pass
+        if crawl.root is None:
+            return None
+        return HackerNewsCommentService.build_tree(crawl)
+
+    @staticmethod
+    async def fetch_rendered_tree(
+        article_id: int,
+        max_depth: int = settings.HN_COMMENT_MAX_DEPTH,
+        max_nodes: int = settings.HN_COMMENT_MAX_NODES,
+        time_budget: float = settings.HN_COMMENT_TIME_BUDGET,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[Tuple[Rendered, bool]]:
+        """
+        fetch_comment_tree serialized to JSON bytes, with an ETag
+
+        Complete trees are kept for HN_COMMENT_TTL seconds, so repeat
+        requests skip the crawl and keep the same ETag. Partial trees are
+        rendered but not kept: the next request can fill them in.
+
+        Returns:
+            The rendered tree and whether it is complete, or None if the item does not exist
+
+        Raises:
+            Exception if the root item cannot be fetched
+        """
+        key = (article_id, max_depth, max_nodes)
+        rendered = HackerNewsCommentService._rendered.get(key, 0)
+        if rendered is not None:
+            return rendered, True
+        tree = await HackerNewsCommentService.fetch_comment_tree(
+            article_id, max_depth, max_nodes, time_budget, client
+        )
+        if tree is None:
+            return None
+        if not tree.complete:
+            return render(tree), False
+        return HackerNewsCommentService._rendered.put(key, 0, tree), True
+
+
+registry.register_cache("hn_comments", HackerNewsCommentService._node_cache)
+registry.register_cache("hn_comment_trees", HackerNewsCommentService._rendered)
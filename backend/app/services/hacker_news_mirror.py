@@ -0,0 +1,272 @@
+import asyncio
+import time
+import httpx
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.serialization import Rendered, RenderedCache
+from app.core.traffic_governor import background_priority
+from app.schemas.hacker_news import HackerNewsArticle, HackerNewsMirrorStatus, HackerNewsResponse
+from app.services.hacker_news import HackerNewsService
+
+STORY_LISTS = ("topstories", "newstories", "beststories", "askstories", "showstories", "jobstories")
+
+
+class HackerNewsMirror:
+    """
+    In-memory mirror of the Hacker News story lists and the items they reference.
+
+    After an initial sync of the six story lists and their items, the mirror
+    polls /v0/updates.json every HN_MIRROR_POLL_INTERVAL seconds and refetches
+    only the mirrored items listed there. Story lists are re-synced every
+    HN_MIRROR_LIST_INTERVAL seconds; new IDs are fetched and items no longer
+    referenced by any list are dropped.
+
+    Reads fall back to HackerNewsService while the mirror is not ready, for
+    story types it does not mirror, and for items outside the lists.
+
+    `version` is bumped whenever a list or an item changes; rendered
+    responses are reused until it moves.
+    """
+
+    def __init__(self):
+        self.lists: Dict[str, List[int]] = {}
+        self.items: Dict[int, Optional[HackerNewsArticle]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._synced = False
+        self._last_success = 0.0
+        self._last_list_sync = 0.0
+        self.polls = 0
+        self.items_refetched = 0
+        self.upstream_requests = 0
+        self.last_sync: Optional[datetime] = None
+        self.last_poll: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.version = 0
+        self._rendered = RenderedCache(
+            ttl=settings.HN_MIRROR_STALE_AFTER,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def ready(self) -> bool:
+        """True once synced, until updates have failed for HN_MIRROR_STALE_AFTER seconds"""
+        return self._synced and time.monotonic() - self._last_success < settings.HN_MIRROR_STALE_AFTER
+
+    async def _refetch(self, item_ids: Iterable[int], client: Optional[httpx.AsyncClient]) -> None:
+        """Refetch items with bounded concurrency; failed items keep their last copy"""
+        semaphore = asyncio.Semaphore(settings.HN_MIRROR_CONCURRENCY)
+
+        async def refetch(item_id: int) -> bool:
+            async with semaphore:
+                self.upstream_requests += 1
+                try:
+                    article = await HackerNewsService.refresh_item(item_id, client)
+                except Exception:
+                    return False
+                if item_id not in self.items or self.items[item_id] != article:
+                    self.items[item_id] = article
+                    self.version += 1
+                return True
+
+        results = await asyncio.gather(*(refetch(item_id) for item_id in item_ids))
+        self.items_refetched += sum(results)
+
+    async def sync_lists(self, client: Optional[httpx.AsyncClient] = None) -> None:
+        """
+        Refresh all story lists, fetch newly listed items and drop unlisted ones
+
+        A list that fails to load keeps its previous IDs.
+
+        Raises:
+            Exception if every list failed to load
+        """
+        results = await asyncio.gather(
+            *(HackerNewsService.fetch_story_ids(story_type, client=client) for story_type in STORY_LISTS),
+            return_exceptions=True
+        )
+        self.upstream_requests += len(STORY_LISTS)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == len(STORY_LISTS):
+            raise errors[0]
+        for story_type, result in zip(STORY_LISTS, results):
+            if not isinstance(result, Exception) and self.lists.get(story_type) != result:
+                self.lists[story_type] = result
+                self.version += 1
+
+        listed = {item_id for ids in self.lists.values() for item_id in ids}
+        await self._refetch([item_id for item_id in listed if item_id not in self.items], client)
+        for item_id in [item_id for item_id in self.items if item_id not in listed]:
+            del self.items[item_id]
+
+        self._last_list_sync = self._last_success = time.monotonic()
+        self.last_sync = datetime.now(timezone.utc)
+        self.last_error = str(errors[0]) if errors else None
+
+    async def poll(self, client: Optional[httpx.AsyncClient] = None) -> None:
+        """Refetch mirrored items listed in /v0/updates.json, re-syncing lists when due"""
+        changed = await HackerNewsService.fetch_updates(client)
+        self.upstream_requests += 1
+        await self._refetch([item_id for item_id in set(changed) if item_id in self.items], client)
+
+        self._last_success = time.monotonic()
+        self.polls += 1
+        self.last_poll = datetime.now(timezone.utc)
+        self.last_error = None
+
+        if time.monotonic() - self._last_list_sync >= settings.HN_MIRROR_LIST_INTERVAL:
+            await self.sync_lists(client)
+
+    async def _run(self) -> None:
+        with background_priority():
+            while True:
+                try:
+                    if self._synced:
+                        await self.poll()
+                    else:
+                        await self.sync_lists()
+                        self._synced = True
+                    delay = settings.HN_MIRROR_POLL_INTERVAL
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"Error updating Hacker News mirror: {str(e)}")
+                    delay = settings.HN_MIRROR_RETRY_DELAY
+                await asyncio.sleep(delay)
+
+    async def start(self) -> None:
+        """Start the sync/poll loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the poll loop and wait for it to finish"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def articles(
+        self,
+        limit: int = 10,
+        story_type: str = "topstories",
+        min_score: Optional[int] = None
+    ) -> Optional[List[HackerNewsArticle]]:
+        """
+        Read stories from the mirror in HN ranking order
+
+        Returns:
+            List of articles, or None if the mirror cannot serve this story type
+        """
+        if not self.ready or story_type not in self.lists:
+            return None
+        articles = []
+        for item_id in self.lists[story_type]:
+            article = self.items.get(item_id)
+            if article is not None and (min_score is None or article.score >= min_score):
+                articles.append(article)
+                if len(articles) == limit:
+                    break
+        return articles
+
+    def render_articles(
+        self,
+        limit: int = 10,
+        story_type: str = "topstories",
+        min_score: Optional[int] = None
+    ) -> Optional[Rendered]:
+        """
+        articles() as a serialized HackerNewsResponse, reused until the mirror changes
+
+        Returns:
+            The rendered body, or None if the mirror cannot serve this story type
+        """
+        if not self.ready or story_type not in self.lists:
+            return None
+        key = (limit, story_type, min_score)
+        rendered = self._rendered.get(key, self.version)
+        if rendered is not None:
+            return rendered
+        articles = self.articles(limit, story_type, min_score)
+        return self._rendered.put(key, self.version, HackerNewsResponse(total=len(articles), articles=articles))
+
+    async def fetch_articles(
+        self,
+        limit: int = 10,
+        story_type: str = "topstories",
+        min_score: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> List[HackerNewsArticle]:
+        """Same contract as HackerNewsService.fetch_articles, served from the mirror when possible"""
+        articles = self.articles(limit, story_type, min_score)
+        if articles is not None:
+            return articles
+        return await HackerNewsService.fetch_articles(
+            limit=limit,
+            story_type=story_type,
+            min_score=min_score,
+            client=client
+        )
+
+    async def iter_articles(
+        self,
+        limit: int = 10,
+        story_type: str = "topstories",
+        min_score: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        errors: Optional[List[str]] = None
+    ) -> AsyncIterator[HackerNewsArticle]:
+        """Same contract as HackerNewsService.iter_articles, served from the mirror when possible"""
+        articles = self.articles(limit, story_type, min_score)
+        if articles is not None:
+            for article in articles:
+                yield article
+            return
+        async for article in HackerNewsService.iter_articles(limit, story_type, min_score, client, errors):
+            yield article
+
+    async def fetch_article(
+        self,
+        article_id: int,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[HackerNewsArticle]:
+        """Same contract as HackerNewsService.fetch_article, served from the mirror when possible"""
+        if self.ready and article_id in self.items:
+            return self.items[article_id]
+        return await HackerNewsService.fetch_article(article_id, client=client)
+
+    def max_age(self) -> float:
+        """
+        Seconds until served Hacker News data is next expected to change
+
+        The time to the next poll while the mirror is ready; otherwise reads
+        come from the item cache, which refreshes scores every HN_SCORE_TTL.
+        """
+        if not self.ready:
+            return settings.HN_SCORE_TTL
+        return max(settings.HN_MIRROR_POLL_INTERVAL - (time.monotonic() - self._last_success), 0.0)
+
+    def status(self) -> HackerNewsMirrorStatus:
+        """Sync state, list sizes and upstream request counters"""
+        return HackerNewsMirrorStatus(
+            running=self.running,
+            ready=self.ready,
+            lists={story_type: len(ids) for story_type, ids in self.lists.items()},
+            items=len(self.items),
+            polls=self.polls,
+            items_refetched=self.items_refetched,
+            upstream_requests=self.upstream_requests,
+            last_sync=self.last_sync,
+            last_poll=self.last_poll,
+            last_error=self.last_error
+        )
+
+
+hacker_news_mirror = HackerNewsMirror()
+registry.register_cache("hn_mirror_pages", hacker_news_mirror._rendered)
@@ -0,0 +1,149 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+from app.core.categories import CATEGORIES, FeedCategory
+from app.core.config import settings
+from app.core.traffic_governor import background_priority
+from app.schemas.feeds import FeedArticle
+from app.schemas.ingestion import IngestionSourceStatus, IngestionStatusResponse
+from app.services.article_store import ArticleStore, article_store
+from app.services.feed_aggregator import FeedAggregatorService
+from app.services.hacker_news import HackerNewsService
+from app.services.hacker_news_mirror import hacker_news_mirror
+from app.services.live import live_hub
+from app.services.rss_feed import RSSFeedService
+from app.services.search import search_index
+
+
+class IngestionScheduler:
+    """
+    Background scheduler that refreshes every registered feed and Hacker News
+    list on an interval and writes the results into the article store.
+
+    Each source runs in its own task. Refresh times are jittered so sources do
+    not hit upstream in lockstep, and failures back off exponentially up to
+    INGEST_MAX_BACKOFF seconds.
+    """
+
+    def __init__(self, store: ArticleStore):
+        self.store = store
+        self._tasks: List[asyncio.Task] = []
+        self._loaders: Dict[str, Callable[[], Awaitable[List[FeedArticle]]]] = {}
+        self._status: Dict[str, IngestionSourceStatus] = {}
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def _jitter(self, delay: float) -> float:
+        spread = delay * settings.INGEST_JITTER
+        return max(delay + random.uniform(-spread, spread), 0.0)
+
+    def _next_delay(self, status: IngestionSourceStatus) -> float:
+        """Base interval after a success, exponential backoff after failures"""
+        if status.consecutive_failures == 0:
+            delay = settings.INGEST_INTERVAL
+        else:
+            delay = min(
+                settings.INGEST_RETRY_DELAY * 2 ** (status.consecutive_failures - 1),
+                settings.INGEST_MAX_BACKOFF
+            )
+        return self._jitter(delay)
+
+    @staticmethod
+    def _rss_loader(url: str, category: FeedCategory) -> Callable[[], Awaitable[List[FeedArticle]]]:
+        async def load() -> List[FeedArticle]:
+            feed = await RSSFeedService.refresh_feed(url, limit=settings.INGEST_LIMIT_PER_FEED)
+            articles = feed.articles[:settings.INGEST_LIMIT_PER_FEED]
+            return [FeedAggregatorService.from_rss(a, category) for a in articles]
+        return load
+
+    @staticmethod
+    def _hacker_news_loader(category: FeedCategory) -> Callable[[], Awaitable[List[FeedArticle]]]:
+        async def load() -> List[FeedArticle]:
+            stories = await hacker_news_mirror.fetch_articles(
+                limit=settings.INGEST_LIMIT_PER_FEED,
+                story_type=category.hacker_news
+            )
+            return [FeedAggregatorService.from_hacker_news(s, category) for s in stories]
+        return load
+
+    async def refresh(self, source: str) -> None:
+        """Refresh one source now and record the outcome in its status"""
+        status = self._status[source]
+        load = self._loaders[source]
+        started = time.perf_counter()
+        try:
+            articles = await load()
+            # Storage failures (e.g. SQLite errors) count as a failed refresh
+            # too, so the source backs off and retries instead of stopping
+            changed = self.store.put(source, status.category, articles)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status.consecutive_failures += 1
+            status.last_error = str(e)
+            print(f"Error refreshing {source}: {str(e)}")
+        else:
+            # The articles are stored, so a failed search write is logged
+            # rather than failing the refresh
+            try:
+                await search_index.add_async(changed)
+            except Exception as e:
+                print(f"Error indexing articles from {source}: {str(e)}")
+            live_hub.publish(source, status.category, changed)
+            status.articles = len(articles)
+            status.refreshes += 1
+            status.consecutive_failures = 0
+            status.last_error = None
+            status.last_refresh = datetime.now(timezone.utc)
+        finally:
+            status.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _run_source(self, source: str) -> None:
+        status = self._status[source]
+        # Stagger the first refresh of each source
+        await asyncio.sleep(random.uniform(0, settings.INGEST_STARTUP_SPREAD))
+        with background_priority():
+            while True:
+                await self.refresh(source)
+                delay = self._next_delay(status)
+                status.next_refresh = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                await asyncio.sleep(delay)
+
+    def _register_sources(self) -> None:
+        for category in CATEGORIES.values():
+            for url in category.feeds:
+                self._loaders[url] = self._rss_loader(url, category)
+                self._status[url] = IngestionSourceStatus(source=url, kind="rss", category=category.id)
+            if category.hacker_news:
+                url = HackerNewsService.story_list_url(category.hacker_news)
+                self._loaders[url] = self._hacker_news_loader(category)
+                self._status[url] = IngestionSourceStatus(source=url, kind="hacker_news", category=category.id)
+
+    async def start(self) -> None:
+        """Start one refresh loop per registered source"""
+        if self.running:
+            return
+        self._register_sources()
+        self._tasks = [asyncio.create_task(self._run_source(source)) for source in self._loaders]
+
+    async def stop(self) -> None:
+        """Cancel all refresh loops and wait for them to finish"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> IngestionStatusResponse:
+        """Last refresh time, duration and error for every source"""
+        return IngestionStatusResponse(
+            running=self.running,
+            interval=settings.INGEST_INTERVAL,
+            sources=list(self._status.values())
+        )
+
+
+ingestion_scheduler = IngestionScheduler(article_store)
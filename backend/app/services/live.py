@@ -0,0 +1,157 @@
+import asyncio
+from typing import AsyncIterator, Iterable, List, Optional, Set
+from app.core.config import settings
+from app.core.streaming import EVENT_STREAM, encode_event
+from app.schemas.feeds import FeedArticle
+from app.schemas.live import LiveStatsResponse
+
+# SSE comment line; keeps proxies and clients from timing out idle connections
+HEARTBEAT = b": heartbeat\n\n"
+DROPPED = b'event: dropped\ndata: {"reason":"slow consumer"}\n\n'
+FULL = b'event: dropped\ndata: {"reason":"too many subscribers"}\n\n'
+
+
+class Subscriber:
+    """One live connection: its filters and a bounded queue of encoded event batches"""
+
+    __slots__ = ("categories", "sources", "queue")
+
+    def __init__(self, categories: Optional[Iterable[str]], sources: Optional[Iterable[str]], queue_size: int):
+        self.categories = frozenset(categories) if categories else None
+        self.sources = frozenset(sources) if sources else None
+        # None in the queue tells the stream it was dropped
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def wants(self, source: str, category: str) -> bool:
+        return (
+            (self.categories is None or category in self.categories)
+            and (self.sources is None or source in self.sources)
+        )
+
+
+class LiveHub:
+    """
+    Fan-out of newly ingested or changed articles to live subscribers.
+
+    The ingestion scheduler publishes what changed on each refresh. Every
+    article is serialized once per publish, and the events of a publish are
+    queued as one chunk for each matching subscriber, so a batch of any
+    size takes a single queue slot. A subscriber with `queue_size` batches
+    still unread is dropped rather than allowed to hold memory or slow down
+    ingestion; its stream ends with a "dropped" event so the client can
+    reconnect.
+    """
+
+    def __init__(self, queue_size: int = 256, heartbeat_interval: float = 15.0, max_subscribers: int = 10000):
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None
+    ) -> Optional[Subscriber]:
+        """Register a subscriber, or return None if the hub is full"""
+        if self.full:
+            return None
+        subscriber = Subscriber(categories, sources, self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self.unsubscribe(subscriber)
+        self.dropped += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def publish(self, source: str, category: str, articles: List[FeedArticle]) -> int:
+        """
+        Queue changed articles for every subscriber that matches the source
+
+        Returns:
+            Number of subscribers the articles were queued for
+        """
+        self.published += len(articles)
+        if not articles or not self._subscribers:
+            return 0
+
+        chunk = None
+        delivered = 0
+        for subscriber in list(self._subscribers):
+            if not subscriber.wants(source, category):
+                continue
+            if chunk is None:
+                chunk = b"".join(encode_event("article", article, EVENT_STREAM) for article in articles)
+            try:
+                subscriber.queue.put_nowait(chunk)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+                continue
+            self.delivered += len(articles)
+            delivered += 1
+        return delivered
+
+    async def events(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Encoded Server-Sent Events for one new subscriber
+
+        The subscriber is registered when iteration starts, so a response
+        that is never streamed (client gone before the first byte) leaves
+        nothing behind. Sends a heartbeat after heartbeat_interval seconds
+        without events and unsubscribes when the client disconnects.
+        """
+        subscriber = self.subscribe(categories, sources)
+        if subscriber is None:
+            yield FULL
+            return
+        try:
+            yield HEARTBEAT
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                if message is None:
+                    yield DROPPED
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> LiveStatsResponse:
+        return LiveStatsResponse(
+            subscribers=len(self._subscribers),
+            published=self.published,
+            delivered=self.delivered,
+            dropped_subscribers=self.dropped,
+            queue_size=self.queue_size,
+            heartbeat_interval=self.heartbeat_interval
+        )
+
+
+live_hub = LiveHub(
+    queue_size=settings.LIVE_QUEUE_SIZE,
+    heartbeat_interval=settings.LIVE_HEARTBEAT_INTERVAL,
+    max_subscribers=settings.LIVE_MAX_SUBSCRIBERS
+)
@@ -1,130 +1,580 @@
-import feedparser
+import asyncio
+import time
 import httpx
-from typing import List, Optional
-from app.schemas.rss_feed import RSSArticle, RSSFeedInfo, RSSFeedResponse
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from app.core.cache import CacheEntry, TTLCache
+from app.core.config import settings
+from app.core.http_client import http_clients, RSS
+from app.core.metrics import FEED_PARSE_DURATION, registry
+from app.core.parse_pool import parse_pool
+from app.core.serialization import Rendered, render
+from app.core.single_flight import SingleFlight
+from app.core.traffic_governor import background_priority
+from app.services.feed_parser import StreamingFeedParser, UnsupportedFeed
+from app.schemas.rss_feed import (
+    RSSArticle,
+    RSSFeedInfo,
+    RSSFeedResponse,
+    RSSFeedStatus,
+    RSSMultipleFeedsResponse,
+)
+
+
+# Histogram children are looked up once; an observation is a list increment
+_observe_streaming_parse = FEED_PARSE_DURATION.labels("streaming").observe
+_observe_feedparser_parse = FEED_PARSE_DURATION.labels("feedparser").observe
+
+
+@dataclass
+class CachedFeed:
+    """A parsed feed together with the HTTP validators it was served with"""
+    feed: RSSFeedResponse
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # False when parsing stopped after a limit; only the first entries are known
+    complete: bool = True
+    # JSON bodies already rendered from this parse, keyed by request limit.
+    # A refresh stores a new CachedFeed, which drops them.
+    rendered: Dict[Optional[int], Rendered] = field(default_factory=dict, repr=False, compare=False)
+
+    def covers(self, limit: Optional[int]) -> bool:
+        """Whether this parse can answer a request for `limit` entries"""
+        return self.complete or (limit is not None and len(self.feed.articles) >= limit)
+
+    @property
+    def parse_limit(self) -> Optional[int]:
+        """Limit to re-parse with when refreshing this entry"""
+        return None if self.complete else len(self.feed.articles)
 
 
 class RSSFeedService:
     """Service for fetching and parsing RSS feeds from any source"""
 
-    TIMEOUT = 30.0
+    TIMEOUT = settings.RSS_TIMEOUT
+
+    # Parsed feeds keyed by normalized URL, served stale while a refresh runs
+    _cache = TTLCache(
+        ttl=settings.RSS_CACHE_TTL,
+        stale_ttl=settings.RSS_CACHE_STALE_TTL,
+        max_entries=settings.RSS_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RSS_CACHE_MAX_BYTES,
+    )
+    _refreshing: Set[str] = set()
+    # Concurrent loads of the same feed and limit share one download and parse
+    _load_flights = SingleFlight("rss_feed")
+    _not_modified = 0
+    _partial_misses = 0
+    _fast_parses = 0
+    _fallback_parses = 0
+    _rendered_hits = 0
+    _stale_on_error = 0
+    _background_tasks: Set[asyncio.Task] = set()
 
     @staticmethod
-    async def fetch_feed(url: str, limit: Optional[int] = None) -> RSSFeedResponse:
+    def _client(client: Optional[httpx.AsyncClient]) -> httpx.AsyncClient:
+        """Use the injected client, falling back to the shared RSS pool"""
+        return client if client is not None else http_clients.get(RSS)
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normalize a feed URL for use as a cache key
+
+        Lowercases scheme and host, drops default ports and fragments, and
+        sorts query parameters so equivalent URLs share one cache entry.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+        if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+            host = f"{host}:{port}"
+        path = parts.path or "/"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, host, path, query, ""))
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Hit/miss/eviction counters for the feed cache"""
+        return {
+            **RSSFeedService._cache.stats(),
+            "not_modified": RSSFeedService._not_modified,
+            "partial_misses": RSSFeedService._partial_misses,
+            "fast_parses": RSSFeedService._fast_parses,
+            "fallback_parses": RSSFeedService._fallback_parses,
+            "rendered_hits": RSSFeedService._rendered_hits,
+            "refreshing": len(RSSFeedService._refreshing),
+            "coalesced_loads": RSSFeedService._load_flights.coalesced,
+            "stale_on_error": RSSFeedService._stale_on_error,
+        }
+
+    @staticmethod
+    def _apply_limit(feed: RSSFeedResponse, limit: Optional[int]) -> RSSFeedResponse:
+        """Slice a cached full feed down to the requested number of articles"""
+        if not limit or limit >= len(feed.articles):
+            return feed
+        articles = feed.articles[:limit]
+        return RSSFeedResponse(feed_info=feed.feed_info, total=len(articles), articles=articles)
+
+    @staticmethod
+    def _schedule_refresh(url: str, key: str, client: Optional[httpx.AsyncClient], previous: CacheEntry) -> None:
+        """Refresh a stale cache entry in the background, at most once per key"""
+        if key in RSSFeedService._refreshing:
+            return
+        RSSFeedService._refreshing.add(key)
+
+        async def refresh():
+            try:
+                with background_priority():
+                    await RSSFeedService._load_once(url, key, client, previous, previous.value.parse_limit)
+            except Exception as e:
+                print(f"Error refreshing RSS feed {url}: {str(e)}")
+            finally:
+                RSSFeedService._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        RSSFeedService._background_tasks.add(task)
+        task.add_done_callback(RSSFeedService._background_tasks.discard)
+
+    @staticmethod
+    async def fetch_feed(
+        url: str,
+        limit: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> RSSFeedResponse:
         """
         Fetch and parse an RSS feed from any URL
 
+        Results are cached per normalized URL. A stale entry is returned
+        immediately while a background task revalidates it upstream. With a
+        limit, only the first `limit` entries are parsed; a cached partial
+        parse serves later requests for at most as many entries.
+
         Args:
             url: RSS feed URL
             limit: Maximum number of articles to return (None for all)
+            client: Optional HTTP client (defaults to the shared pool)
 
         Returns:
             RSSFeedResponse with feed info and articles
         """
+        cached = await RSSFeedService._cached_feed(url, limit, client)
+        return RSSFeedService._apply_limit(cached.feed, limit)
+
+    @staticmethod
+    async def render_feed(
+        url: str,
+        limit: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Rendered:
+        """
+        fetch_feed serialized to JSON bytes, with an ETag
+
+        The body is kept on the cache entry, so repeat requests for the same
+        URL and limit skip building and encoding the response until the feed
+        is refreshed.
+        """
+        cached = await RSSFeedService._cached_feed(url, limit, client)
+        rendered = cached.rendered.get(limit)
+        if rendered is not None:
+            RSSFeedService._rendered_hits += 1
+            return rendered
+        rendered = render(RSSFeedService._apply_limit(cached.feed, limit))
+        if settings.RESPONSE_CACHE_ENABLED:
+            cached.rendered[limit] = rendered
+        return rendered
+
+    @staticmethod
+    def max_age(url: str) -> float:
+        """Seconds until the cached copy of a feed is due for a refresh (0 if not cached)"""
+        entry = RSSFeedService._cache.peek(RSSFeedService.normalize_url(url))
+        if entry is None:
+            return 0.0
+        return max(entry.fresh_until - time.monotonic(), 0.0)
+
+    @staticmethod
+    async def _cached_feed(
+        url: str,
+        limit: Optional[int],
+        client: Optional[httpx.AsyncClient]
+    ) -> CachedFeed:
+        """
+        The cache entry answering a request for `limit` entries, loading it if needed
+
+        If the load fails (upstream down, or its circuit open) and an older
+        copy exists, even one past the stale window, that copy is served.
+        """
+        key = RSSFeedService.normalize_url(url)
+        # Keep any expired entry around so its validators can still be sent,
+        # unless it is a partial parse too short for this request
+        previous = RSSFeedService._usable(key, limit)
+        entry = RSSFeedService._cache.get_entry(key)
+        if entry is not None:
+            if entry.value.covers(limit):
+                if not entry.is_fresh:
+                    RSSFeedService._schedule_refresh(url, key, client, entry)
+                return entry.value
+            RSSFeedService._partial_misses += 1
+
         try:
-            # Fetch the RSS feed content
-            async with httpx.AsyncClient(timeout=RSSFeedService.TIMEOUT, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                content = response.text
+            return await RSSFeedService._load_once(url, key, client, previous, limit)
+        except Exception as e:
+            if previous is None:
+                raise
+            RSSFeedService._stale_on_error += 1
+            print(f"Serving stale RSS feed {url}: {str(e)}")
+            # Keep it as an expired entry: later requests get it at once and
+            # revalidate in the background
+            RSSFeedService._cache.set(key, previous.value, size=previous.size, ttl=0)
+            return previous.value
+
+    @staticmethod
+    async def refresh_feed(
+        url: str,
+        client: Optional[httpx.AsyncClient] = None,
+        limit: Optional[int] = None
+    ) -> RSSFeedResponse:
+        """
+        Fetch a feed upstream regardless of cache freshness and update the cache
 
-            # Parse the RSS feed
-            feed = feedparser.parse(content)
+        Stored validators are still sent, so an unchanged feed costs a 304.
+        With a limit, parsing stops after that many entries.
+        """
+        key = RSSFeedService.normalize_url(url)
+        cached = await RSSFeedService._load_once(url, key, client, RSSFeedService._usable(key, limit), limit)
+        return cached.feed
 
-            # Extract feed metadata
-            feed_info = RSSFeedInfo(
-                title=feed.feed.get('title'),
-                link=feed.feed.get('link'),
-                description=feed.feed.get('description') or feed.feed.get('subtitle'),
-                language=feed.feed.get('language')
-            )
+    @staticmethod
+    def _usable(key: str, limit: Optional[int]) -> Optional[CacheEntry]:
+        """The cached entry (expired or not) if it covers `limit` entries"""
+        previous = RSSFeedService._cache.peek(key)
+        if previous is None or not previous.value.covers(limit):
+            return None
+        return previous
 
-            # Extract articles
-            articles = []
-            entries = feed.entries[:limit] if limit else feed.entries
-
-            for entry in entries:
-                try:
-                    # Extract categories/tags
-                    categories = []
-                    if hasattr(entry, 'tags'):
-                        categories = [tag.get('term') for tag in entry.tags if tag.get('term')]
-                    elif hasattr(entry, 'category'):
-                        categories = [entry.category]
-
-                    # Extract author
-                    author = None
-                    if hasattr(entry, 'author'):
-                        author = entry.author
-                    elif hasattr(entry, 'author_detail'):
-                        author = entry.author_detail.get('name')
-
-                    # Extract publication date
-                    published = None
-                    if hasattr(entry, 'published'):
-                        published = entry.published
-                    elif hasattr(entry, 'updated'):
-                        published = entry.updated
-
-                    # Extract description/content
-                    description = None
-                    if hasattr(entry, 'summary'):
-                        description = entry.summary
-                    elif hasattr(entry, 'description'):
-                        description = entry.description
-                    elif hasattr(entry, 'content') and entry.content:
-                        # Some feeds use 'content' instead of 'summary'
-                        description = entry.content[0].get('value') if isinstance(entry.content, list) else entry.content
-
-                    # Create article object
-                    article = RSSArticle(
-                        title=entry.get('title', 'No Title'),
-                        link=entry.get('link'),
-                        description=description,
-                        published=published,
-                        author=author,
-                        category=categories if categories else None,
-                        guid=entry.get('id') or entry.get('link')
-                    )
-                    articles.append(article)
-                except Exception as article_error:
-                    # Log the error but continue processing other articles
-                    print(f"Error processing article from {url}: {str(article_error)}")
-                    continue
-
-            return RSSFeedResponse(
-                feed_info=feed_info,
-                total=len(articles),
-                articles=articles
-            )
+    @staticmethod
+    async def _load_once(
+        url: str,
+        key: str,
+        client: Optional[httpx.AsyncClient],
+        previous: Optional[CacheEntry],
+        limit: Optional[int]
+    ) -> CachedFeed:
+        """
+        _load, shared by concurrent callers for the same feed and limit
+
+        A burst of requests for an uncached feed costs one download and one
+        parse; every caller gets the same result or the same error.
+        """
+        return await RSSFeedService._load_flights.run(
+            (key, limit), RSSFeedService._load, url, key, client, previous, limit
+        )
+
+    @staticmethod
+    async def _load(
+        url: str,
+        key: str,
+        client: Optional[httpx.AsyncClient] = None,
+        previous: Optional[CacheEntry] = None,
+        limit: Optional[int] = None
+    ) -> CachedFeed:
+        """
+        Download a feed and store the parsed result in the cache
+
+        When a previous entry is given, its ETag / Last-Modified validators are
+        sent upstream and a 304 reuses the already parsed feed.
 
+        With a limit (and RSS_FAST_PARSE on), the body is parsed incrementally
+        as it arrives and the download stops once `limit` entries have ended.
+        Feeds the fast parser does not handle go to feedparser in full.
+        """
+        headers = {}
+        if previous is not None:
+            if previous.value.etag:
+                headers["If-None-Match"] = previous.value.etag
+            if previous.value.last_modified:
+                headers["If-Modified-Since"] = previous.value.last_modified
+
+        try:
+            # Fetch the RSS feed content
+            async with RSSFeedService._client(client).stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and previous is not None:
+                    RSSFeedService._not_modified += 1
+                    RSSFeedService._cache.set(key, previous.value, size=previous.size)
+                    return previous.value
+
+                response.raise_for_status()
+                if limit is not None and settings.RSS_FAST_PARSE:
+                    feed, complete, size = await RSSFeedService._parse_stream(response, url, limit)
+                else:
+                    content = await response.aread()
+                    # Parse in the worker pool so the event loop keeps serving
+                    feed = await parse_pool.run(
+                        RSSFeedService.parse_feed, content, url, observe=_observe_feedparser_parse
+                    )
+                    complete, size = True, len(content)
         except httpx.HTTPError as e:
             raise Exception(f"HTTP error fetching RSS feed: {str(e)}")
         except Exception as e:
             raise Exception(f"Error parsing RSS feed: {str(e)}")
 
+        cached = CachedFeed(
+            feed=feed,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            complete=complete,
+        )
+        RSSFeedService._cache.set(key, cached, size=size)
+        return cached
+
     @staticmethod
-    async def fetch_multiple_feeds(urls: List[str], limit_per_feed: Optional[int] = None) -> List[RSSArticle]:
+    async def _parse_stream(
+        response: httpx.Response,
+        url: str,
+        limit: int
+    ) -> Tuple[RSSFeedResponse, bool, int]:
         """
-        Fetch articles from multiple RSS feeds
+        Read a streamed body until `limit` entries have ended, then parse that part
+
+        The streaming parser builds the entries itself when feedparser would
+        return their fields unchanged; otherwise feedparser parses the cut
+        document, so the result always matches parse_feed. Falls back to
+        reading the rest of the body and parsing all of it when the document
+        is not plain RSS 2.0 / Atom.
+
+        Returns:
+            Tuple of the parsed feed, whether the whole document was parsed,
+            and the number of body bytes read
+        """
+        parser = StreamingFeedParser(limit)
+        chunks: List[bytes] = []
+        body = response.aiter_bytes()
+        parse_seconds = 0.0
+        try:
+            async for chunk in body:
+                chunks.append(chunk)
+                started = time.perf_counter()
+                done = parser.feed(chunk)
+                parse_seconds += time.perf_counter() - started
+                if done:
+                    break
+            else:
+                parser.feed(b"", final=True)
+        except UnsupportedFeed:
+            # Same iterator, so reading resumes where the fast path stopped
+            async for chunk in body:
+                chunks.append(chunk)
+            content = b"".join(chunks)
+            RSSFeedService._fallback_parses += 1
+            feed = await parse_pool.run(RSSFeedService.parse_feed, content, url, observe=_observe_feedparser_parse)
+            return feed, True, len(content)
+
+        RSSFeedService._fast_parses += 1
+        content = b"".join(chunks)
+        started = time.perf_counter()
+        feed = parser.result()
+        _observe_streaming_parse(parse_seconds + time.perf_counter() - started)
+        if feed is None:
+            # Markup the builder does not reproduce: feedparser parses the entries read
+            feed = await parse_pool.run(
+                RSSFeedService.parse_feed, parser.document(content), url, observe=_observe_feedparser_parse
+            )
+        return feed, parser.complete, len(content)
+
+    @staticmethod
+    def parse_feed(content: Union[str, bytes], url: str = "") -> RSSFeedResponse:
+        """
+        Parse RSS/Atom content into an RSSFeedResponse
+
+        Runs synchronously; async callers go through parse_pool.
 
         Args:
-            urls: List of RSS feed URLs
-            limit_per_feed: Maximum number of articles per feed
+            content: Raw feed document (bytes are decoded by feedparser from the XML declaration)
+            url: Feed URL, used in log messages
 
         Returns:
-            Combined list of articles from all feeds
+            RSSFeedResponse with feed info and all articles
         """
-        all_articles = []
+        # Imported here: feedparser costs ~70ms at import, and feeds the
+        # streaming parser builds itself never need it
+        import feedparser
+
+        # Parse the RSS feed
+        feed = feedparser.parse(content)
 
-        for url in urls:
+        # Extract feed metadata
+        feed_info = RSSFeedInfo(
+            title=feed.feed.get('title'),
+            link=feed.feed.get('link'),
+            description=feed.feed.get('description') or feed.feed.get('subtitle'),
+            language=feed.feed.get('language')
+        )
+
+        # Extract articles
+        articles = []
+
+        for entry in feed.entries:
             try:
-                response = await RSSFeedService.fetch_feed(url, limit_per_feed)
-                # Add source info to each article
-                for article in response.articles:
-                    all_articles.append(article)
+                # Extract categories/tags
+                categories = []
+                if hasattr(entry, 'tags'):
+                    categories = [tag.get('term') for tag in entry.tags if tag.get('term')]
+                elif hasattr(entry, 'category'):
+                    categories = [entry.category]
+
+                # Extract author
+                author = None
+                if hasattr(entry, 'author'):
+                    author = entry.author
+                elif hasattr(entry, 'author_detail'):
+                    author = entry.author_detail.get('name')
+
+                # Extract publication date
+                published = None
+                if hasattr(entry, 'published'):
+                    published = entry.published
+                elif hasattr(entry, 'updated'):
+                    published = entry.updated
+
+                # Extract description/content
+                description = None
+                if hasattr(entry, 'summary'):
+                    description = entry.summary
+                elif hasattr(entry, 'description'):
+                    description = entry.description
+                elif hasattr(entry, 'content') and entry.content:
+                    # Some feeds use 'content' instead of 'summary'
+                    description = entry.content[0].get('value') if isinstance(entry.content, list) else entry.content
+
+                # Create article object
+                article = RSSArticle(
+                    title=entry.get('title', 'No Title'),
+                    link=entry.get('link'),
+                    description=description,
+                    published=published,
+                    author=author,
+                    category=categories if categories else None,
+                    guid=entry.get('id') or entry.get('link')
+                )
+                articles.append(article)
+            except Exception as article_error:
+                # Log the error but continue processing other articles
+                print(f"Error processing article from {url}: {str(article_error)}")
+                continue
+
+        return RSSFeedResponse(
+            feed_info=feed_info,
+            total=len(articles),
+            articles=articles
+        )
+
+    @staticmethod
+    async def _fetch_for_fanout(
+        url: str,
+        limit: Optional[int],
+        client: Optional[httpx.AsyncClient],
+        semaphore: asyncio.Semaphore,
+        deadline: float
+    ) -> Tuple[List[RSSArticle], RSSFeedStatus]:
+        """Fetch one feed of a fan-out, turning failures and timeouts into a status"""
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    RSSFeedService.fetch_feed(url, limit, client=client),
+                    timeout=deadline
+                )
+                articles, status, error = response.articles, "ok", None
+            except asyncio.TimeoutError:
+                articles, status, error = [], "timeout", f"No response within {deadline}s"
             except Exception as e:
                 print(f"Error fetching feed {url}: {str(e)}")
-                continue
+                articles, status, error = [], "error", str(e)
+
+            return articles, RSSFeedStatus(
+                url=url,
+                status=status,
+                articles=len(articles),
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+                error=error
+            )
+
+    @staticmethod
+    async def fetch_multiple_feeds(
+        urls: List[str],
+        limit_per_feed: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> RSSMultipleFeedsResponse:
+        """
+        Fetch articles from multiple RSS feeds concurrently
+
+        At most `concurrency` feeds are fetched at once and each feed gets
+        `deadline` seconds; feeds that fail or run out of time are reported in
+        the per-feed status block instead of failing the whole request.
+
+        Args:
+            urls: List of RSS feed URLs
+            limit_per_feed: Maximum number of articles per feed
+            client: Optional HTTP client (defaults to the shared pool)
+            concurrency: Maximum feeds in flight (defaults to RSS_FANOUT_CONCURRENCY)
+            deadline: Per-feed time limit in seconds (defaults to RSS_FEED_DEADLINE)
+
+        Returns:
+            RSSMultipleFeedsResponse with combined articles and per-feed status
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.RSS_FANOUT_CONCURRENCY)
+        deadline = deadline or settings.RSS_FEED_DEADLINE
+
+        results = await asyncio.gather(*(
+            RSSFeedService._fetch_for_fanout(url, limit_per_feed, client, semaphore, deadline)
+            for url in urls
+        ))
+
+        # Keep articles in the order the feeds were requested
+        all_articles = [article for articles, _ in results for article in articles]
+
+        return RSSMultipleFeedsResponse(
+            total_feeds=len(urls),
+            total_articles=len(all_articles),
+            articles=all_articles,
+            feeds=[status for _, status in results]
+        )
+
+    @staticmethod
+    async def iter_feeds(
+        urls: List[str],
+        limit_per_feed: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[List[RSSArticle], RSSFeedStatus]]:
+        """
+        Yield each feed's articles and status as soon as that feed finishes
+
+        Same fan-out rules as fetch_multiple_feeds, but results arrive in
+        completion order. Feeds still in flight are cancelled if the consumer
+        stops iterating early.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.RSS_FANOUT_CONCURRENCY)
+        deadline = deadline or settings.RSS_FEED_DEADLINE
+        pending = {
+            asyncio.create_task(RSSFeedService._fetch_for_fanout(url, limit_per_feed, client, semaphore, deadline))
+            for url in urls
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
 
-        return all_articles
+registry.register_cache("rss_feeds", RSSFeedService._cache)
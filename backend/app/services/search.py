@@ -0,0 +1,212 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.schemas.feeds import FeedArticle
+from app.schemas.search import SearchResponse
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    timestamp INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_category_timestamp ON articles (category, timestamp);
+CREATE INDEX IF NOT EXISTS articles_timestamp ON articles (timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, body, author, tokenize = 'porter unicode61'
+);
+"""
+
+
+def _epoch(value: datetime) -> int:
+    """Unix time of `value`; naive datetimes are taken as UTC, like article timestamps"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class SearchIndex:
+    """
+    Full-text index over ingested articles backed by SQLite FTS5.
+
+    Article rows live in `articles`; `articles_fts` shares their rowid and
+    holds the tokenized title, body and author. Queries are ranked with BM25
+    (title weighted highest) and can be filtered by category and date.
+    Set SEARCH_DB_PATH to a file to keep history across restarts.
+
+    The connection is guarded by a lock. Searches run in FastAPI's
+    threadpool and writes go through `add_async` / `add_in_background`, so
+    neither a write nor a slow search holding the lock blocks the event loop.
+    """
+
+    # BM25 column weights for title, body, author
+    WEIGHTS = (10.0, 1.0, 2.0)
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._writes: Set[asyncio.Task] = set()
+        self._conn.executescript(_SCHEMA)
+        # Make FTS5's built-in `rank` column use the weighted BM25
+        self._conn.execute(
+            "INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)",
+            ("bm25({}, {}, {})".format(*self.WEIGHTS),)
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def add(self, articles: Iterable[FeedArticle]) -> int:
+        """
+        Insert or update articles, skipping ones that have not changed
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        with self._lock, self._conn:
+            for article in articles:
+                data = article.model_dump_json()
+                row = self._conn.execute(
+                    "SELECT rowid, data FROM articles WHERE id = ?", (article.id,)
+                ).fetchone()
+                if row is not None and row[1] == data:
+                    continue
+
+                fields = (article.category, article.timestamp, data)
+                if row is None:
+                    rowid = self._conn.execute(
+                        "INSERT INTO articles (id, category, timestamp, data) VALUES (?, ?, ?, ?)",
+                        (article.id, *fields)
+                    ).lastrowid
+                else:
+                    rowid = row[0]
+                    self._conn.execute(
+                        "UPDATE articles SET category = ?, timestamp = ?, data = ? WHERE rowid = ?",
+                        (*fields, rowid)
+                    )
+                    self._conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (rowid,))
+
+                self._conn.execute(
+                    "INSERT INTO articles_fts (rowid, title, body, author) VALUES (?, ?, ?, ?)",
+                    (rowid, article.title, article.content or article.excerpt, article.author or "")
+                )
+                written += 1
+        return written
+
+    async def add_async(self, articles: Iterable[FeedArticle]) -> int:
+        """add() in a worker thread, keeping the SQLite write off the event loop"""
+        return await asyncio.to_thread(self.add, list(articles))
+
+    def add_in_background(self, articles: Iterable[FeedArticle]) -> None:
+        """Index articles in a worker thread without waiting (for request handlers)"""
+        async def write(batch: List[FeedArticle]) -> None:
+            try:
+                await self.add_async(batch)
+            except Exception as e:
+                print(f"Error indexing articles: {str(e)}")
+
+        task = asyncio.get_running_loop().create_task(write(list(articles)))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    @staticmethod
+    def build_query(text: str) -> Optional[str]:
+        """
+        Turn free text into an FTS5 query: every token must match and the
+        last one is a prefix, so results update while the user types
+        """
+        tokens = _TOKEN_RE.findall(text.lower())
+        if not tokens:
+            return None
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(
+        self,
+        text: str,
+        category: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0
+    ) -> SearchResponse:
+        """
+        Run a ranked full-text query
+
+        Args:
+            text: Free-text query
+            category: Optional category id filter
+            since / until: Optional publication date bounds
+            sort: "relevance" (BM25) or "date" (newest first)
+            limit / offset: Pagination
+
+        Returns:
+            SearchResponse with the total match count and one page of articles
+        """
+        started = time.perf_counter()
+        match = self.build_query(text)
+        if match is None:
+            return SearchResponse(query=text, total=0, limit=limit, offset=offset, took_ms=0.0, results=[])
+
+        # CROSS JOIN keeps the full-text match as the outer loop; otherwise
+        # SQLite may scan `articles` and re-run the MATCH for every row
+        where, params = self._filters(match, category, since, until)
+        source = "articles_fts CROSS JOIN articles a ON a.rowid = articles_fts.rowid"
+        order = "a.timestamp DESC" if sort == "date" else "articles_fts.rank"
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM {source} WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT a.data FROM {source} WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+
+        return SearchResponse(
+            query=text,
+            total=total,
+            limit=limit,
+            offset=offset,
+            took_ms=round((time.perf_counter() - started) * 1000, 3),
+            results=[FeedArticle.model_validate_json(row[0]) for row in rows]
+        )
+
+    @staticmethod
+    def _filters(
+        match: str,
+        category: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> Tuple[str, List]:
+        clauses, params = ["articles_fts MATCH ?"], [match]
+        if category:
+            clauses.append("a.category = ?")
+            params.append(category)
+        if since is not None:
+            clauses.append("a.timestamp >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("a.timestamp <= ?")
+            params.append(_epoch(until))
+        return " AND ".join(clauses), params
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+search_index = SearchIndex(settings.SEARCH_DB_PATH)
@@ -0,0 +1,161 @@
+"""
+Response serialization benchmark
+
+Serves the same hot requests through three versions of the routes (same
+app shape, no middleware), against the offline stub upstream with warm
+feed/item caches:
+
+- json: the previous routes, which return models that FastAPI validates
+  against response_model and encodes with the stdlib-based JSONResponse
+- orjson: the same routes with ORJSONResponse as the default response class
+- rendered: the current routes, which answer repeat requests from
+  pre-serialized bytes (RESPONSE_CACHE_ENABLED)
+
+For each one it reports the mean time per request and the mean peak of
+memory allocated while handling one request (tracemalloc), which tracks
+how many intermediate objects the response path builds.
+
+Usage (from backend/):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --requests 500 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+os.environ.setdefault("INGEST_ENABLED", "false")
+os.environ.setdefault("HN_MIRROR_ENABLED", "false")
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.core.http_client import http_clients
+from app.schemas.feeds import CategoryFeedResponse
+from app.schemas.hacker_news import HackerNewsResponse
+from app.schemas.rss_feed import RSSFeedResponse
+from app.services.feed_aggregator import FeedAggregatorService
+from app.services.hacker_news_mirror import hacker_news_mirror
+from app.services.rss_feed import RSSFeedService
+from benchmarks.startup import _asgi_get
+from benchmarks.stub_upstream import stub_transport
+
+SCENARIOS: Dict[str, str] = {
+    "rss_feed": "/api/v1/rss/?url=https://example.com/feed&limit=20",
+    "category_page": "/api/v1/feeds/llm?page_size=50",
+    "hacker_news": "/api/v1/hacker-news/?limit=30",
+}
+
+
+def _model_app(response_class) -> FastAPI:
+    """The hot routes as they were before pre-rendering: return models, let FastAPI encode"""
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/api/v1/rss/", response_model=RSSFeedResponse)
+    async def rss(url: str, limit: Optional[int] = None):
+        return await RSSFeedService.fetch_feed(url, limit)
+
+    @app.get("/api/v1/feeds/{category}", response_model=CategoryFeedResponse)
+    async def feeds(category: str, page: int = 1, page_size: int = 50, limit_per_feed: int = 20):
+        return await FeedAggregatorService.get_feed(category, page, page_size, limit_per_feed)
+
+    @app.get("/api/v1/hacker-news/", response_model=HackerNewsResponse)
+    async def hacker_news(limit: int = 10, story_type: str = "topstories"):
+        articles = await hacker_news_mirror.fetch_articles(limit=limit, story_type=story_type)
+        return HackerNewsResponse(total=len(articles), articles=articles)
+
+    return app
+
+
+def _rendered_app() -> FastAPI:
+    """The hot routes as they are now: return pre-rendered bytes"""
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/api/v1/rss/", response_model=RSSFeedResponse)
+    async def rss(url: str, limit: Optional[int] = None):
+        return Response(content=(await RSSFeedService.render_feed(url, limit)).body, media_type="application/json")
+
+    @app.get("/api/v1/feeds/{category}", response_model=CategoryFeedResponse)
+    async def feeds(category: str, page: int = 1, page_size: int = 50, limit_per_feed: int = 20):
+        rendered = await FeedAggregatorService.render_feed(category, page, page_size, limit_per_feed)
+        return Response(content=rendered.body, media_type="application/json")
+
+    @app.get("/api/v1/hacker-news/", response_model=HackerNewsResponse)
+    async def hacker_news(limit: int = 10, story_type: str = "topstories"):
+        return Response(content=hacker_news_mirror.render_articles(limit, story_type).body, media_type="application/json")
+
+    return app
+
+
+async def _measure(app, target: str, requests: int) -> Dict[str, float]:
+    """Mean time and mean peak allocation per request (after one warm-up request)"""
+    if await _asgi_get(app, target) != 200:
+        raise RuntimeError(f"{target} did not return 200")
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await _asgi_get(app, target)
+    elapsed = time.perf_counter() - started
+
+    # Timed separately: tracing allocations slows everything down
+    peaks = 0
+    tracemalloc.start()
+    for _ in range(requests):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await _asgi_get(app, target)
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "us_per_request": round(elapsed / requests * 1e6, 1),
+        "peak_kib_per_request": round(peaks / requests / 1024, 1),
+    }
+
+
+async def run(requests: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    http_clients.use_transport(stub_transport())
+
+    # Serve Hacker News from a synced mirror, as in production
+    await hacker_news_mirror.start()
+    while not hacker_news_mirror.ready:
+        await asyncio.sleep(0.01)
+    await hacker_news_mirror.stop()
+
+    apps: Dict[str, FastAPI] = {
+        "json": _model_app(JSONResponse),
+        "orjson": _model_app(ORJSONResponse),
+        "rendered": _rendered_app(),
+    }
+    results = {}
+    for name, target in SCENARIOS.items():
+        results[name] = {mode: await _measure(app, target, requests) for mode, app in apps.items()}
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and mode")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.requests))
+
+    if args.json:
+        print(json.dumps({"requests": args.requests, "results": results}, indent=2))
+    else:
+        print(f"{'scenario':<16} {'mode':<9} {'time/request':>13} {'peak alloc/request':>19}")
+        for name, modes in results.items():
+            for mode, result in modes.items():
+                print(
+                    f"{name:<16} {mode:<9} {result['us_per_request']:>11.1f}us "
+                    f"{result['peak_kib_per_request']:>16.1f}KiB"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
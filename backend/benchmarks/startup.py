@@ -0,0 +1,223 @@
+"""
+Cold-start benchmark for the FastAPI app and the Vercel function entrypoints
+
+Every run starts a fresh interpreter with `python -X importtime`, imports one
+entrypoint, then serves one representative request against the offline stub
+upstream. It records:
+
+- import_ms: wall time to import the entrypoint
+- first_request_ms: wall time of the first request after import, including
+  anything the request imports lazily
+- import_time_ms: total import cost reported by -X importtime, with the
+  heaviest modules listed for diagnosis
+
+The median of --runs runs is compared with benchmarks/startup_budget.json.
+The exit status is 1 if any entrypoint goes over its budget.
+
+Usage (from backend/):
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 5 --json
+    python -m benchmarks.startup --only fastapi vercel_rss
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+BUDGET_FILE = os.path.join(BACKEND_DIR, "benchmarks", "startup_budget.json")
+MARKER = "startup-benchmark: importing entrypoint"
+
+# name -> (kind, module name or handler file relative to the repo, request target)
+ENTRYPOINTS: Dict[str, Tuple[str, str, str]] = {
+    "fastapi": ("asgi", "main", "/api/v1/hacker-news/?limit=10"),
+    "vercel_index": ("vercel", "api/index.py", "/v1/hacker-news?limit=10"),
+    "vercel_health": ("vercel", "api/health/index.py", "/api/health"),
+    "vercel_hacker_news": ("vercel", "api/v1/hacker-news/index.py", "/api/v1/hacker-news?limit=10"),
+    "vercel_rss": ("vercel", "api/v1/rss/index.py", "/api/v1/rss?url=https://example.com/feed&limit=20"),
+    "vercel_feeds": ("vercel", "api/v1/feeds/index.py", "/api/v1/feeds?category=llm"),
+    "vercel_hacker_news_comments": (
+        "vercel", "api/v1/hacker-news/comments.py", "/api/v1/hacker-news/comments?id=1&max_nodes=100"
+    ),
+}
+
+
+def _install_stub() -> None:
+    from app.core.http_client import http_clients
+    from benchmarks.stub_upstream import stub_transport
+    http_clients.use_transport(stub_transport())
+
+
+async def _asgi_get(app, target: str) -> int:
+    """Send one GET straight into an ASGI app (no server, no lifespan)"""
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+def _vercel_get(module, target: str) -> int:
+    """Call a BaseHTTPRequestHandler's do_GET without a socket"""
+    handler = module.handler.__new__(module.handler)
+    handler.path = target
+    handler.headers = {}
+    handler.wfile = io.BytesIO()
+    statuses = []
+    handler.send_response = lambda code, message=None: statuses.append(code)
+    handler.send_header = lambda key, value: None
+    handler.end_headers = lambda: None
+    handler.do_GET()
+    json.loads(handler.wfile.getvalue())
+    return statuses[0]
+
+
+def child(name: str) -> None:
+    """Import one entrypoint and serve one request; print the timings as JSON"""
+    kind, target, request = ENTRYPOINTS[name]
+    sys.path.insert(0, BACKEND_DIR)
+    print(MARKER, file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    if kind == "asgi":
+        module = importlib.import_module(target)
+    else:
+        spec = importlib.util.spec_from_file_location(f"entrypoint_{name}", os.path.join(REPO_DIR, target))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    imported = time.perf_counter()
+
+    if name != "vercel_health":
+        _install_stub()
+    if kind == "asgi":
+        status = asyncio.run(_asgi_get(module.app, request))
+    else:
+        status = _vercel_get(module, request)
+    finished = time.perf_counter()
+
+    print(json.dumps({
+        "import_ms": round((imported - started) * 1000, 2),
+        "first_request_ms": round((finished - imported) * 1000, 2),
+        "status": status,
+    }))
+
+
+def _parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Total and heaviest top-level imports (ms) after the marker line"""
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    top = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented under their parent
+        if not module[1:].startswith(" "):
+            top.append((module.strip(), int(cumulative) / 1000))
+    total = sum(ms for _, ms in top)
+    return round(total, 2), sorted(top, key=lambda item: item[1], reverse=True)[:5]
+
+
+def measure(name: str, runs: int) -> Dict:
+    """Median timings of `runs` fresh interpreters for one entrypoint"""
+    env = {**os.environ, "INGEST_ENABLED": "false", "HN_MIRROR_ENABLED": "false"}
+    samples, importtimes, heaviest = [], [], []
+    # The first run also writes bytecode caches; it is not counted
+    for attempt in range(runs + 1):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--child", name],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+        if attempt == 0:
+            continue
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        total, heaviest = _parse_importtime(proc.stderr)
+        importtimes.append(total)
+
+    return {
+        "import_ms": statistics.median(s["import_ms"] for s in samples),
+        "first_request_ms": statistics.median(s["first_request_ms"] for s in samples),
+        "import_time_ms": statistics.median(importtimes),
+        "status": samples[-1]["status"],
+        "heaviest_imports": [{"module": module, "ms": ms} for module, ms in heaviest],
+    }
+
+
+def check(results: Dict[str, Dict], budget: Dict[str, Dict]) -> List[str]:
+    """Budget violations as human-readable lines"""
+    failures = []
+    for name, result in results.items():
+        for metric, limit in budget.get(name, {}).items():
+            if result[metric] > limit:
+                failures.append(f"{name}: {metric} {result[metric]:.1f}ms over budget {limit:.1f}ms")
+        if result["status"] != 200:
+            failures.append(f"{name}: first request returned {result['status']}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Measured runs per entrypoint (median is reported)")
+    parser.add_argument("--only", nargs="*", choices=sorted(ENTRYPOINTS), help="Entrypoints to measure")
+    parser.add_argument("--budget", default=BUDGET_FILE, help="Budget file (JSON)")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    results = {name: measure(name, args.runs) for name in (args.only or ENTRYPOINTS)}
+    failures = check(results, budget)
+
+    if args.json:
+        print(json.dumps({"results": results, "budget": budget, "failures": failures}, indent=2))
+    else:
+        print(f"{'entrypoint':<28} {'import':>9} {'importtime':>11} {'first req':>10}")
+        for name, result in results.items():
+            print(
+                f"{name:<28} {result['import_ms']:>7.1f}ms {result['import_time_ms']:>9.1f}ms "
+                f"{result['first_request_ms']:>8.1f}ms"
+            )
+        for failure in failures:
+            print(f"OVER BUDGET  {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
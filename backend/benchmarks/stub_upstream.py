@@ -0,0 +1,314 @@
+"""
+Offline stand-in for the upstream APIs (Hacker News Firebase and RSS/Atom feeds)
+
+Routes on the request's Host header:
+- hacker-news.firebaseio.com: /v0/<list>.json story IDs, /v0/item/<id>.json
+  items and /v0/updates.json. Every story has a THREAD_SIZE-comment thread,
+  four levels deep.
+- any other host: a reddit-style Atom feed for paths ending in ".rss" (like
+  https://www.reddit.com/r/<sub>.rss), an RSS 2.0 feed otherwise. Feeds carry
+  an ETag and answer a matching If-None-Match with 304.
+
+Two ways to install it:
+- `http_clients.use_transport(stub_transport())`: in-process, no latency,
+  used by the startup and serialization benchmarks
+- `StubServer(StubUpstream(latency=..., jitter=..., error_rate=...))`: a real
+  HTTP server on 127.0.0.1, reached through `server.transport()`, used by
+  the benchmark suite. Nothing leaves the machine either way.
+"""
+import asyncio
+import hashlib
+import html
+import random
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+HN_HOST = "hacker-news.firebaseio.com"
+STORY_COUNT = 500
+FEED_ENTRIES = 50
+# Comment threads: TOP_LEVEL_COMMENTS replies to the story, then four replies
+# per comment until the thread has THREAD_SIZE comments
+THREAD_SIZE = 500
+TOP_LEVEL_COMMENTS = 20
+COMMENT_BASE = 10_000_000
+
+_RSS = (
+    '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+    "<title>Stub feed</title><link>https://example.com</link><description>Stub</description>{items}"
+    "</channel></rss>"
+)
+_ITEM = (
+    "<item><title>{prefix} story {i}</title><link>https://example.com/{prefix}/{i}</link>"
+    "<description>&lt;p&gt;Body of story {i}&lt;/p&gt;</description>"
+    "<pubDate>Mon, 01 Jan 2024 {hour:02d}:00:00 GMT</pubDate><guid>{prefix}-{i}</guid></item>"
+)
+
+_ATOM = (
+    '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+    'xmlns:media="http://search.yahoo.com/mrss/"><category term="{sub}" label="r/{sub}"/>'
+    "<updated>2024-01-01T12:00:00+00:00</updated><id>/r/{sub}.rss</id>"
+    '<link rel="self" href="https://www.reddit.com/r/{sub}.rss" type="application/atom+xml" />'
+    '<link rel="alternate" href="https://www.reddit.com/r/{sub}" type="text/html" />'
+    "<subtitle>Discussion about {sub}</subtitle><title>{sub}</title>{entries}</feed>"
+)
+_ENTRY = (
+    "<entry><author><name>/u/user{i}</name><uri>https://www.reddit.com/user/user{i}</uri></author>"
+    '<category term="{sub}" label="r/{sub}"/><content type="html">{content}</content>'
+    "<id>t3_{sub}{i}</id>"
+    '<media:thumbnail url="https://b.thumbs.redditmedia.com/{sub}{i}.jpg" />'
+    '<link href="https://www.reddit.com/r/{sub}/comments/{sub}{i}/story_{i}/" />'
+    "<updated>2024-01-01T{hour:02d}:{minute:02d}:00+00:00</updated>"
+    "<published>2024-01-01T{hour:02d}:{minute:02d}:00+00:00</published>"
+    "<title>{sub} discussion {i}: what are you running this week?</title></entry>"
+)
+# Self-post body in reddit's markup: comment markers, nested divs, links, code
+_SELFTEXT = (
+    '<!-- SC_OFF --><div class="md"><p>Post {i} in r/{sub}. '
+    + "I have been benchmarking a few setups and wanted to share numbers and ask for feedback. " * 4
+    + '</p><ul><li>Setup A: <a href="https://example.com/a/{i}">details</a></li>'
+    "<li>Setup B: <strong>faster</strong> but uses more memory</li></ul>"
+    "<pre><code>for run in range(10):\n    measure(run)\n</code></pre>"
+    "<p>" + "Any pointers welcome, thanks in advance. " * 3 + "</p></div><!-- SC_ON --> &#32; submitted by &#32; "
+    '<a href="https://www.reddit.com/user/user{i}"> /u/user{i} </a> <br/> '
+    '<span><a href="https://www.reddit.com/r/{sub}/comments/{sub}{i}/">[link]</a></span> &#32; '
+    '<span><a href="https://www.reddit.com/r/{sub}/comments/{sub}{i}/">[comments]</a></span>'
+)
+
+
+@lru_cache(maxsize=256)
+def rss_document(prefix: str, entries: int = FEED_ENTRIES) -> bytes:
+    """An RSS 2.0 document with `entries` items"""
+    items = "".join(_ITEM.format(prefix=prefix, i=i, hour=i % 24) for i in range(entries))
+    return _RSS.format(items=items).encode()
+
+
+@lru_cache(maxsize=256)
+def reddit_document(sub: str, entries: int = FEED_ENTRIES) -> bytes:
+    """A reddit-style Atom feed: `entries` self posts with escaped HTML bodies"""
+    body = "".join(
+        _ENTRY.format(
+            sub=sub,
+            i=i,
+            hour=23 - i % 24,
+            minute=59 - i % 60,
+            content=html.escape(_SELFTEXT.format(sub=sub, i=i), quote=False),
+        )
+        for i in range(entries)
+    )
+    return _ATOM.format(sub=sub, entries=body).encode()
+
+
+def comment_id(story_id: int, index: int) -> int:
+    return COMMENT_BASE + story_id * THREAD_SIZE + index
+
+
+def hn_comment(item_id: int) -> dict:
+    """Comment `index` of a story's thread"""
+    story_id, index = divmod(item_id - COMMENT_BASE, THREAD_SIZE)
+    if index < TOP_LEVEL_COMMENTS:
+        parent = story_id
+    else:
+        parent = comment_id(story_id, (index - TOP_LEVEL_COMMENTS) // 4)
+    first_reply = TOP_LEVEL_COMMENTS + 4 * index
+    return {
+        "id": item_id,
+        "by": f"user{index % 40}",
+        "parent": parent,
+        "text": f"<p>Comment {index} on story {story_id}. " + "Interesting point, but the numbers differ. " * 3,
+        "time": 1700000000 + story_id + index,
+        "type": "comment",
+        "kids": [comment_id(story_id, i) for i in range(first_reply, min(first_reply + 4, THREAD_SIZE))],
+    }
+
+
+def hn_item(item_id: int) -> dict:
+    """A Hacker News story or comment; every 7th story ID is a job so filtering is exercised"""
+    if item_id >= COMMENT_BASE:
+        return hn_comment(item_id)
+    is_job = item_id % 7 == 0
+    item = {
+        "id": item_id,
+        "title": f"Stub story {item_id}",
+        "url": f"https://example.com/hn/{item_id}",
+        "score": item_id % 300,
+        "by": "stub",
+        "time": 1700000000 + item_id,
+        "descendants": 0 if is_job else THREAD_SIZE,
+        "type": "job" if is_job else "story",
+    }
+    if not is_job:
+        item["kids"] = [comment_id(item_id, i) for i in range(TOP_LEVEL_COMMENTS)]
+    return item
+
+
+def respond(
+    host: str,
+    path: str,
+    if_none_match: Optional[str] = None,
+    story_count: int = STORY_COUNT,
+    feed_entries: int = FEED_ENTRIES
+) -> Tuple[str, httpx.Response]:
+    """
+    Build the canned answer for one upstream request
+
+    Returns:
+        Tuple of the request kind (for counters) and the response
+    """
+    if host == HN_HOST:
+        if path.endswith("stories.json"):
+            return "hn_list", httpx.Response(200, json=list(range(1, story_count + 1)))
+        if path.startswith("/v0/item/"):
+            return "hn_item", httpx.Response(200, json=hn_item(int(path.rsplit("/", 1)[1].split(".")[0])))
+        if path == "/v0/updates.json":
+            return "hn_updates", httpx.Response(200, json={"items": [], "profiles": []})
+        return "not_found", httpx.Response(404)
+
+    if path.endswith(".rss"):
+        sub = path.rsplit("/", 1)[-1][:-len(".rss")] or "feed"
+        content, content_type = reddit_document(sub, feed_entries), "application/atom+xml"
+    else:
+        prefix = (host + path).replace("/", "_").replace(".", "_")
+        content, content_type = rss_document(prefix, feed_entries), "application/rss+xml"
+    etag = f'"{hashlib.md5(content).hexdigest()}"'
+    if if_none_match == etag:
+        return "feed_not_modified", httpx.Response(304, headers={"etag": etag})
+    return "feed", httpx.Response(200, content=content, headers={"content-type": content_type, "etag": etag})
+
+
+def handle(request: httpx.Request) -> httpx.Response:
+    """Answer one upstream request (no latency, no errors)"""
+    return respond(request.url.host, request.url.path, request.headers.get("if-none-match"))[1]
+
+
+def stub_transport() -> httpx.MockTransport:
+    return httpx.MockTransport(handle)
+
+
+class StubUpstream:
+    """
+    The stub upstream as an ASGI app, with injected latency and failures.
+
+    Every response is delayed by `latency` ± `jitter` seconds (uniform), and
+    `error_rate` of the requests fail with a 503. Randomness is seeded, so a
+    run is reproducible up to scheduling order. `requests` counts requests
+    by kind (hn_list, hn_item, hn_updates, feed, feed_not_modified, error).
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        story_count: int = STORY_COUNT,
+        feed_entries: int = FEED_ENTRIES
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.story_count = story_count
+        self.feed_entries = feed_entries
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+
+    def config(self) -> Dict[str, float]:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "story_count": self.story_count,
+            "feed_entries": self.feed_entries,
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                await send({"type": message["type"] + ".complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+
+        headers = {name.decode().lower(): value.decode() for name, value in scope["headers"]}
+        host = headers.get("host", "").split(":")[0]
+
+        delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0.0)
+        failed = self._random.random() < self.error_rate
+        if delay:
+            await asyncio.sleep(delay)
+
+        if failed:
+            kind, response = "error", httpx.Response(503, text="Service Unavailable")
+        else:
+            kind, response = respond(
+                host, scope["path"], headers.get("if-none-match"), self.story_count, self.feed_entries
+            )
+        self.requests[kind] += 1
+
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(name.encode(), value.encode()) for name, value in response.headers.items()],
+        })
+        await send({"type": "http.response.body", "body": response.content})
+
+
+class _RedirectTransport(httpx.AsyncBaseTransport):
+    """Send every request to the local stub server, keeping the original Host header"""
+
+    def __init__(self, port: int, max_connections: int):
+        self.port = port
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=self.port)
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class StubServer:
+    """
+    Serve a StubUpstream over real HTTP on 127.0.0.1 (an ephemeral port)
+
+    The server runs uvicorn in a background thread with its own event loop,
+    so the code under test talks to it through a normal connection pool.
+    Use as a context manager.
+    """
+
+    def __init__(self, app: StubUpstream):
+        self.app = app
+        self.port: Optional[int] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StubServer":
+        import uvicorn
+
+        config = uvicorn.Config(
+            self.app, host="127.0.0.1", port=0, log_level="warning", lifespan="off", access_log=False
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="stub-upstream", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Stub upstream server failed to start")
+            threading.Event().wait(0.01)
+        sockets: List = [sock for server in self._server.servers for sock in server.sockets]
+        self.port = sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def transport(self, max_connections: int = 100) -> httpx.AsyncBaseTransport:
+        """A transport that routes upstream requests to this server"""
+        return _RedirectTransport(self.port, max_connections)
@@ -0,0 +1,425 @@
+"""
+Throughput and latency benchmark suite against a local stub upstream
+
+Starts the stub upstream (benchmarks/stub_upstream.py) on 127.0.0.1, with
+optional latency, jitter and error injection, and points the shared HTTP
+clients at it. Nothing leaves the machine. It then drives:
+
+- the services directly: HackerNewsService.fetch_articles,
+  RSSFeedService.fetch_feed and RSSFeedService.fetch_multiple_feeds, with
+  cold caches (every op misses) and warm caches
+- the FastAPI routes through httpx.ASGITransport (no server, no lifespan)
+
+For each scenario it reports throughput (ops/s), latency percentiles (ms),
+failed ops, upstream requests by kind (and per op), the mean peak of memory
+allocated per op (tracemalloc, measured in a separate pass) and the
+process RSS. Results are JSON with the git commit and run configuration,
+so runs from different commits can be compared:
+
+    python -m benchmarks.suite --output before.json
+    git checkout <other commit>
+    python -m benchmarks.suite --compare before.json --max-regression 15
+
+With --max-regression, the exit status is 1 when any scenario's p95
+latency grows, or its throughput drops, by more than that percentage.
+
+Usage (from backend/):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --latency 0.05 --jitter 0.02 --error-rate 0.01
+    python -m benchmarks.suite --only rss_feed_cold route_feeds --iterations 50 --json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO
+
+os.environ.setdefault("INGEST_ENABLED", "false")
+os.environ.setdefault("HN_MIRROR_ENABLED", "false")
+# The stub has no rate limits; the per-host limits would measure the governor, not the services
+os.environ.setdefault("GOVERNOR_ENABLED", "false")
+
+import httpx
+from app.core.config import settings
+from app.core.http_client import http_clients
+from app.services.hacker_news import HackerNewsService
+from app.services.hacker_news_comments import HackerNewsCommentService
+from app.services.rss_feed import RSSFeedService
+from benchmarks.stub_upstream import THREAD_SIZE, StubServer, StubUpstream
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REDDIT_FEED = "https://www.reddit.com/r/LocalLLaMA.rss"
+RSS_FEED = "https://example.com/feed.xml"
+MULTIPLE_FEEDS = [f"https://www.reddit.com/r/sub{i}.rss" for i in range(5)]
+
+
+@dataclass
+class Scenario:
+    """One benchmarked operation; `op` gets the op index and raises on failure"""
+    description: str
+    op: Callable[[int], Awaitable[Any]]
+    reset: Optional[Callable[[], None]] = None  # runs before every op (cold caches)
+    serial: bool = False  # ignore --concurrency: concurrent ops would warm each other's caches
+
+
+def _unique(url: str) -> Callable[[], str]:
+    """A URL factory whose results never share a feed cache entry (the stub ignores the query)"""
+    counter = itertools.count()
+    return lambda: f"{url}?bench={next(counter)}"
+
+
+def scenarios(api: httpx.AsyncClient) -> Dict[str, Scenario]:
+    """All scenarios; route scenarios go through `api`, the app's ASGI client"""
+    cold_rss, cold_reddit, cold_full = _unique(RSS_FEED), _unique(REDDIT_FEED), _unique(REDDIT_FEED)
+    cold_multiple = [_unique(url) for url in MULTIPLE_FEEDS]
+
+    async def get(path: str, **params) -> None:
+        response = await api.get(path, params=params)
+        response.raise_for_status()
+
+    async def post(path: str, **params) -> None:
+        response = await api.post(path, params=params)
+        response.raise_for_status()
+
+    async def comment_tree() -> None:
+        tree = await HackerNewsCommentService.fetch_comment_tree(1, max_nodes=THREAD_SIZE)
+        if tree is None or not tree.complete:
+            raise RuntimeError(f"Incomplete comment tree: {tree and tree.truncated or tree}")
+
+    return {
+        "hn_articles_cold": Scenario(
+            "HackerNewsService.fetch_articles(limit=30), empty item cache",
+            lambda i: HackerNewsService.fetch_articles(limit=30),
+            reset=HackerNewsService._item_cache.clear,
+            serial=True,
+        ),
+        "hn_articles_warm": Scenario(
+            "HackerNewsService.fetch_articles(limit=30), cached items",
+            lambda i: HackerNewsService.fetch_articles(limit=30),
+        ),
+        "hn_comments_cold": Scenario(
+            f"HackerNewsCommentService.fetch_comment_tree, {THREAD_SIZE}-comment thread, empty node cache",
+            lambda i: comment_tree(),
+            reset=HackerNewsCommentService._node_cache.clear,
+            serial=True,
+        ),
+        "rss_feed_cold": Scenario(
+            "RSSFeedService.fetch_feed, RSS 2.0, limit=20, uncached URL",
+            lambda i: RSSFeedService.fetch_feed(cold_rss(), limit=20),
+        ),
+        "reddit_feed_cold": Scenario(
+            "RSSFeedService.fetch_feed, reddit Atom, limit=20, uncached URL",
+            lambda i: RSSFeedService.fetch_feed(cold_reddit(), limit=20),
+        ),
+        "reddit_feed_full_cold": Scenario(
+            "RSSFeedService.fetch_feed, reddit Atom, every entry, uncached URL",
+            lambda i: RSSFeedService.fetch_feed(cold_full()),
+        ),
+        "rss_feed_warm": Scenario(
+            "RSSFeedService.fetch_feed, reddit Atom, limit=20, cached",
+            lambda i: RSSFeedService.fetch_feed(REDDIT_FEED, limit=20),
+        ),
+        "rss_multiple_cold": Scenario(
+            "RSSFeedService.fetch_multiple_feeds, 5 uncached feeds, 5 per feed",
+            lambda i: RSSFeedService.fetch_multiple_feeds([url() for url in cold_multiple], limit_per_feed=5),
+        ),
+        "route_hacker_news": Scenario(
+            "GET /api/v1/hacker-news/?limit=30",
+            lambda i: get("/api/v1/hacker-news/", limit=30),
+        ),
+        "route_hacker_news_comments": Scenario(
+            f"GET /api/v1/hacker-news/1/comments?max_nodes={THREAD_SIZE}",
+            lambda i: get("/api/v1/hacker-news/1/comments", max_nodes=THREAD_SIZE),
+        ),
+        "route_rss": Scenario(
+            "GET /api/v1/rss/?url=<reddit feed>&limit=20",
+            lambda i: get("/api/v1/rss/", url=REDDIT_FEED, limit=20),
+        ),
+        "route_rss_multiple": Scenario(
+            "POST /api/v1/rss/multiple with 5 feeds",
+            lambda i: post("/api/v1/rss/multiple", urls=MULTIPLE_FEEDS, limit_per_feed=5),
+        ),
+        "route_feeds": Scenario(
+            "GET /api/v1/feeds/llm",
+            lambda i: get("/api/v1/feeds/llm"),
+        ),
+    }
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Linear-interpolated percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * percent / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _rss_mib() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return _max_rss_mib()
+
+
+def _max_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def _run_ops(scenario: Scenario, count: int, concurrency: int, start: int) -> Dict[str, Any]:
+    """Run `count` ops over `concurrency` workers; time each op"""
+    indices = iter(range(start, start + count))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indices:
+            if scenario.reset is not None:
+                scenario.reset()
+            started = time.perf_counter()
+            try:
+                await scenario.op(index)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(1 if scenario.serial else concurrency)))
+    return {"elapsed": time.perf_counter() - started, "latencies": latencies, "errors": errors}
+
+
+async def _alloc_peak_kib(scenario: Scenario, count: int, start: int) -> float:
+    """Mean peak of memory allocated while running one op (tracemalloc, sequential)"""
+    peaks = 0
+    tracemalloc.start()
+    try:
+        for index in range(start, start + count):
+            if scenario.reset is not None:
+                scenario.reset()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                await scenario.op(index)
+            except Exception:
+                pass
+            peaks += tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return round(peaks / count / 1024, 1)
+
+
+async def measure(
+    scenario: Scenario,
+    upstream: StubUpstream,
+    iterations: int,
+    concurrency: int,
+    warmup: int,
+    trace_ops: int
+) -> Dict[str, Any]:
+    """Warm up, run the timed ops, then the allocation pass"""
+    await _run_ops(scenario, warmup, concurrency, start=0)
+
+    before = dict(upstream.requests)
+    run = await _run_ops(scenario, iterations, concurrency, start=warmup)
+    upstream_requests = {
+        kind: count - before.get(kind, 0)
+        for kind, count in upstream.requests.items()
+        if count - before.get(kind, 0)
+    }
+    total_upstream = sum(upstream_requests.values())
+
+    alloc_peak = await _alloc_peak_kib(scenario, trace_ops, start=warmup + iterations) if trace_ops else None
+
+    ordered = sorted(run["latencies"])
+    return {
+        "description": scenario.description,
+        "ops": iterations,
+        "concurrency": 1 if scenario.serial else concurrency,
+        "errors": run["errors"],
+        "ops_per_s": round(iterations / run["elapsed"], 1),
+        "latency_ms": {
+            "mean": round(statistics.fmean(ordered) * 1000, 3),
+            "p50": round(_percentile(ordered, 50) * 1000, 3),
+            "p95": round(_percentile(ordered, 95) * 1000, 3),
+            "p99": round(_percentile(ordered, 99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3),
+        },
+        "upstream_requests": upstream_requests,
+        "upstream_per_op": round(total_upstream / iterations, 2),
+        "alloc_peak_kib_per_op": alloc_peak,
+        "rss_mib": round(_rss_mib(), 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    upstream = StubUpstream(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        feed_entries=args.feed_entries,
+    )
+    with StubServer(upstream) as server:
+        http_clients.use_transport(server.transport(settings.HTTP_MAX_CONNECTIONS))
+        await http_clients.shutdown()
+
+        import main  # after the transport is in place: the app must not reach real upstreams
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark") as api:
+            selected = scenarios(api)
+            names = args.only or list(selected)
+            unknown = sorted(set(names) - set(selected))
+            if unknown:
+                raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}")
+
+            results = {}
+            for name in names:
+                results[name] = await measure(
+                    selected[name], upstream, args.iterations, args.concurrency, args.warmup, args.trace_ops
+                )
+        await http_clients.shutdown()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "trace_ops": args.trace_ops,
+            "seed": args.seed,
+            "upstream": upstream.config(),
+            "max_rss_mib": round(_max_rss_mib(), 1),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    max_regression: Optional[float],
+    out: TextIO = sys.stdout
+) -> List[str]:
+    """Print the change against a baseline report; return the scenarios that regressed"""
+    regressions = []
+    print(f"\nCompared with {baseline['meta'].get('commit')} (baseline -> current)", file=out)
+    print(f"{'scenario':<22} {'ops/s':>27} {'p95 ms':>29} {'upstream/op':>14}", file=out)
+    for name, result in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<22} (not in baseline)", file=out)
+            continue
+        throughput = _change(old["ops_per_s"], result["ops_per_s"])
+        p95 = _change(old["latency_ms"]["p95"], result["latency_ms"]["p95"])
+        print(
+            f"{name:<22} {old['ops_per_s']:>8.1f} -> {result['ops_per_s']:>7.1f} {throughput:>+6.1f}% "
+            f"{old['latency_ms']['p95']:>8.2f} -> {result['latency_ms']['p95']:>7.2f} {p95:>+7.1f}% "
+            f"{old['upstream_per_op']:>5} -> {result['upstream_per_op']:<5}",
+            file=out,
+        )
+        if max_regression is not None and (p95 > max_regression or -throughput > max_regression):
+            regressions.append(name)
+    return regressions
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    meta = report["meta"]
+    upstream = meta["upstream"]
+    print(
+        f"commit {meta['commit']}, {meta['iterations']} ops x concurrency {meta['concurrency']}, "
+        f"upstream latency {upstream['latency'] * 1000:.0f}±{upstream['jitter'] * 1000:.0f}ms, "
+        f"errors {upstream['error_rate']:.1%}"
+    )
+    print(
+        f"{'scenario':<22} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'errors':>6} {'upstream/op':>11} {'alloc/op':>11} {'rss':>9}"
+    )
+    for name, result in report["results"].items():
+        latency = result["latency_ms"]
+        alloc = result["alloc_peak_kib_per_op"]
+        alloc = f"{alloc:.1f}KiB" if alloc is not None else "-"
+        print(
+            f"{name:<22} {result['ops_per_s']:>9.1f} {latency['p50']:>9.2f} {latency['p95']:>9.2f} "
+            f"{latency['p99']:>9.2f} {result['errors']:>6} {result['upstream_per_op']:>11} "
+            f"{alloc:>11} {result['rss_mib']:>6.1f}MiB"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="Run only these scenarios")
+    parser.add_argument("--iterations", type=int, default=100, help="Timed ops per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent ops (cold HN runs serially)")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed ops before each scenario")
+    parser.add_argument("--trace-ops", type=int, default=10, help="Ops in the allocation pass (0 to skip)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Upstream latency jitter in seconds (±, uniform)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests answered with 503")
+    parser.add_argument("--feed-entries", type=int, default=50, help="Entries per stub feed")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and error injection")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with")
+    parser.add_argument(
+        "--max-regression", type=float, help="With --compare: fail if p95 or throughput is this %% worse"
+    )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            out = sys.stderr if args.json else sys.stdout
+            regressions = compare(report, json.load(baseline), args.max_regression, out)
+        if regressions:
+            print(f"\nRegressed by more than {args.max_regression}%: {', '.join(regressions)}", file=out)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
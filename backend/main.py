@@ -1,12 +1,52 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.api.routes import items, users, hacker_news, rss_feed
+from app.core.deferred_routes import include_deferred
+from app.core.http_client import http_clients
+from app.core.instrumentation import LoopLagMonitor, MetricsMiddleware
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.parse_pool import parse_pool
+from app.services.hacker_news_mirror import hacker_news_mirror
+from app.services.ingestion import ingestion_scheduler
+from app.api.routes import hacker_news, rss_feed, feeds, ingestion, search, live
+
+loop_lag_monitor = LoopLagMonitor(interval=settings.METRICS_LOOP_LAG_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open shared upstream HTTP pools and the feed parsing pool, then start the
+    Hacker News mirror and background ingestion; stop them in reverse order
+    on shutdown
+    """
+    await http_clients.startup()
+    await parse_pool.startup()
+    if settings.METRICS_ENABLED:
+        await loop_lag_monitor.start()
+    if settings.HN_MIRROR_ENABLED:
+        await hacker_news_mirror.start()
+    if settings.INGEST_ENABLED:
+        await ingestion_scheduler.start()
+    try:
+        yield
+    finally:
+        await ingestion_scheduler.stop()
+        await hacker_news_mirror.stop()
+        await loop_lag_monitor.stop()
+        await parse_pool.shutdown()
+        await http_clients.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description=settings.DESCRIPTION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware - configured for Safari/iOS compatibility
@@ -20,11 +60,30 @@ app.add_middleware(
     max_age=3600,
 )
 
-# Include routers
-app.include_router(items.router, prefix="/api/v1/items", tags=["items"])
-app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
+# Compress JSON and docs responses; streams pass through uncompressed
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        cache_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES,
+    )
+
+# Outermost, so request timings include compression and CORS handling
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Include routers. The items / users demo routers and their schemas are
+# imported on their first request, so startup does not build them
+include_deferred(app, "app.api.routes.items", "/api/v1/items", ["items"])
+include_deferred(app, "app.api.routes.users", "/api/v1/users", ["users"])
 app.include_router(hacker_news.router, prefix="/api/v1/hacker-news", tags=["hacker-news"])
 app.include_router(rss_feed.router, prefix="/api/v1/rss", tags=["rss-feeds"])
+app.include_router(feeds.router, prefix="/api/v1/feeds", tags=["feeds"])
+app.include_router(ingestion.router, prefix="/api/v1/ingestion", tags=["ingestion"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(live.router, prefix="/api/v1/live", tags=["live"])
 
 
 @app.get("/")
@@ -39,3 +98,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics in the text exposition format"""
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
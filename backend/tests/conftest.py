@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Run against the backend package without installing it, and without
+# background work that would reach the network
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("INGEST_ENABLED", "false")
+os.environ.setdefault("HN_MIRROR_ENABLED", "false")
@@ -0,0 +1,58 @@
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_go_fresh_then_stale_then_expire(clock):
+    cache = TTLCache(ttl=10, stale_ttl=5)
+    cache.set("key", "value")
+
+    assert cache.get_entry("key").is_fresh
+    clock.now += 12
+    entry = cache.get_entry("key")
+    assert entry is not None and not entry.is_fresh
+    clock.now += 4
+    assert cache.get("key") is None
+    assert "key" not in cache
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_per_entry_ttl_and_peek(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("short", 1, ttl=1)
+    clock.now += 2
+    # peek keeps expired entries around as a fallback; get drops them
+    assert cache.peek("short").value == 1
+    assert cache.get("short") is None
+    assert cache.peek("short") is None
+
+
+def test_lru_eviction_by_count_and_size():
+    cache = TTLCache(ttl=60, max_entries=2, max_bytes=100)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+    cache.get("a")
+    cache.set("c", 3, size=10)
+    assert "b" not in cache and "a" in cache and "c" in cache
+
+    cache.set("d", 4, size=95)
+    assert list(cache._entries) == ["d"]
+    assert cache.stats()["evictions"] == 3
+    assert cache.stats()["bytes"] == 95
@@ -0,0 +1,129 @@
+import asyncio
+import httpx
+import pytest
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakerTransport, CircuitOpenError, UpstreamHealth
+
+HOST = "upstream.test"
+
+
+class Upstream:
+    """MockTransport handler with a switchable status and an optional gate"""
+
+    def __init__(self):
+        self.status = 200
+        self.requests = 0
+        self.gate = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return httpx.Response(self.status)
+
+
+def _setup(reset_timeout: float = 0.05):
+    health = UpstreamHealth(failure_threshold=2, reset_timeout=reset_timeout, adaptive_timeouts=False)
+    upstream = Upstream()
+    client = httpx.AsyncClient(
+        base_url=f"http://{HOST}", transport=CircuitBreakerTransport(httpx.MockTransport(upstream), health)
+    )
+    return health, upstream, client
+
+
+def test_consecutive_failures_open_the_circuit():
+    health, upstream, client = _setup(reset_timeout=60)
+
+    async def main():
+        upstream.status = 503
+        for _ in range(2):
+            assert (await client.get("/")).status_code == 503
+        assert health.host(HOST).state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await client.get("/")
+        await client.aclose()
+
+    asyncio.run(main())
+    assert upstream.requests == 2
+    assert health.status()[HOST]["rejected"] == 1
+
+
+def test_successes_reset_the_failure_count():
+    health, upstream, client = _setup()
+
+    async def main():
+        for status in (503, 200, 503):
+            upstream.status = status
+            await client.get("/")
+        await client.aclose()
+
+    asyncio.run(main())
+    assert health.host(HOST).state == CLOSED
+    assert health.host(HOST).failures == 1
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    health, upstream, client = _setup()
+
+    async def main():
+        upstream.status = 503
+        for _ in range(2):
+            await client.get("/")
+        await asyncio.sleep(0.06)
+
+        # Only the first request after reset_timeout is sent, as a probe
+        upstream.status, upstream.gate = 200, asyncio.Event()
+        probe = asyncio.create_task(client.get("/"))
+        await asyncio.sleep(0.01)
+        assert health.host(HOST).state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await client.get("/")
+
+        upstream.gate.set()
+        assert (await probe).status_code == 200
+        assert health.host(HOST).state == CLOSED
+        assert (await client.get("/")).status_code == 200
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_failed_probe_reopens_the_circuit():
+    health, upstream, client = _setup()
+
+    async def main():
+        upstream.status = 503
+        for _ in range(2):
+            await client.get("/")
+        await asyncio.sleep(0.06)
+        assert (await client.get("/")).status_code == 503
+        assert health.host(HOST).state == OPEN
+        with pytest.raises(CircuitOpenError):
+            await client.get("/")
+        await client.aclose()
+
+    asyncio.run(main())
+    assert health.host(HOST).opened == 2
+
+
+def test_cancelled_probe_frees_the_probe_slot():
+    health, upstream, client = _setup()
+
+    async def main():
+        upstream.status = 503
+        for _ in range(2):
+            await client.get("/")
+        await asyncio.sleep(0.06)
+
+        upstream.status, upstream.gate = 200, asyncio.Event()
+        probe = asyncio.create_task(client.get("/"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        upstream.gate.set()
+        assert (await client.get("/")).status_code == 200
+        await client.aclose()
+
+    asyncio.run(main())
+    assert health.host(HOST).state == CLOSED
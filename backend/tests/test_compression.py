@@ -0,0 +1,45 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import encoded_etag, etag_matches
+from app.core.responses import cached_json_response
+from app.core.serialization import render
+
+BODY = render({"items": ["x" * 40] * 100})
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/")
+    async def index(request: Request):
+        return cached_json_response(request, BODY, 60)
+
+    return TestClient(CompressionMiddleware(app))
+
+
+def test_each_encoding_has_its_own_etag():
+    client = _client()
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.headers["etag"] == BODY.etag
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] == encoded_etag(BODY.etag, "gzip") != BODY.etag
+    assert zipped.content == plain.content  # TestClient decodes the body
+
+
+def test_revalidating_a_compressed_copy():
+    client = _client()
+    etag = encoded_etag(BODY.etag, "gzip")
+    response = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_etag_variants_match_the_body_etag():
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert encoded_etag('W/"abc"', "br") == 'W/"abc"'
+    assert etag_matches('"abc-br"', '"abc"')
+    assert etag_matches('"x", W/"abc-gzip"', '"abc"')
+    assert not etag_matches('"abd-br"', '"abc"')
@@ -0,0 +1,39 @@
+import pytest
+from app.schemas.feeds import FeedArticle
+from app.services.dedup import DedupEngine, canonicalize_url
+
+
+@pytest.mark.parametrize("url, alias", [
+    ("https://example.com/post", "http://www.example.com/post/?utm_source=x&fbclid=1#top"),
+    ("https://reddit.com/r/python/comments/1", "https://old.reddit.com/r/python/comments/1"),
+    ("https://reddit.com/r/python/comments/1", "https://np.reddit.com/r/python/comments/1/"),
+    ("https://youtube.com/watch?v=abc", "https://m.youtube.com/watch?si=share&v=abc"),
+])
+def test_aliases_of_the_same_page_match(url, alias):
+    assert canonicalize_url(alias) == canonicalize_url(url)
+
+
+@pytest.mark.parametrize("url, other", [
+    # "ref" and "si" select content on some sites
+    ("https://example.com/compare?ref=v1", "https://example.com/compare?ref=v2"),
+    ("https://example.com/docs?si=3", "https://example.com/docs?si=4"),
+    # new. and np. are separate sites outside reddit.com
+    ("https://new.example.com/post", "https://example.com/post"),
+    ("https://np.example.org/post", "https://example.org/post"),
+])
+def test_distinct_pages_stay_distinct(url, other):
+    assert canonicalize_url(url) != canonicalize_url(other)
+
+
+def test_distinct_articles_are_not_collapsed():
+    articles = [
+        FeedArticle(id="1", title="Release notes", category="llm", source="a",
+                    url="https://example.com/releases?ref=v1"),
+        FeedArticle(id="2", title="Pricing", category="llm", source="b",
+                    url="https://example.com/releases?ref=v2"),
+        FeedArticle(id="3", title="Launch", category="llm", source="c",
+                    url="https://new.example.com/blog/launch"),
+        FeedArticle(id="4", title="Blog", category="llm", source="d",
+                    url="https://example.com/blog/launch"),
+    ]
+    assert [a.id for a in DedupEngine().collapse(articles)] == ["1", "2", "3", "4"]
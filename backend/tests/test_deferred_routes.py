@@ -0,0 +1,59 @@
+import sys
+import types
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from app.core.deferred_routes import DeferredRouter, include_deferred
+
+
+def _app(monkeypatch):
+    """An app with a deferred router module that records when it is imported"""
+    imports = []
+    router = APIRouter()
+
+    @router.get("/")
+    async def list_things():
+        return ["a"]
+
+    @router.get("/{thing_id}")
+    async def get_thing(thing_id: int):
+        return {"id": thing_id}
+
+    class Module(types.ModuleType):
+        def __getattr__(self, name):
+            if name != "router":
+                raise AttributeError(name)
+            imports.append(name)
+            return router
+
+    monkeypatch.setitem(sys.modules, "deferred_things", Module("deferred_things"))
+    app = FastAPI()
+    include_deferred(app, "deferred_things", "/things", ["things"])
+
+    @app.get("/other")
+    async def other():
+        return "other"
+
+    return app, imports
+
+
+def test_router_loads_on_first_request_under_its_prefix(monkeypatch):
+    app, imports = _app(monkeypatch)
+    client = TestClient(app)
+
+    assert client.get("/other").json() == "other"
+    assert imports == []
+
+    assert client.get("/things/7").json() == {"id": 7}
+    assert client.get("/things").json() == ["a"]  # slash redirect still applies
+    assert imports == ["router"]
+    assert not any(isinstance(route, DeferredRouter) for route in app.router.routes)
+    # The routes take the placeholder's place, ahead of routes declared after it
+    paths = [route.path for route in app.router.routes]
+    assert paths.index("/things/{thing_id}") < paths.index("/other")
+
+
+def test_openapi_schema_lists_deferred_routes(monkeypatch):
+    app, imports = _app(monkeypatch)
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert {"/things/", "/things/{thing_id}", "/other"} <= set(paths)
+    assert imports == ["router"]
@@ -0,0 +1,178 @@
+import asyncio
+import httpx
+import pytest
+from app.services.feed_parser import StreamingFeedParser, UnsupportedFeed
+from app.services.rss_feed import RSSFeedService
+from benchmarks.stub_upstream import reddit_document, rss_document
+
+RSS_ESCAPING = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title>Escaping &amp; markup</title>
+  <link>https://example.com/</link>
+  <description>Channel &lt;b&gt;description&lt;/b&gt;</description>
+  <item>
+    <title>AT&amp;T &lt;b&gt;bold&lt;/b&gt; news</title>
+    <link>https://example.com/a?x=1&amp;y=2</link>
+    <description>&lt;p onclick="evil()"&gt;Hello &lt;script&gt;alert(1)&lt;/script&gt;&lt;a href="/rel"&gt;link&lt;/a&gt;&lt;/p&gt;</description>
+    <author>editor@example.com (The Editor)</author>
+    <category>One</category>
+    <category>Two</category>
+    <guid isPermaLink="false">a-1</guid>
+    <pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>Plain 5 &lt; 6 title</title>
+    <link>https://example.com/b</link>
+    <content:encoded><![CDATA[<p>CDATA <em>body</em> &amp; more</p>]]></content:encoded>
+    <dc:creator>Someone</dc:creator>
+    <dc:date>2025-01-06T11:00:00Z</dc:date>
+  </item>
+  <item>
+    <title>Third</title>
+    <link>https://example.com/c</link>
+  </item>
+</channel>
+</rss>
+"""
+
+ATOM_TYPES = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en">
+  <title type="text">Atom &lt;types&gt;</title>
+  <subtitle type="html">&lt;i&gt;sub&lt;/i&gt;</subtitle>
+  <link rel="alternate" href="https://example.org/"/>
+  <entry>
+    <title type="text">Text &amp; &lt;not tag&gt;</title>
+    <link rel="alternate" href="https://example.org/1"/>
+    <id>urn:1</id>
+    <updated>2025-01-06T10:00:00Z</updated>
+    <summary type="text">plain &lt;not tag&gt;</summary>
+    <author><name>Ann</name></author>
+    <category term="news"/>
+  </entry>
+  <entry>
+    <title type="html">&lt;b&gt;Html&lt;/b&gt; title</title>
+    <link rel="alternate" href="https://example.org/2"/>
+    <id>urn:2</id>
+    <published>2025-01-06T09:00:00Z</published>
+    <content type="html">&lt;p&gt;Body &lt;script&gt;x()&lt;/script&gt;&lt;/p&gt;</content>
+  </entry>
+  <entry>
+    <title>Xhtml</title>
+    <id>urn:3</id>
+    <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Inline <b>markup</b></p></div></content>
+  </entry>
+</feed>
+"""
+
+# Markup the streaming parser builds itself, with feedparser's quirks
+RSS_QUIRKS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+<channel>
+  <image><url>https://example.com/logo.png</url><title>Logo</title><link>https://example.com/</link></image>
+  <title>Quirks</title>
+  <atom:link href="https://example.com/feed" rel="self" type="application/rss+xml"/>
+  <link>https://example.com/?a=1&amp;b=2</link>
+  <item>
+    <title></title>
+    <guid>https:///example.com/guid-as-link</guid>
+    <description>Line&lt;br/&gt;break &lt;img alt="x" src="/a.png"&gt; &amp;amp; caf\xc3\x83\xc2\xa9</description>
+    <category domain="https://example.com/tags">One</category>
+    <category>One</category>
+    <category>Two</category>
+  </item>
+  <item>
+    <title>Second</title>
+    <atom:link href="https://example.com/b-alternate" rel="alternate" type="text/html"/>
+    <link>https://example.com/b?x=1&amp;amp;y=2</link>
+    <guid isPermaLink="false">b-2</guid>
+  </item>
+</channel>
+</rss>
+"""
+
+DOCUMENTS = {
+    "rss_escaping": RSS_ESCAPING,
+    "rss_quirks": RSS_QUIRKS,
+    "atom_types": ATOM_TYPES,
+    "stub_rss": rss_document("tech", 40),
+    "stub_reddit": reddit_document("programming", 40),
+}
+
+
+def _stream(document: bytes, limit: int, chunk_size: int = 97):
+    """Run _parse_stream over `document`, sent in small chunks"""
+    async def body():
+        for i in range(0, len(document), chunk_size):
+            yield document[i:i + chunk_size]
+
+    async def run():
+        response = httpx.Response(200, content=body())
+        return await RSSFeedService._parse_stream(response, "https://example.com/feed", limit)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+@pytest.mark.parametrize("limit", [1, 2, 3, 20, 1000])
+def test_stream_matches_parse_feed(name, limit):
+    document = DOCUMENTS[name]
+    expected = RSSFeedService.parse_feed(document)
+    feed, complete, _ = _stream(document, limit)
+
+    assert feed.feed_info == expected.feed_info
+    assert feed.articles[:limit] == expected.articles[:limit]
+    # Stopping right after the last entry leaves the end of the document unread
+    assert complete == (limit > len(expected.articles))
+
+
+def test_text_and_html_fields_follow_feedparser():
+    rss, _, _ = _stream(RSS_ESCAPING, 1)
+    assert rss.articles[0].title == "AT&amp;T <b>bold</b> news"
+    assert "<script>" not in rss.articles[0].description
+
+    atom, _, _ = _stream(ATOM_TYPES, 1)
+    assert atom.articles[0].description == "plain <not tag>"
+
+
+@pytest.mark.parametrize("name", ["rss_quirks", "stub_rss", "stub_reddit"])
+def test_plain_feeds_are_built_without_feedparser(name, monkeypatch):
+    expected = RSSFeedService.parse_feed(DOCUMENTS[name])
+
+    def parse_feed(content, url=""):
+        raise AssertionError("feedparser used")
+
+    monkeypatch.setattr(RSSFeedService, "parse_feed", parse_feed)
+    feed, _, _ = _stream(DOCUMENTS[name], 3)
+    assert feed.feed_info == expected.feed_info
+    assert feed.articles == expected.articles[:3]
+
+
+def test_unreproducible_markup_goes_to_feedparser():
+    # Titles that may be HTML and sanitized <script> are left to feedparser
+    for document in (RSS_ESCAPING, ATOM_TYPES):
+        parser = StreamingFeedParser(1000)
+        parser.feed(document, final=True)
+        assert parser.complete
+        assert parser.result() is None
+
+
+def test_stops_reading_after_limit():
+    document = rss_document("tech", 200)
+    _, complete, read = _stream(document, 5, chunk_size=1024)
+    assert not complete
+    assert read < len(document) // 10
+
+
+def test_unsupported_documents_fall_back():
+    rdf = b'<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"></rdf:RDF>'
+    with pytest.raises(UnsupportedFeed):
+        StreamingFeedParser(1).feed(rdf, final=True)
+    with pytest.raises(UnsupportedFeed):
+        StreamingFeedParser(1).feed(RSS_ESCAPING.decode().encode("utf-16"))
+
+    # A document feedparser can still read is parsed in full
+    broken = RSS_ESCAPING.replace(b"<title>Plain", b"<title>&nbsp;Plain")
+    feed, complete, _ = _stream(broken, 2)
+    assert complete
+    assert feed.articles == RSSFeedService.parse_feed(broken).articles
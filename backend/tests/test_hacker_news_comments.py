@@ -0,0 +1,50 @@
+import asyncio
+import httpx
+import pytest
+from app.services.hacker_news_comments import HackerNewsCommentService
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_comment_nodes_are_served_stale_when_a_refetch_fails():
+    node_cache = HackerNewsCommentService._node_cache
+    item = {"id": 42, "type": "comment", "text": "cached"}
+    node_cache.set(42, item, ttl=0)
+    stale_before = HackerNewsCommentService._stale_on_error
+
+    async def main():
+        async with _client(lambda request: httpx.Response(503)) as client:
+            return await HackerNewsCommentService.get_item(42, client)
+
+    try:
+        assert asyncio.run(main()) == item
+        assert HackerNewsCommentService._stale_on_error == stale_before + 1
+    finally:
+        node_cache.delete(42)
+
+
+def test_comment_node_errors_propagate_without_a_cached_copy():
+    async def main():
+        async with _client(lambda request: httpx.Response(503)) as client:
+            return await HackerNewsCommentService.get_item(43, client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(main())
+
+
+def test_comment_nodes_are_refetched_after_expiry():
+    node_cache = HackerNewsCommentService._node_cache
+    node_cache.set(44, {"id": 44, "text": "old"}, ttl=0)
+    fresh = {"id": 44, "text": "new"}
+
+    async def main():
+        async with _client(lambda request: httpx.Response(200, json=fresh)) as client:
+            return await HackerNewsCommentService.get_item(44, client)
+
+    try:
+        assert asyncio.run(main()) == fresh
+        assert node_cache.get(44) == fresh
+    finally:
+        node_cache.delete(44)
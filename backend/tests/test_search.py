@@ -0,0 +1,47 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.schemas.feeds import FeedArticle
+from app.services.search import SearchIndex
+
+NOON = datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc)
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.add([FeedArticle(
+        id="a", title="Streaming parsers", category="llm", source="test",
+        timestamp=int(NOON.timestamp())
+    )])
+    return index
+
+
+@pytest.fixture
+def local_zone():
+    """Run with a local time zone far from UTC, which shifts naive bounds read as local time"""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "America/Los_Angeles"
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def test_naive_date_filters_are_utc(local_zone):
+    index = _index()
+    naive = NOON.replace(tzinfo=None)
+
+    assert index.search("parsers", since=naive).total == 1
+    assert index.search("parsers", until=naive).total == 1
+    assert index.search("parsers", since=naive + timedelta(minutes=1)).total == 0
+    assert index.search("parsers", until=naive - timedelta(minutes=1)).total == 0
+
+
+def test_aware_date_filters_keep_their_offset():
+    index = _index()
+    berlin = NOON.astimezone(timezone(timedelta(hours=1)))
+    assert index.search("parsers", since=berlin, until=berlin).total == 1
@@ -0,0 +1,138 @@
+import asyncio
+import httpx
+import pytest
+from app.core.single_flight import SingleFlight
+from app.core.traffic_governor import GovernedTransport, TrafficGovernor, background_priority
+
+
+def test_foreground_caller_promotes_a_background_flight(monkeypatch):
+    governor = TrafficGovernor(default_rate=1000, default_burst=1000, default_concurrency=1)
+    monkeypatch.setattr("app.core.single_flight.traffic_governor", governor)
+    flight = SingleFlight("test_promote")
+    handled = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            handled.append(request.url.path)
+            if request.url.path == "/hold":
+                await release.wait()
+            return httpx.Response(200, json={"path": request.url.path})
+
+        async with httpx.AsyncClient(
+            base_url="http://upstream", transport=GovernedTransport(httpx.MockTransport(handler), governor)
+        ) as client:
+            async def fetch(path):
+                return (await client.get(path)).json()["path"]
+
+            # Occupy the host's only slot, then queue two background requests
+            hold = asyncio.create_task(client.get("/hold"))
+            await asyncio.sleep(0)
+            with background_priority():
+                other = asyncio.create_task(fetch("/other"))
+                await asyncio.sleep(0)
+                mirror = asyncio.create_task(flight.run("item", fetch, "/shared"))
+                await asyncio.sleep(0)
+
+            # A user-facing request for the same item joins the mirror's flight
+            user = asyncio.create_task(flight.run("item", fetch, "/shared"))
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(hold, other, mirror, user)
+
+        assert results[2] == results[3] == "/shared"
+        assert flight.executions == 1 and flight.coalesced == 1
+
+    asyncio.run(main())
+    assert handled == ["/hold", "/shared", "/other"]
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test_coalesce")
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        results = await asyncio.gather(*(flight.run("key", fetch, 21) for _ in range(5)))
+        assert results == [42] * 5
+        # The key is forgotten once the task finishes: the next call runs again
+        assert await flight.run("key", fetch, 1) == 2
+
+    asyncio.run(main())
+    assert calls == [21, 1]
+    assert flight.executions == 2 and flight.coalesced == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_failures_reach_every_waiter_but_not_later_callers():
+    flight = SingleFlight("test_failure")
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise ValueError("upstream down")
+        return "ok"
+
+    async def main():
+        results = await asyncio.gather(flight.run("key", fetch), flight.run("key", fetch), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert await flight.run("key", fetch) == "ok"
+
+    asyncio.run(main())
+    assert len(attempts) == 2
+
+
+def test_cancelling_one_caller_leaves_the_shared_task_running():
+    flight = SingleFlight("test_cancel_one")
+
+    async def main():
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.run("key", fetch))
+        second = asyncio.create_task(flight.run("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(main())
+
+
+def test_shared_task_is_cancelled_when_every_caller_gives_up():
+    flight = SingleFlight("test_cancel_all")
+    cancelled = []
+
+    async def main():
+        async def fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        callers = [asyncio.create_task(flight.run("key", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+    assert cancelled == [True]
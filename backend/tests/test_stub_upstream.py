@@ -0,0 +1,51 @@
+import asyncio
+import httpx
+from app.services.rss_feed import RSSFeedService
+from benchmarks.stub_upstream import (
+    HN_HOST, THREAD_SIZE, TOP_LEVEL_COMMENTS, StubUpstream, comment_id, hn_item, respond
+)
+
+
+def test_hacker_news_stories_and_threads():
+    _, response = respond(HN_HOST, "/v0/topstories.json", story_count=30)
+    assert response.json() == list(range(1, 31))
+
+    assert hn_item(7)["type"] == "job" and "kids" not in hn_item(7)
+    story = hn_item(8)
+    assert story["type"] == "story"
+    assert story["kids"] == [comment_id(8, i) for i in range(TOP_LEVEL_COMMENTS)]
+
+    # Every comment in the thread is the child of the item that lists it
+    seen, pending = 0, list(story["kids"])
+    while pending:
+        comment = hn_item(pending.pop())
+        seen += 1
+        for kid in comment["kids"]:
+            assert hn_item(kid)["parent"] == comment["id"]
+        pending.extend(comment["kids"])
+    assert seen == THREAD_SIZE
+
+
+def test_feeds_parse_and_revalidate():
+    _, rss = respond("example.com", "/feed", feed_entries=5)
+    _, atom = respond("www.reddit.com", "/r/python.rss", feed_entries=5)
+    assert atom.headers["content-type"] == "application/atom+xml"
+    for response in (rss, atom):
+        assert RSSFeedService.parse_feed(response.content).total == 5
+
+    kind, revalidated = respond("example.com", "/feed", rss.headers["etag"], feed_entries=5)
+    assert (kind, revalidated.status_code) == ("feed_not_modified", 304)
+
+
+def test_stub_server_failures_are_seeded_and_counted():
+    async def run(seed):
+        upstream = StubUpstream(error_rate=0.5, seed=seed)
+        transport = httpx.ASGITransport(app=upstream)
+        async with httpx.AsyncClient(transport=transport, base_url=f"http://{HN_HOST}") as client:
+            statuses = [(await client.get(f"/v0/item/{i}.json")).status_code for i in range(1, 21)]
+        return statuses, upstream.requests
+
+    statuses, requests = asyncio.run(run(1))
+    assert asyncio.run(run(1))[0] == statuses
+    assert requests["error"] == statuses.count(503) > 0
+    assert requests["hn_item"] == statuses.count(200) > 0
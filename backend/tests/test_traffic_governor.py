@@ -0,0 +1,133 @@
+import asyncio
+import httpx
+import pytest
+from app.core.traffic_governor import GovernedTransport, TrafficGovernor, parse_retry_after
+
+HOST = "upstream.test"
+
+
+def _setup(handler, concurrency: int = 1, **kwargs):
+    governor = TrafficGovernor(default_rate=1000, default_burst=1000, default_concurrency=concurrency, **kwargs)
+    client = httpx.AsyncClient(
+        base_url=f"http://{HOST}", transport=GovernedTransport(httpx.MockTransport(handler), governor)
+    )
+    return governor, client
+
+
+def test_cancelled_request_releases_its_slot():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow":
+            await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    governor, client = _setup(handler)
+
+    async def main():
+        slow = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        assert governor.host(HOST).active == 1
+        slow.cancel()
+        await asyncio.gather(slow, return_exceptions=True)
+
+        assert governor.host(HOST).active == 0
+        assert (await client.get("/fast")).status_code == 200
+        await client.aclose()
+
+    asyncio.run(main())
+    assert governor.host(HOST).active == 0
+
+
+def test_cancelled_waiter_leaves_the_queue_without_taking_a_slot():
+    async def main():
+        gate = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/hold":
+                await gate.wait()
+            return httpx.Response(200)
+
+        governor, client = _setup(handler)
+        hold = asyncio.create_task(client.get("/hold"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(client.get("/queued"))
+        await asyncio.sleep(0.01)
+        limiter = governor.host(HOST)
+        assert limiter.waiting == 1
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.waiting == 0
+
+        gate.set()
+        await hold
+        assert limiter.active == 0
+        assert (await client.get("/after")).status_code == 200
+        assert limiter.active == 0
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_pool_timeout_while_queued():
+    async def main():
+        gate = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await gate.wait()
+            return httpx.Response(200)
+
+        governor, client = _setup(handler)
+        hold = asyncio.create_task(client.get("/hold"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(httpx.PoolTimeout):
+            await client.get("/queued", timeout=httpx.Timeout(5, pool=0.02))
+
+        gate.set()
+        await hold
+        assert governor.host(HOST).active == 0
+        await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_streamed_body_holds_the_slot_until_closed():
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"chunk"
+
+    class Streaming(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, stream=Body())
+
+    governor = TrafficGovernor(default_concurrency=1)
+
+    async def main():
+        async with httpx.AsyncClient(transport=GovernedTransport(Streaming(), governor)) as client:
+            async with client.stream("GET", f"http://{HOST}/") as response:
+                assert governor.host(HOST).active == 1
+                await response.aread()
+            assert governor.host(HOST).active == 0
+
+    asyncio.run(main())
+
+
+def test_429_throttles_the_host_and_retries_once():
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200)])
+    governor, client = _setup(lambda request: next(responses))
+
+    async def main():
+        assert (await client.get("/")).status_code == 200
+        await client.aclose()
+
+    asyncio.run(main())
+    limiter = governor.host(HOST)
+    assert limiter.throttled == 1
+    assert limiter.rate < limiter.limit
+    assert limiter.active == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
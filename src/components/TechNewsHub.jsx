@@ -5,147 +5,56 @@ import { API_ENDPOINTS } from '../config/api';
 function TechNewsHub() {
   const [selectedCategory, setSelectedCategory] = useState('all');
   const [searchTerm, setSearchTerm] = useState('');
-  const [aiArticles, setAiArticles] = useState([]);
-  const [hackerNewsArticles, setHackerNewsArticles] = useState([]);
-  const [experienceDevArticles, setExperienceDevArticles] = useState([]);
-  const [automationArticles, setAutomationArticles] = useState([]);
-  const [solutionArchitectArticles, setSolutionArchitectArticles] = useState([]);
+  const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [selectedArticle, setSelectedArticle] = useState(null);
 
-  // Fetch AI articles from FastAPI RSS endpoint AI
+  // Fetch every category in one request from the server-side aggregation endpoint.
+  // The backend fans out to Reddit and Hacker News, then merges, dedupes,
+  // sorts and strips HTML once for all clients.
   useEffect(() => {
-    const fetchAi = async () => {
+    const fetchFeeds = async () => {
       setLoading(true);
       setError(null);
       try {
-        // Fetch all three RSS feeds in parallel
-        const responses = await Promise.all([
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/ArtificialInteligence.rss&limit=20`),
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/LLMDevs.rss&limit=20`),
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/LocalLLaMA.rss&limit=20`)
-        ]);
-
-        // Check if all responses are OK
-        responses.forEach(res => {
-          if (res.status !== 200) {
-            throw new Error('Failed to fetch one or more AI RSS feeds');
-          }
-        });
-
-        // Parse all JSON responses
-        const dataArrays = await Promise.all(responses.map(res => res.json()));
-
-        // Merge all articles from the three feeds
-        const allArticles = dataArrays.flatMap(data => data.articles);
-
-        // Format the articles to match the existing news item structure
-        const formattedArticles = allArticles.map((article, index) => ({
-          id: `ai_${index}`,
-          title: article.title,
-          category: 'llm',
-          date: formatTimestamp(article.published),
-          source: 'AI Communities',
-          excerpt: stripHtml(article.summary || article.description || '').substring(0, 200) + '...',
-          fullContent: stripHtml(article.content || article.description || article.summary || ''),
-          url: article.link
-        }));
-
-        setAiArticles(formattedArticles);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching AI articles:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchAi();
-  }, []);
-
-  // Fetch Hacker News articles from FastAPI
-  useEffect(() => {
-    const fetchHackerNews = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        const url = `${API_ENDPOINTS.hackerNews}?limit=20&story_type=topstories`;
-        console.log('Fetching Hacker News from:', url);
-
-        const response = await fetch(url, {
+        const response = await fetch(`${API_ENDPOINTS.feeds}/all?page_size=200&limit_per_feed=20`, {
           method: 'GET',
           headers: {
             'Accept': 'application/json',
           }
         });
 
-        console.log('Hacker News response status:', response.status);
-
         if (!response.ok) {
-          throw new Error(`Failed to fetch Hacker News articles: ${response.status} ${response.statusText}`);
+          throw new Error(`Failed to fetch news: ${response.status} ${response.statusText}`);
         }
         const data = await response.json();
-        console.log('Hacker News data received:', data.total, 'articles');
 
         // Format the articles to match the existing news item structure
         const formattedArticles = data.articles.map(article => ({
           id: article.id,
           title: article.title,
-          category: 'hacker_news',
-          date: formatTimestamp(article.time),
-          source: 'Hacker News',
-          excerpt: `Score: ${article.score} | Comments: ${article.descendants || 0}`,
+          category: article.category,
+          // A story collapsed across categories belongs to each of their tabs
+          categories: article.categories ?? [article.category],
+          date: formatTimestamp(article.timestamp ?? article.published),
+          source: article.source,
+          excerpt: article.excerpt,
+          fullContent: article.content,
           url: article.url,
-          by: article.by
+          by: article.author
         }));
 
-        setHackerNewsArticles(formattedArticles);
+        setArticles(formattedArticles);
       } catch (err) {
         setError(err.message);
-        console.error('Error fetching Hacker News:', err);
+        console.error('Error fetching news:', err);
       } finally {
         setLoading(false);
       }
     };
 
-    fetchHackerNews();
-  }, []);
-
-  // Fetch Experienced Devs articles from FastAPI RSS endpoint experienced devs
-  useEffect(() => {
-    const fetchExperienceDev = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        const response = await fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/ExperiencedDevs.rss&limit=20`);
-        if (response.status !== 200) {
-          throw new Error('Failed to fetch Experienced Devs articles');
-        }
-        const data = await response.json();
-
-        // Format the articles to match the existing news item structure
-        const formattedArticles = data.articles.map((article, index) => ({
-          id: `experience_dev_${index}`,
-          title: article.title,
-          category: 'experienced_devs',
-          date: formatTimestamp(article.published),
-          source: 'Experienced Devs',
-          excerpt: stripHtml(article.summary || article.description || '').substring(0, 200) + '...',
-          fullContent: stripHtml(article.content || article.description || article.summary || ''),
-          url: article.link
-        }));
-
-        setExperienceDevArticles(formattedArticles);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching Experienced Devs:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchExperienceDev();
+    fetchFeeds();
   }, []);
 
   // Helper function to format Unix timestamp or ISO 8601 string
@@ -170,24 +79,6 @@ function TechNewsHub() {
     }
   };
 
-  // Helper function to strip HTML tags and clean up text
-  const stripHtml = (html) => {
-    if (!html) return '';
-
-    // Remove HTML comments and tags
-    const text = html
-      .replace(/<!--[\s\S]*?-->/g, '') // Remove HTML comments
-      .replace(/<[^>]+>/g, '')         // Remove HTML tags
-      .replace(/&nbsp;/g, ' ')         // Replace &nbsp; with space
-      .replace(/&amp;/g, '&')          // Replace &amp; with &
-      .replace(/&lt;/g, '<')           // Replace &lt; with <
-      .replace(/&gt;/g, '>')           // Replace &gt; with >
-      .replace(/&quot;/g, '"')         // Replace &quot; with "
-      .trim();
-
-    return text;
-  };
-
   // Helper function to format article content with better readability
   const formatArticleContent = (content) => {
     if (!content) return '';
@@ -201,94 +92,6 @@ function TechNewsHub() {
       .replace(/([^\n])(\n- |\n\* |\n\d+\. )/g, '$1\n$2');
   };
 
-  // Fetch Automation articles from FastAPI RSS endpoint Automation
-  useEffect(() => {
-    const fetchAutomation = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        const response = await fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/automation.rss&limit=20`);
-        if (response.status !== 200) {
-          throw new Error('Failed to fetch Automation articles');
-        }
-        const data = await response.json();
-
-        // Format the articles to match the existing news item structure
-        const formattedArticles = data.articles.map((article, index) => ({
-          id: `automation${index}`,
-          title: article.title,
-          category: 'automation',
-          date: formatTimestamp(article.published),
-          source: 'Automation',
-          excerpt: stripHtml(article.summary || article.description || '').substring(0, 200) + '...',
-          fullContent: stripHtml(article.content || article.description || article.summary || ''),
-          url: article.link
-        }));
-
-        setAutomationArticles(formattedArticles);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching Automation:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchAutomation();
-  }, []);
-
-  
-
-  // Fetch Solution architecture articles from FastAPI RSS endpoint Solution Architect
-  useEffect(() => {
-    const fetchSolutionArchitect = async () => {
-      setLoading(true);
-      setError(null);
-      try {
-        // Fetch architecture-related RSS feeds in parallel
-        const responses = await Promise.all([
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/softwarearchitecture.rss&limit=20`),
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/aws.rss&limit=20`),
-          fetch(`${API_ENDPOINTS.rss}?url=https://www.reddit.com/r/devops.rss&limit=20`)
-        ]);
-
-        // Check if all responses are OK
-        responses.forEach(res => {
-          if (res.status !== 200) {
-            throw new Error('Failed to fetch one or more solution architecture RSS feeds');
-          }
-        });
-
-        // Parse all JSON responses
-        const dataArrays = await Promise.all(responses.map(res => res.json()));
-
-        // Merge all articles from the three feeds
-        const allArticles = dataArrays.flatMap(data => data.articles);
-
-        // Format the articles to match the existing news item structure
-        const formattedArticles = allArticles.map((article, index) => ({
-          id: `solution_architecture_${index}`,
-          title: article.title,
-          category: 'architecture',
-          date: formatTimestamp(article.published),
-          source: 'Architecture Communities',
-          excerpt: stripHtml(article.summary || article.description || '').substring(0, 200) + '...',
-          fullContent: stripHtml(article.content || article.description || article.summary || ''),
-          url: article.link
-        }));
-
-        setSolutionArchitectArticles(formattedArticles);
-      } catch (err) {
-        setError(err.message);
-        console.error('Error fetching solution architecture articles:', err);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    fetchSolutionArchitect();
-  }, []);
-
   const newsItems = [];
 
   const categories = [
@@ -300,11 +103,12 @@ function TechNewsHub() {
     { id: 'experienced_devs', label: 'Experienced Devs', icon: Radar, color: 'bg-cyan-500' },
   ];
 
-  // Combine static news with Hacker News and Experienced Devs articles
-  const allNews = [...newsItems, ...aiArticles, ...hackerNewsArticles, ...experienceDevArticles, ...automationArticles, ...solutionArchitectArticles];
+  // Combine static news with the aggregated feed
+  const allNews = [...newsItems, ...articles];
 
   const filteredNews = allNews.filter(item => {
-    const matchesCategory = selectedCategory === 'all' || item.category === selectedCategory;
+    const matchesCategory = selectedCategory === 'all' ||
+                           (item.categories ?? [item.category]).includes(selectedCategory);
     const matchesSearch = item.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
                          item.excerpt.toLowerCase().includes(searchTerm.toLowerCase());
     return matchesCategory && matchesSearch;
@@ -326,13 +130,13 @@ function TechNewsHub() {
         {/* Loading and Error States */}
         {loading && (
           <div className="mb-6 p-4 bg-blue-500/10 border border-blue-500/30 rounded-lg text-blue-400 text-center">
-            Loading Hacker News articles...
+            Loading news...
           </div>
         )}
 
         {error && (
           <div className="mb-6 p-4 bg-red-500/10 border border-red-500/30 rounded-lg text-red-400 text-center">
-            Error loading Hacker News: {error}
+            Error loading news: {error}
           </div>
         )}
 
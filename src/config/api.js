@@ -5,4 +5,5 @@ export const API_BASE_URL = import.meta.env.VITE_API_URL || '';
 export const API_ENDPOINTS = {
   hackerNews: `${API_BASE_URL}/api/v1/hacker-news`,
   rss: `${API_BASE_URL}/api/v1/rss`,
+  feeds: `${API_BASE_URL}/api/v1/feeds`,
 };